@@ -0,0 +1,70 @@
+import requests
+import hashlib
+import threading
+import time
+
+def makeResponse(url,content=b'',status_code=200,headers=None):
+    """
+    A function to build a requests.Response without sending any request
+    """
+    response=requests.Response()
+    response.url=url
+    response.status_code=status_code
+    response._content=content
+    response.encoding='utf-8'
+    response.headers.update(headers or {})
+    return response
+
+class OfflineClient:
+    """
+    A client for code that has to work without the network: every request fails the test
+    """
+    cache=None
+
+    def get(self,url,**kwargs):
+        raise AssertionError(f'Unexpected request for {url}')
+
+class PageClient:
+    """
+    A client answering from a dictionary: URL as key, the body (bytes), a status code or an exception to raise as value. Unknown URLs are answered with a 404. The requested URLs are recorded in self.requested.
+    """
+    def __init__(self,pages,delays=None,cache=None):
+        self.pages=pages
+        self.delays=delays or {} #Seconds before the answer for some URLs
+        self.cache=cache
+        self.requested=[]
+        self.lock=threading.Lock()
+
+    def get(self,url,**kwargs):
+        with self.lock:
+            self.requested.append(url)
+        time.sleep(self.delays.get(url,0))
+        page=self.pages.get(url,404)
+        if isinstance(page,BaseException):
+            raise page
+        if isinstance(page,int):
+            return makeResponse(url,b'',page)
+        return makeResponse(url,page)
+
+class EtagSession:
+    """
+    A stand-in for requests.Session of an HttpClient serving pages from a dictionary (URL as key, body as value) with an ETag derived from the body. A request carrying the current ETag is answered with a 304, unknown URLs with a 404. The status codes sent for each URL are recorded in self.answers.
+    """
+    def __init__(self,pages):
+        self.pages=pages
+        self.answers={}
+
+    def get(self,url,headers=None,**kwargs):
+        if url not in self.pages:
+            status_code, response=404, makeResponse(url,b'',404)
+        else:
+            etag=f'"{hashlib.sha256(self.pages[url]).hexdigest()[:16]}"'
+            if (headers or {}).get('If-None-Match')==etag:
+                status_code, response=304, makeResponse(url,b'',304)
+            else:
+                status_code, response=200, makeResponse(url,self.pages[url],200,{'ETag':etag})
+        self.answers.setdefault(url,[]).append(status_code)
+        return response
+
+    def close(self):
+        pass
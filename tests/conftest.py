@@ -0,0 +1,38 @@
+from tools.DatasetCompiler import readDataset
+from tools.DataInterpreter import DataInterpreter
+from tools.RestaurantStore import RestaurantStore
+from tools.DistrictResolver import getDefaultResolver
+import pytest
+import os
+
+data_path=os.path.join(os.path.dirname(__file__),'..','data','restaurants_zlatestranky.csv')
+dist_dict_path=os.path.join(os.path.dirname(__file__),'..','data','dist_dict.json')
+pages_path=os.path.join(os.path.dirname(__file__),'pages') #Saved restaurant pages with their links in links.json
+
+@pytest.fixture(autouse=True)
+def district_resolver(monkeypatch):
+    """
+    Restaurant objects read the mapping dictionary of the data folder wherever the tests are run from (the default path uses a Windows separator)
+    """
+    monkeypatch.setattr('tools.Restaurant.getDefaultResolver',lambda: getDefaultResolver(dist_dict_path))
+
+@pytest.fixture(scope='session')
+def dataset():
+    """
+    The data set shipped in the data folder, decoded without writing the cache of DatasetLoader
+    """
+    return readDataset(data_path,cache=False)
+
+@pytest.fixture(scope='session')
+def interpreter(dataset):
+    """
+    DataInterpreter filtering the data set in memory
+    """
+    return DataInterpreter(dataset.copy()) #DataInterpreter drops the empty observations in place
+
+@pytest.fixture(scope='session')
+def store_interpreter(dataset):
+    """
+    DataInterpreter answering the filters from an in-memory RestaurantStore
+    """
+    return DataInterpreter(dataset.copy(),store=RestaurantStore(':memory:'))
@@ -0,0 +1,52 @@
+from tools.ColumnRangeIndex import ColumnRangeIndex
+import numpy as np
+import pandas as pd
+import pytest
+
+def getRows(dataset,filters):
+    """
+    Brute force: compare every row with the bounds, missing values never match
+    """
+    mask=np.ones(len(dataset),dtype=bool)
+    for column, bounds in filters.items():
+        low, high = ColumnRangeIndex.parseBounds(bounds)
+        values=dataset[column].to_numpy(dtype=float,na_value=np.nan)
+        mask&=~np.isnan(values)
+        if low is not None:
+            mask&=values>=low
+        if high is not None:
+            mask&=values<=high
+    return np.flatnonzero(mask)
+
+def test_parseBounds():
+    assert ColumnRangeIndex.parseBounds(80)==(80.0,None)
+    assert ColumnRangeIndex.parseBounds('4.5')==(4.5,None)
+    assert ColumnRangeIndex.parseBounds((None,'20'))==(None,20.0)
+    assert ColumnRangeIndex.parseBounds([10,20])==(10.0,20.0)
+    with pytest.raises(ValueError):
+        ColumnRangeIndex.parseBounds('many')
+    with pytest.raises(ValueError):
+        ColumnRangeIndex.parseBounds((1,2,3))
+
+def test_getRows_small():
+    dataset=pd.DataFrame({'ratings':[80,np.nan,95,80,0],'review_count':[3,10,1,0,7],'weekly_opening_duration':[70.5,np.nan,40,84,np.nan]})
+    index=ColumnRangeIndex(dataset)
+    assert index.getRows({'ratings':80}).tolist()==[0,2,3]
+    assert index.getRows({'ratings':(None,80)}).tolist()==[0,3,4]
+    assert index.getRows({'ratings':(80,80),'review_count':(1,None)}).tolist()==[0]
+    assert index.getRows({'weekly_opening_duration':(None,None)}).tolist()==[0,2,3] #Missing values never match
+    assert index.getRows({}).tolist()==[0,1,2,3,4]
+    assert index.getRows({'ratings':(90,10)}).tolist()==[]
+    with pytest.raises(ValueError):
+        index.getRows({'name':1})
+
+def test_getRows_dataset(interpreter):
+    generator=np.random.default_rng(1)
+    dataset=interpreter.dataset
+    for _ in range(200):
+        filters={}
+        for column in generator.permutation(interpreter.range_index.columns)[:generator.integers(1,4)]:
+            values=dataset[column].dropna().to_numpy(dtype=float)
+            low, high = sorted(generator.choice(values,2))
+            filters[column]=[(low,high),(low,None),(None,high),low][generator.integers(0,4)]
+        assert (interpreter.range_index.getRows(filters)==getRows(dataset,filters)).all(), filters
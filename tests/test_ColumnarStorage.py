@@ -0,0 +1,43 @@
+from tools.ColumnarStorage import ColumnarStorage
+import pandas as pd
+import numpy as np
+import pytest
+
+@pytest.mark.parametrize('extension',['parquet','arrow'])
+def test_restaurants_round_trip(dataset,tmp_path,extension):
+    """
+    A filtered data set with missing review counts comes back with the same values, dtypes and index
+    """
+    restaurants=dataset.iloc[::7].copy()
+    restaurants['link']=[f'https://www.zlatestranky.cz/profil/restaurant-C{idx:06d}/' for idx in restaurants.index]
+    restaurants.loc[restaurants.index[:3],'review_count']=np.nan
+    file_path=str(tmp_path/f'restaurants.{extension}')
+    ColumnarStorage().write(restaurants,file_path)
+    pd.testing.assert_frame_equal(ColumnarStorage().read(file_path),restaurants)
+
+@pytest.mark.parametrize('extension',['parquet','arrow'])
+def test_places_round_trip(tmp_path,extension):
+    """
+    A data set of GooglePlacesCompiler comes back with its index, missing values are NaN
+    """
+    missing={'ZS_name':'Céleste','name':None,'formatted_address':None,'location':None,'rating':None,'user_ratings_total':None,'formatted_phone_number':None}
+    found={'ZS_name':'Repre Restaurant','name':'Repre','formatted_address':'Náměstí Republiky 5, Praha 1','location':{'lat':50.0875,'lng':14.4278},'rating':4.5,'user_ratings_total':1234,'formatted_phone_number':'224 002 101'}
+    places=pd.DataFrame([found,missing],index=pd.Index([3,8],name='restaurant'))
+    file_path=str(tmp_path/f'places.{extension}')
+    ColumnarStorage().write(places,file_path,kind='places')
+    read=ColumnarStorage().read(file_path)
+    assert read.index.equals(places.index) and read.index.name=='restaurant'
+    assert read.loc[3].to_dict()==found
+    assert read.loc[8,'ZS_name']=='Céleste' and read.loc[8].iloc[1:].isna().all()
+
+def test_integer_column(tmp_path):
+    """
+    Review counts are cast to integers explicitly, a fractional count is refused instead of truncated
+    """
+    restaurants=pd.DataFrame({'name':['a','b','c'],'review_count':[12.0,np.nan,3.0]})
+    ColumnarStorage().write(restaurants,str(tmp_path/'restaurants.parquet'))
+    import pyarrow.parquet as pq
+    assert str(pq.read_schema(str(tmp_path/'restaurants.parquet')).field('review_count').type)=='int64'
+    restaurants.loc[2,'review_count']=3.5
+    with pytest.raises(ValueError):
+        ColumnarStorage().write(restaurants,str(tmp_path/'restaurants.parquet'))
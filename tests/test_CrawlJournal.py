@@ -0,0 +1,66 @@
+from tools.CrawlJournal import CrawlJournal
+from tools.DatasetCompiler import DatasetCompiler
+from tests.test_DatasetCompiler import readPages
+from tests.clients import PageClient
+import pandas as pd
+import pytest
+import json
+import os
+
+def test_torn_last_line(tmp_path):
+    """
+    A last line cut off by a crash is skipped and the next record starts on a new line
+    """
+    file_path=str(tmp_path/'crawl.jsonl')
+    with open(file_path,'w',encoding='utf-8') as journal_file:
+        for number in range(2):
+            journal_file.write(json.dumps({'link':f'https://example.com/{number}','name':'Pivnice Č. {number}'},ensure_ascii=False)+'\n')
+        journal_file.write('{"link": "https://example.com/2", "na')
+    journal=CrawlJournal(file_path)
+    assert list(journal.readRecords())==['https://example.com/0','https://example.com/1']
+    journal.append({'link':'https://example.com/3','name':'Kavárna'})
+    assert list(journal.readRecords())==['https://example.com/0','https://example.com/1','https://example.com/3']
+    journal.clear()
+    assert journal.readRecords()=={} and not os.path.exists(file_path)
+
+@pytest.fixture
+def crawl(tmp_path,monkeypatch):
+    """
+    The saved pages and their links, with the working directory in a temporary folder (the journal lives in its data folder)
+    """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data')
+    pages=readPages()
+    return pages, sorted(pages)
+
+def test_rotate_after_completion(crawl):
+    """
+    A completed crawl moves its journal away, so the next crawl requests every page again
+    """
+    pages, links=crawl
+    client=PageClient(pages)
+    first=DatasetCompiler(links=links,existing=False,client=client,checkpoint='crawl.jsonl').dataset
+    assert not os.path.exists(os.path.join('data','crawl.jsonl'))
+    assert list(CrawlJournal(os.path.join('data','crawl.jsonl.done')).readRecords())==links
+    client.requested=[]
+    second=DatasetCompiler(links=links,existing=False,client=client,checkpoint='crawl.jsonl').dataset
+    assert sorted(client.requested)==links
+    pd.testing.assert_frame_equal(first,second)
+
+def test_resume_and_refresh(crawl):
+    """
+    After an interruption only the remaining pages are requested, and pages to refresh are never taken from the journal
+    """
+    pages, links=crawl
+    expected=DatasetCompiler(links=links,existing=False,client=PageClient(pages)).dataset
+    interrupted=dict(pages)
+    interrupted[links[2]]=KeyboardInterrupt() #Not an error of a single page => stops the crawl
+    with pytest.raises(KeyboardInterrupt):
+        DatasetCompiler(links=links,existing=False,client=PageClient(interrupted),checkpoint='crawl.jsonl')
+    journaled=list(CrawlJournal(os.path.join('data','crawl.jsonl')).readRecords())
+    assert links[:2]==journaled[:2] and links[2] not in journaled
+    client=PageClient(pages)
+    compiler=DatasetCompiler(links=links,existing=False,client=client,checkpoint='crawl.jsonl',refresh=[links[0]])
+    assert sorted(client.requested)==sorted(set(links)-set(journaled)|{links[0]})
+    pd.testing.assert_frame_equal(compiler.dataset,expected)
+    assert os.path.exists(os.path.join('data','crawl.jsonl.done')) and not os.path.exists(os.path.join('data','crawl.jsonl'))
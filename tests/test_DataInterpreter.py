@@ -0,0 +1,114 @@
+from tools.OpeningHours import OpeningHours
+from tools.KeywordIndex import KeywordIndex
+from tests.test_KeywordIndex import getTokenSets
+import numpy as np
+import pytest
+
+districts=['Praha 1','Praha 2','Praha 5','Praha 10','Not found']
+keywords=['VISA','hotově','česká kuchyně','kuchyne','Wi-Fi','pizz*','visa AND wi-fi','salónek OR terasa','k* AND sodexo',['klimatizace','VISA']]
+moments=['Po 8:00','Út 12:30','Pá 23:30','Sobota 0:30','Ne 23:59','Mon 0:15']
+
+def getLabels(dataset):
+    """
+    Index labels of a result of scanThroughDataset (None if nothing was found)
+    """
+    return [] if dataset is None else dataset.index.tolist()
+
+def scanBruteForce(dataset,token_sets,district=None,ratings=None,review_count=None,keyword=None,weekly_opening_duration=None,open_at=None,max_no_of_rows=None):
+    """
+    Brute force: check every row against every filter, token_sets are the tokens of every restaurant (see getTokenSets)
+    """
+    mask=np.ones(len(dataset),dtype=bool)
+    if district:
+        mask&=(dataset.district==district).to_numpy()
+    for column, bounds in [('ratings',ratings),('review_count',review_count),('weekly_opening_duration',weekly_opening_duration)]:
+        if bounds:
+            low, high = bounds if isinstance(bounds,tuple) else (bounds,None)
+            values=dataset[column].to_numpy(dtype=float,na_value=np.nan)
+            mask&=~np.isnan(values)
+            if low is not None:
+                mask&=values>=low
+            if high is not None:
+                mask&=values<=high
+    if keyword:
+        groups=KeywordIndex.parseQuery(keyword)
+        mask&=[any(all(any(token.startswith(term) if prefix else token==term for token in tokens) for term, prefix in group) for group in groups) for tokens in token_sets]
+    if open_at:
+        minute=OpeningHours.week_days.index(open_at[0])*OpeningHours.minutes_per_day+OpeningHours.parseTime(open_at[1])
+        mask&=[type(opening_hours)==dict and any(start<=minute<end for start, end in OpeningHours.fromDict(opening_hours).getWeekIntervals()) for opening_hours in dataset.opening_hours]
+    labels=dataset.index[mask].tolist()
+    return labels[:max_no_of_rows] if max_no_of_rows else labels
+
+def getRandomFilters(generator,dataset):
+    """
+    A random combination of the filters of scanThroughDataset, each one given with a probability of one half
+    """
+    filters={}
+    if generator.random()<0.5:
+        filters['district']=districts[generator.integers(len(districts))]
+    for column in ['ratings','review_count','weekly_opening_duration']:
+        if generator.random()<0.5:
+            low, high = sorted(generator.choice(dataset[column].dropna().to_numpy(dtype=float),2))
+            filters[column]=[(float(low),float(high)),(float(low),None),(None,float(high)),float(low)][generator.integers(0,4)]
+    if generator.random()<0.5:
+        filters['keyword']=keywords[generator.integers(len(keywords))]
+    if generator.random()<0.5:
+        filters['open_at']=(OpeningHours.week_days[generator.integers(7)],f'{generator.integers(24)}:{generator.integers(60):02d}')
+    return filters
+
+def test_scanThroughDataset_paths(interpreter,store_interpreter):
+    """
+    The store, the in-memory path and an explicit query return the rows found by brute force, with and without a row limit
+    """
+    generator=np.random.default_rng(2)
+    dataset=interpreter.dataset
+    token_sets=getTokenSets(dataset)
+    sizes=[]
+    for _ in range(80):
+        filters=getRandomFilters(generator,dataset)
+        for max_no_of_rows in [None,int(generator.integers(1,30))]:
+            expected=scanBruteForce(dataset,token_sets,max_no_of_rows=max_no_of_rows,**filters)
+            assert getLabels(interpreter.scanThroughDataset(max_no_of_rows=max_no_of_rows,**filters))==expected, filters
+            assert getLabels(store_interpreter.scanThroughDataset(max_no_of_rows=max_no_of_rows,**filters))==expected, filters
+            query=interpreter.query()
+            for column in ['ratings','review_count','weekly_opening_duration']:
+                if column in filters:
+                    query=query.range(column,*(filters[column] if isinstance(filters[column],tuple) else (filters[column],None)))
+            if 'district' in filters:
+                query=query.district(filters['district'])
+            if 'keyword' in filters:
+                query=query.has(filters['keyword'])
+            if 'open_at' in filters:
+                query=query.openAt(filters['open_at'])
+            if max_no_of_rows:
+                query=query.limit(max_no_of_rows)
+            assert query.run().index.tolist()==expected, filters
+            sizes.append(len(expected))
+    assert sum(size>0 for size in sizes)>len(sizes)/2 #Most combinations have to match something to be worth comparing
+
+@pytest.mark.parametrize('moment',moments)
+def test_scanThroughDataset_open_at(interpreter,store_interpreter,moment):
+    """
+    Moments given as strings, including English day names and the minutes past Sunday midnight
+    """
+    expected=getLabels(interpreter.openAt(moment))
+    assert getLabels(interpreter.scanThroughDataset(open_at=moment,max_no_of_rows=None))==expected
+    assert getLabels(store_interpreter.scanThroughDataset(open_at=moment,max_no_of_rows=None))==expected
+
+def test_scanThroughDataset_columns(interpreter,store_interpreter):
+    for di in [interpreter,store_interpreter]:
+        result=di.scanThroughDataset(district='Praha 2',keyword='VISA',columns_to_display=['name','ratings'],max_no_of_rows='3')
+        assert result.columns.tolist()==['name','ratings']
+        assert len(result)==3
+        assert di.scanThroughDataset(district='Praha 2',ratings=(101,None)) is None
+
+def test_scanThroughDataset_invalid(interpreter,store_interpreter):
+    for di in [interpreter,store_interpreter]:
+        with pytest.raises(ValueError):
+            di.scanThroughDataset(ratings='high')
+        with pytest.raises(ValueError):
+            di.scanThroughDataset(review_count=(1,2,3))
+        with pytest.raises(ValueError):
+            di.scanThroughDataset(max_no_of_rows='all')
+        with pytest.raises(ValueError):
+            di.scanThroughDataset(open_at='Someday 10:00')
@@ -0,0 +1,154 @@
+from tools.DatasetCompiler import DatasetCompiler
+from tools.PageArchive import PageArchive
+from tests.conftest import pages_path
+from tests.clients import OfflineClient, PageClient, EtagSession
+from tools.HttpClient import HttpClient
+from tools.ResponseCache import ResponseCache
+import pandas as pd
+import pytest
+import requests
+import zipfile
+import time
+import json
+import os
+
+def test_compareParsers():
+    """
+    The parsers and the partial parsing extract the same values from the saved pages
+    """
+    compiler=DatasetCompiler(existing=False,pages=pages_path)
+    assert len(compiler.dataset)==5 and not compiler.failed_links
+    differences=compiler.compareParsers(pages_path,['html.parser','lxml',('html.parser',True),('lxml',True)])
+    assert differences.empty, differences.to_dict('records')
+
+def test_getRecordsFromPages_offline(tmp_path):
+    """
+    The data set is compiled from a directory, a zip archive or a PageArchive of saved pages without any request
+    """
+    expected=DatasetCompiler(existing=False,pages=pages_path,client=OfflineClient()).dataset
+    with open(os.path.join(pages_path,'links.json'),encoding='utf-8') as json_file:
+        links=json.load(json_file)
+    assert expected.link.tolist()==[links[name] for name in sorted(links)]
+    zip_path=str(tmp_path/'pages.zip')
+    archive=PageArchive(str(tmp_path/'pages.arch'))
+    with zipfile.ZipFile(zip_path,'w') as zip_file:
+        for name in sorted(os.listdir(pages_path)):
+            zip_file.write(os.path.join(pages_path,name),name)
+            if name in links:
+                with open(os.path.join(pages_path,name),'rb') as page_file:
+                    archive.append(links[name],page_file.read())
+    archive.close()
+    for pages in [zip_path,str(tmp_path/'pages.arch')]:
+        compiler=DatasetCompiler(existing=False,pages=pages,client=OfflineClient())
+        pd.testing.assert_frame_equal(compiler.dataset,expected)
+
+def readPages():
+    """
+    A function returning the saved pages keyed by their link
+    """
+    with open(os.path.join(pages_path,'links.json'),encoding='utf-8') as json_file:
+        links=json.load(json_file)
+    pages={}
+    for name, link in links.items():
+        with open(os.path.join(pages_path,name),'rb') as page_file:
+            pages[link]=page_file.read()
+    return pages
+
+@pytest.mark.parametrize('processes',[None,2])
+def test_getRecords_concurrent(processes):
+    """
+    With several pages requested at once, the data set keeps the order of the links and the failed links are reported
+    """
+    pages=readPages()
+    links=sorted(pages,reverse=True)
+    delays={links[0]:0.3,links[1]:0.2} #The first pages arrive last
+    pages['https://www.zlatestranky.cz/profil/error-C000006/']=500
+    pages['https://www.zlatestranky.cz/profil/timeout-C000007/']=requests.ConnectionError('timed out')
+    failed=['https://www.zlatestranky.cz/profil/error-C000006/','https://www.zlatestranky.cz/profil/timeout-C000007/','https://www.zlatestranky.cz/profil/missing-C000008/']
+    client=PageClient(pages,delays)
+    compiler=DatasetCompiler(links=links[:2]+failed+links[2:],existing=False,concurrency=4,client=client,processes=processes)
+    assert compiler.dataset.link.tolist()==links
+    assert sorted(compiler.failed_links)==sorted(failed)
+    assert sorted(client.requested)==sorted(links+failed)
+
+def test_iterPages_window():
+    """
+    Only a window of 2*concurrency links is submitted while the consumer holds a page
+    """
+    pages=readPages()
+    links=[f'{link}?copy={copy}' for copy in range(4) for link in pages]
+    client=PageClient({link:pages[link.split('?')[0]] for link in links})
+    compiler=DatasetCompiler(existing=False,concurrency=2,client=client)
+    iterator=compiler.iterPages(links)
+    received=[next(iterator)]
+    time.sleep(0.2)
+    assert len(client.requested)<=4
+    received.extend(iterator)
+    assert sorted(link for link, _ in received)==sorted(links)
+
+def test_getRecordsInProcesses_window():
+    """
+    Every record is journaled before more than 2*processes further pages are taken
+    """
+    class CountingJournal:
+        def __init__(self):
+            self.taken_at=[]
+
+        def append(self,record):
+            self.taken_at.append(len(taken))
+
+    pages=readPages()
+    taken=[]
+    def iterStoredPages():
+        for copy in range(3):
+            for link, content in pages.items():
+                taken.append(link)
+                yield f'{link}?copy={copy}', content
+
+    compiler=DatasetCompiler(existing=False,processes=2,client=OfflineClient())
+    compiler.journal=CountingJournal()
+    records=compiler.getRecordsInProcesses(iterStoredPages())
+    assert list(records)==[f'{link}?copy={copy}' for copy in range(3) for link in pages]
+    assert len(compiler.journal.taken_at)==15
+    assert all(count<=4+index for index, count in enumerate(compiler.journal.taken_at))
+
+def test_default_client_is_lazy(monkeypatch):
+    """
+    The shared client (and its cache directory) is only created once a page is requested
+    """
+    def getDefaultClient():
+        raise AssertionError('The default client was created')
+
+    monkeypatch.setattr('tools.DatasetCompiler.getDefaultClient',getDefaultClient)
+    compiler=DatasetCompiler(existing=False,pages=pages_path)
+    assert compiler.client is None and len(compiler.dataset)==5
+    client=PageClient(readPages())
+    monkeypatch.setattr('tools.DatasetCompiler.getDefaultClient',lambda: client)
+    compiler=DatasetCompiler(links=sorted(client.pages),existing=False)
+    assert compiler.dataset.link.tolist()==sorted(client.pages)
+
+def test_updateDataset(tmp_path):
+    """
+    Unchanged restaurants keep their rows, changed ones are compiled from the revalidation answer, new ones are added and unlisted ones dropped
+    """
+    pages=readPages()
+    kept, changed, dropped, new, refreshed=sorted(pages)
+    session=EtagSession({link:pages[link] for link in [kept,changed,dropped,refreshed]})
+    client=HttpClient(cache=ResponseCache(str(tmp_path)),backoff=0)
+    client.session=session
+    existing=DatasetCompiler(links=[kept,changed,dropped,refreshed],existing=False,client=client).dataset
+    existing.loc[existing.link.isin([kept,refreshed]),'ratings']=1.5 #Only kept if the row is not compiled again
+    session.pages[changed]=pages[new] #The page of "changed" now shows another restaurant
+    session.pages[new]=pages[new]
+    compiler=DatasetCompiler(existing=False,client=client,refresh=[refreshed])
+    session.answers={}
+    updated=compiler.updateDataset(existing,[new,refreshed,changed,kept])
+    assert updated.link.tolist()==[new,refreshed,changed,kept]
+    assert updated.columns.tolist()==existing.columns.tolist()
+    assert updated.iloc[3].to_dict()==existing[existing.link==kept].iloc[0].to_dict()
+    assert session.answers=={kept:[304],refreshed:[304],changed:[200],new:[200]} #Every page is requested once
+    fresh=DatasetCompiler(links=[new,refreshed],existing=False,client=PageClient(pages)).dataset
+    assert updated.iloc[0].to_dict()==fresh.iloc[0].to_dict()
+    assert updated.iloc[1].to_dict()==fresh.iloc[1].to_dict()!=existing[existing.link==refreshed].iloc[0].to_dict() #Compiled again from the cached page
+    assert updated.iloc[2].drop('link').to_dict()==fresh.iloc[0].drop('link').to_dict()
+    assert not compiler.failed_links
@@ -0,0 +1,71 @@
+from tools.DatasetLoader import DatasetLoader
+from tests.conftest import data_path
+import pandas as pd
+import numpy as np
+import ast
+import os
+
+def readLiterals(file_path):
+    """
+    A function reading a data set the way readExistingDataset did before DatasetLoader: ast.literal_eval on every cell
+    """
+    df=pd.read_csv(file_path,index_col=0)
+    for column in DatasetLoader.literal_columns:
+        if column in df.columns:
+            df[column]=pd.Series([ast.literal_eval(value) if isinstance(value,str) else value for value in df[column]],index=df.index,dtype=object)
+    return df
+
+def test_fast_path_equals_literal_eval():
+    """
+    The JSON fast path decodes the shipped data set exactly like ast.literal_eval
+    """
+    pd.testing.assert_frame_equal(DatasetLoader(cache=False).readCSV(data_path),readLiterals(data_path))
+
+def test_fallback_equals_literal_eval():
+    """
+    Cells the fast path cannot rewrite (quotes, escapes, keywords inside strings) are parsed by ast.literal_eval
+    """
+    values=["{'Po': '10:00-22:00', 'Út': None}","['Visa', 'Maestro']",'["Pivo \\"U Fleků\\""]',"['None of the above']","{'tel': 'A\\\\B'}","['True', 1.5, -2]",np.nan,'[]']
+    loader=DatasetLoader(cache=False)
+    for subset in [values,values[:2]+values[-2:],values[3:4]]: #With and without cells that disable the fast path
+        expected=[ast.literal_eval(value) if isinstance(value,str) else value for value in subset]
+        decoded=loader.decodeColumn(subset)
+        assert len(decoded)==len(expected)
+        assert all(value==expected_value or (pd.isna(value) and pd.isna(expected_value)) for value, expected_value in zip(decoded,expected))
+
+def test_cache_invalidation(tmp_path,monkeypatch):
+    """
+    The cache is used while the file is unchanged and rebuilt when its modification time, size or content changes
+    """
+    file_path=str(tmp_path/'restaurants.csv')
+    pd.read_csv(data_path,index_col=0).iloc[:50].to_csv(file_path)
+    decoded=[]
+    readCSV=DatasetLoader.readCSV
+    def countingReadCSV(self,file_path):
+        decoded.append(file_path)
+        return readCSV(self,file_path)
+
+    monkeypatch.setattr(DatasetLoader,'readCSV',countingReadCSV)
+    expected=DatasetLoader().load(file_path)
+    assert os.path.exists(file_path+DatasetLoader.cache_suffix) and len(decoded)==1
+    pd.testing.assert_frame_equal(DatasetLoader().load(file_path),expected)
+    assert len(decoded)==1
+    stat=os.stat(file_path)
+    os.utime(file_path,ns=(stat.st_atime_ns,stat.st_mtime_ns+10**9)) #Only the modification time
+    DatasetLoader().load(file_path)
+    assert len(decoded)==2
+    with open(file_path,encoding='utf-8') as csv_file:
+        text=csv_file.read()
+    stat=os.stat(file_path)
+    with open(file_path,'w',encoding='utf-8') as csv_file: #Same size and modification time, other content
+        csv_file.write(text.replace('Praha 1,','Praha 2,',1))
+    os.utime(file_path,ns=(stat.st_atime_ns,stat.st_mtime_ns))
+    assert os.path.getsize(file_path)==stat.st_size
+    changed=DatasetLoader().load(file_path)
+    assert len(decoded)==3 and (changed.district!=expected.district).sum()==1
+    with open(file_path,'a',encoding='utf-8') as csv_file:
+        csv_file.write(text.splitlines()[-1].replace(str(expected.index[-1]),'999',1)+'\n')
+    os.utime(file_path,ns=(stat.st_atime_ns,stat.st_mtime_ns))
+    assert len(DatasetLoader().load(file_path))==51 and len(decoded)==4
+    DatasetLoader(cache=False).load(file_path)
+    assert len(decoded)==5
@@ -0,0 +1,80 @@
+from tools.DistrictResolver import DistrictResolver, getDefaultResolver, resetDefaultResolver
+from tests.conftest import dist_dict_path
+import pytest
+import json
+import re
+import os
+
+def baselineDistrict(dist_dict,address):
+    """
+    A function resolving an address with the nested loops Restaurant used before DistrictResolver (getDistrict, getDistrictFromPraha_XX and mappingDistrict)
+    """
+    search_dist=re.search('Praha [0-9]{1,2}',address)
+    if search_dist:
+        if search_dist.group(0)=='Praha 31':
+            return 'Praha 1'
+        if search_dist.group(0) in dist_dict:
+            return search_dist.group(0)
+        for key in dist_dict:
+            if search_dist.group(0) in dist_dict[key]:
+                return key
+        raise UnboundLocalError(search_dist.group(0)) #The original loop left district unassigned
+    for key in dist_dict:
+        for value in dist_dict[key]:
+            if value in address:
+                return key
+    zip_code=re.search('[0-9]{3} [0-9]{2}',address)
+    if zip_code is None:
+        return 'Not found'
+    return 'Praha 10' if zip_code.group(0)[1]=='0' else 'Praha '+zip_code.group(0)[1]
+
+@pytest.fixture(scope='module')
+def dist_dict():
+    """
+    The shipped mapping dictionary
+    """
+    with open(dist_dict_path) as json_file:
+        return json.load(json_file)
+
+def test_parity_with_baseline(dataset,dist_dict):
+    """
+    Every address of the shipped data set (and a few edge cases) gets the district of the original first-match loops
+    """
+    resolver=DistrictResolver(dist_dict)
+    addresses=set(dataset.address.dropna())
+    areas=[area for areas in dist_dict.values() for area in areas]
+    addresses.update(['Vodičkova 1, 110 00 Praha','Nádražní 5, 150 00 Praha','Neznámá 1','Praha 310, Václavské náměstí 1']+[f'Ulice 1, {area}' for area in areas]+[f'{area} a {other}' for area, other in zip(areas,reversed(areas))])
+    for address in sorted(addresses):
+        assert resolver.resolve(address)==baselineDistrict(dist_dict,address), address
+    assert resolver.resolveMany(list(dataset.address))==[None if not isinstance(address,str) else baselineDistrict(dist_dict,address) for address in dataset.address]
+
+def test_unknown_praha_xx(dist_dict):
+    """
+    An unknown "Praha XX" is reported as "Not found" (the original loop raised UnboundLocalError)
+    """
+    with pytest.raises(UnboundLocalError):
+        baselineDistrict(dist_dict,'Dlouhá 1, Praha 99')
+    assert DistrictResolver(dist_dict).resolve('Dlouhá 1, Praha 99')=='Not found'
+
+def test_default_resolver_rebuild(tmp_path):
+    """
+    The shared resolver is reused while the mapping dictionary is unchanged and built again when the file changes
+    """
+    file_path=str(tmp_path/'dist_dict.json')
+    with open(file_path,'w') as json_file:
+        json.dump({'Praha 1':['Staré Město']},json_file)
+    try:
+        resolver=getDefaultResolver(file_path)
+        assert getDefaultResolver(file_path) is resolver
+        assert resolver.resolve('Dlouhá 1, Staré Město')=='Praha 1'
+        with open(file_path,'w') as json_file:
+            json.dump({'Praha 2':['Staré Město','Vinohrady']},json_file)
+        resolver=getDefaultResolver(file_path)
+        assert resolver.resolve('Dlouhá 1, Staré Město')=='Praha 2'
+        stat=os.stat(file_path)
+        os.utime(file_path,ns=(stat.st_atime_ns,stat.st_mtime_ns+10**9)) #Same size, new modification time
+        assert getDefaultResolver(file_path) is not resolver
+        resetDefaultResolver()
+        assert getDefaultResolver(file_path) is not resolver
+    finally:
+        resetDefaultResolver()
@@ -0,0 +1,10 @@
+from tools.GooglePlacesCompiler import GooglePlacesCompiler
+import pandas as pd
+
+def test_own_client():
+    """
+    The API responses are requested without the response cache and the rate limiter of the shared client
+    """
+    compiler=GooglePlacesCompiler(pd.DataFrame(columns=['name','phones','coordinates']),'KEY')
+    assert compiler.client.cache is None and compiler.client.rate_limiter is None
+    assert compiler.places_API_df.empty
@@ -0,0 +1,84 @@
+from tools.HttpClient import HttpClient
+from tests.clients import makeResponse
+import requests
+import pytest
+import threading
+import time
+
+class StubSession:
+    """
+    A stand-in for requests.Session answering every request with the next item of answers: a status code, a (delay, body) tuple or an exception to raise
+    """
+    def __init__(self,answers):
+        self.answers=list(answers)
+        self.calls=0
+        self.lock=threading.Lock()
+
+    def get(self,url,**kwargs):
+        with self.lock:
+            answer=self.answers[min(self.calls,len(self.answers)-1)]
+            self.calls+=1
+        if isinstance(answer,Exception):
+            raise answer
+        if isinstance(answer,tuple):
+            delay, body=answer
+            time.sleep(delay)
+            return makeResponse(url,body)
+        return makeResponse(url,b'',answer)
+
+    def close(self):
+        pass
+
+def makeClient(answers,**kwargs):
+    """
+    A function to build a client sending its requests to a StubSession, without waiting between the retries
+    """
+    client=HttpClient(backoff=0,**kwargs)
+    client.session=StubSession(answers)
+    return client
+
+def test_retry_server_error():
+    """
+    A 5xx is retried and the following 200 is returned
+    """
+    client=makeClient([503,500,(0,b'ok')])
+    request=client.get('https://example.com/')
+    assert request.status_code==200 and request.content==b'ok'
+    assert client.session.calls==3
+
+def test_retries_exhausted():
+    """
+    A timeout is raised once all retries have timed out, a 5xx is returned as the last response
+    """
+    client=makeClient([requests.Timeout('timed out')],retries=2)
+    with pytest.raises(requests.Timeout):
+        client.get('https://example.com/')
+    assert client.session.calls==3
+    client=makeClient([502],retries=1)
+    assert client.get('https://example.com/').status_code==502
+    assert client.session.calls==2
+
+def test_hedged_request():
+    """
+    A request slower than the hedge delay is duplicated and the first answer is returned
+    """
+    client=makeClient([(1,b'slow'),(0,b'fast')],hedge_percentile=95)
+    client.latencies.extend([0.01]*20)
+    start=time.perf_counter()
+    request=client.get('https://example.com/')
+    assert request.content==b'fast' and time.perf_counter()-start<1
+    assert client.session.calls==2
+    client.close()
+
+def test_getHedgeDelay():
+    """
+    The hedge delay is the percentile of recent latencies (linear interpolation), None before 20 requests
+    """
+    client=HttpClient(hedge_percentile=95)
+    client.latencies.extend(range(1,20))
+    assert client.getHedgeDelay() is None
+    client.latencies.append(20)
+    assert client.getHedgeDelay()==pytest.approx(19.05)
+    client.hedge_percentile=50
+    assert client.getHedgeDelay()==pytest.approx(10.5)
+    client.close()
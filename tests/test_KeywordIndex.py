@@ -0,0 +1,62 @@
+from tools.KeywordIndex import KeywordIndex
+import numpy as np
+import pandas as pd
+import pytest
+
+columns=['payment_methods','products','services','marks']
+
+def getTokenSets(dataset):
+    """
+    Brute force: the tokens of every restaurant, computed element by element
+    """
+    token_sets=[]
+    for _, row in dataset[columns].iterrows():
+        tokens=set()
+        for value in row:
+            for element in (value if type(value)==list else [value] if isinstance(value,str) else []):
+                tokens|=KeywordIndex.getTokens(element)
+        token_sets.append(tokens)
+    return token_sets
+
+def getMask(token_sets,query):
+    """
+    Brute force: a restaurant matches if all terms of one of the groups match one of its tokens
+    """
+    groups=KeywordIndex.parseQuery(query)
+    return np.array([any(all(any(token.startswith(term) if prefix else token==term for token in tokens) for term, prefix in group) for group in groups) for tokens in token_sets])
+
+def test_normalize():
+    assert KeywordIndex.normalize('Česká  kuchyně')=='ceska kuchyne'
+    assert KeywordIndex.normalize(' Wi-Fi ')=='wi-fi'
+    assert KeywordIndex.normalize('ŽLUŤOUČKÝ kůň')=='zlutoucky kun'
+
+def test_getTokens():
+    assert KeywordIndex.getTokens('Česká kuchyně')=={'ceska kuchyne','ceska','kuchyne'}
+    assert KeywordIndex.getTokens('Wi-Fi')=={'wi-fi','wi','fi'}
+    assert KeywordIndex.getTokens('  ')==set()
+
+def test_parseQuery():
+    assert KeywordIndex.parseQuery('VISA')==[[('visa',False)]]
+    assert KeywordIndex.parseQuery('visa AND česká kuchyně OR pizz*')==[[('visa',False),('ceska kuchyne',False)],[('pizz',True)]]
+    assert KeywordIndex.parseQuery(['VISA','Wi-Fi'])==[[('visa',False),('wi-fi',False)]]
+    for query in ['','*','visa OR *','visa AND **']:
+        with pytest.raises(ValueError):
+            KeywordIndex.parseQuery(query)
+
+def test_getRows_small():
+    dataset=pd.DataFrame({'payment_methods':[['VISA','hotově'],np.nan,['Stravenky']],'products':[None,['Pizza'],[]],'services':[['česká kuchyně'],['pizzerie'],np.nan],'marks':[np.nan,'Wi-Fi',['Wi-Fi zdarma']]})
+    index=KeywordIndex(dataset)
+    assert index.getRows('visa').tolist()==[0]
+    assert index.getRows('Kuchyne').tolist()==[0]
+    assert index.getRows('pizz*').tolist()==[1]
+    assert index.getRows('wi-fi').tolist()==[1] #The whole element, not a prefix of 'wi-fi zdarma'
+    assert index.getRows('fi').tolist()==[1,2]
+    assert index.getRows('visa OR stravenky').tolist()==[0,2]
+    assert index.getRows(['pizza','wi']).tolist()==[1]
+    assert index.getRows('unknown').tolist()==[]
+    assert index.getRows('unknown*').tolist()==[]
+
+def test_getMask_dataset(interpreter):
+    token_sets=getTokenSets(interpreter.dataset)
+    for query in ['VISA','hotově','česká kuchyně','kuchyne','Wi-Fi','pizz*','k*','visa AND česká kuchyně','visa AND wi-fi OR pizz*','SODEXO OR TICKETRESTAURANT',['salónek','klimatizace'],'z*']:
+        assert (interpreter.keyword_index.getMask(query)==getMask(token_sets,query)).all(), query
@@ -0,0 +1,61 @@
+from tools.LinkGetter import LinkGetter
+from tools.PageArchive import PageArchive
+from tests.clients import OfflineClient, PageClient
+import requests
+import pytest
+import math
+
+listing_url='https://www.zlatestranky.cz/firmy/rubrika/Restaurace/kraj/Hlavn%C3%AD%20m%C4%9Bsto%20Praha/'
+
+def makeListingPage(paths):
+    """
+    A listing page with a heading linking to each restaurant
+    """
+    return ('<html><body>'+''.join(f'<div class="item"><h3><a href="{path}">{path}</a></h3></div>' for path in paths)+'</body></html>').encode('utf-8')
+
+def test_getPagesFromArchive(tmp_path):
+    """
+    The links are read from the latest archived version of every listing page, ordered by the page number, without any request
+    """
+    archive=PageArchive(str(tmp_path/'listing.arch'))
+    archive.append(listing_url+'10',makeListingPage(['/profil/j']),kind='listing',timestamp='2024-05-01T10:00:00+00:00')
+    archive.append(listing_url+'2',makeListingPage(['/profil/c','/profil/d']),kind='listing',timestamp='2024-05-01T10:00:00+00:00')
+    archive.append(listing_url+'1',makeListingPage(['/profil/a','/profil/b']),kind='listing',timestamp='2024-05-01T10:00:00+00:00')
+    archive.append('https://www.zlatestranky.cz/profil/a',b'<html></html>',kind='detail')
+    archive.append(listing_url+'2',makeListingPage(['/profil/c','/profil/e']),kind='listing',timestamp='2024-05-02T10:00:00+00:00')
+    archive.close()
+    link_getter=LinkGetter(client=OfflineClient(),pages=str(tmp_path/'listing.arch'))
+    assert link_getter.links==[f'https://www.zlatestranky.cz/profil/{name}' for name in ['a','b','c','e','j']]
+
+@pytest.mark.parametrize('last_page',[0,1,2,3,7,8,9,15,16,17,100])
+def test_getLastPage(last_page):
+    """
+    The exponential probe and the binary search find the last page, also for a power of two and its neighbours, with a logarithmic number of requests
+    """
+    link_getter=LinkGetter.__new__(LinkGetter) #Only getLastPage is tested, nothing is requested
+    probed=[]
+    link_getter.isPageAvailable=lambda page_number, pages: probed.append(page_number) or page_number<=last_page
+    assert link_getter.getLastPage({})==last_page
+    assert len(probed)<=2*math.log2(last_page+1)+2
+    assert len(set(probed))==len(probed) #No page is probed twice
+
+@pytest.mark.parametrize('concurrency',[1,4])
+def test_getLinks(concurrency):
+    """
+    Sequential and concurrent retrieval give the links of all pages in the order of the pages
+    """
+    pages={f'{listing_url}{number}':makeListingPage([f'/profil/{number}-{item}' for item in range(3)]) for number in range(1,12)}
+    link_getter=LinkGetter(concurrency=concurrency,client=PageClient(pages))
+    assert link_getter.links==[f'https://www.zlatestranky.cz/profil/{number}-{item}' for number in range(1,12) for item in range(3)]
+    assert len(link_getter.client.requested)==(12 if concurrency==1 else len(set(link_getter.client.requested)))
+
+@pytest.mark.parametrize('concurrency',[1,4])
+@pytest.mark.parametrize('status_code',[429,503])
+def test_getLinks_failed_page(concurrency,status_code):
+    """
+    A listing page that is throttled or fails after the client's retries raises instead of being taken for the end of the listing
+    """
+    pages={f'{listing_url}{number}':makeListingPage([f'/profil/{number}']) for number in range(1,12)}
+    pages[f'{listing_url}6']=status_code
+    with pytest.raises(requests.HTTPError):
+        LinkGetter(concurrency=concurrency,client=PageClient(pages))
@@ -0,0 +1,59 @@
+from tools.OpeningHours import OpeningHours
+from tools.OpenAtIndex import OpenAtIndex
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
+
+def getOpenMask(intervals,number_of_restaurants,minute):
+    """
+    Brute force: a restaurant is open if one of its intervals (split at the end of the week) contains the minute
+    """
+    mask=np.zeros(number_of_restaurants,dtype=bool)
+    for row, start, end in intervals:
+        for week_start, week_end in OpeningHours([(0,start,end)]).getWeekIntervals():
+            if week_start<=minute<week_end:
+                mask[row]=True
+    return mask
+
+def test_getOpenMask_random():
+    """
+    Random, overlapping and wrapping intervals, including restaurants without any
+    """
+    generator=np.random.default_rng(0)
+    number_of_restaurants=203
+    intervals=[]
+    for row in range(number_of_restaurants):
+        for _ in range(generator.integers(0,4)):
+            start=int(generator.integers(0,OpeningHours.minutes_per_week))
+            intervals.append((row,start,start+int(generator.integers(1,2*OpeningHours.minutes_per_day))))
+    table=pd.DataFrame(intervals,columns=['row','start','end'])
+    index=OpenAtIndex(table,number_of_restaurants)
+    minutes=set(generator.integers(0,OpeningHours.minutes_per_week,300).tolist())|{0,OpeningHours.minutes_per_week-1}|{start for _, start, _ in intervals if start<OpeningHours.minutes_per_week}|{end%OpeningHours.minutes_per_week for _, _, end in intervals}
+    for minute in sorted(minutes):
+        assert (index.getOpenMask(minute)==getOpenMask(intervals,number_of_restaurants,minute)).all(), minute
+
+def test_getOpenMask_dataset(interpreter):
+    table=interpreter.opening_hours_table
+    intervals=list(zip(table.row,table.start,table.end))
+    for minute in range(0,OpeningHours.minutes_per_week,97):
+        assert (interpreter.open_at_index.getOpenMask(minute)==getOpenMask(intervals,len(interpreter.dataset),minute)).all(), minute
+
+def test_getOpenRows():
+    table=pd.DataFrame({'row':[0,2,2],'start':[0,600,6*1440+1380],'end':[60,720,7*1440+120]})
+    index=OpenAtIndex(table,3)
+    assert index.getOpenRows(30).tolist()==[0,2] #Monday 0:30 is still Sunday night for the restaurant 2
+    assert index.getOpenRows(90).tolist()==[2]
+    assert index.getOpenRows(130).tolist()==[]
+    assert index.getOpenRows('Po 10:00').tolist()==[2]
+
+def test_parseMoment():
+    index=OpenAtIndex(pd.DataFrame({'row':[],'start':[],'end':[]}),0)
+    assert index.parseMoment('Pá 23:30')==4*1440+1410
+    assert index.parseMoment('friday 23:30')==4*1440+1410
+    assert index.parseMoment('pátek 23')==4*1440+1380
+    assert index.parseMoment(('Sun','0:15'))==6*1440+15
+    assert index.parseMoment(datetime(2024,1,1,8,5))==485 #A Monday
+    for moment in ['Friday','Someday 10:00','Po 24:00','Po 10:61']:
+        with pytest.raises(ValueError):
+            index.parseMoment(moment)
@@ -0,0 +1,33 @@
+from tools.OpeningHours import OpeningHours
+import pytest
+
+def test_fromDict():
+    hours=OpeningHours.fromDict({'Po':'10:30 - 23','Út':['11 - 14','17 - 01'],'St':None,'Ne':'20 - 2'})
+    day=OpeningHours.minutes_per_day
+    assert hours.intervals==[(0,630,1380),(1,day+660,day+840),(1,day+1020,day+1500),(6,6*day+1200,6*day+1560)]
+
+def test_parseTime():
+    assert OpeningHours.parseTime('10:30')==630
+    assert OpeningHours.parseTime(' 7 ')==420
+    assert OpeningHours.parseTime('24')==OpeningHours.minutes_per_day
+    for time in ['25','10:60','10.30','']:
+        with pytest.raises(ValueError):
+            OpeningHours.parseTime(time)
+
+def test_parseRange():
+    assert OpeningHours.parseRange(2,'8 - 16:45')==(2,2*1440+480,2*1440+1005)
+    assert OpeningHours.parseRange(0,'22 - 02')==(0,1320,1440+120) #Past midnight
+    with pytest.raises(ValueError):
+        OpeningHours.parseRange(0,'10 - 12 - 14')
+
+def test_getWeekIntervals():
+    """
+    A range past Sunday midnight is split at the end of the week
+    """
+    hours=OpeningHours.fromDict({'Po':'10 - 12','Ne':'22 - 03'})
+    assert hours.getWeekIntervals()==[(0,180),(600,720),(6*1440+1320,OpeningHours.minutes_per_week)]
+
+def test_getDaySpans_and_getWeeklyDuration():
+    hours=OpeningHours.fromDict({'Po':'10:30 - 23','Út':['11 - 14','17 - 01'],'Ne':'22 - 03'})
+    assert hours.getDaySpans()=={'Po':12.5,'Út':11.0,'St':None,'Čt':None,'Pá':None,'So':None,'Ne':5.0}
+    assert hours.getWeeklyDuration()==28.5
@@ -0,0 +1,56 @@
+from tools.PageArchive import PageArchive
+import json
+import os
+
+def test_append_and_read(tmp_path):
+    archive=PageArchive(str(tmp_path/'pages.arch'))
+    archive.append('https://a',b'first',timestamp='2024-05-01T10:00:00+00:00')
+    archive.append('https://b',b'other',kind='listing',timestamp='2024-05-01T11:00:00+00:00')
+    archive.append('https://a',b'second',timestamp='2024-05-02T10:00:00+00:00')
+    archive.close()
+    archive=PageArchive(str(tmp_path/'pages.arch'))
+    assert archive.read('https://a')['content']==b'second'
+    assert archive.read('https://a',as_of='2024-05-01T12:00:00+02:00')['content']==b'first' #10:00 UTC
+    assert archive.read('https://a',as_of='2024-05-01T09:59:59') is None #No time zone => UTC
+    assert archive.read('https://c') is None
+    assert [record['content'] for record in archive.replay()]==[b'other',b'second']
+    assert [record['content'] for record in archive.replay(latest=False)]==[b'first',b'other',b'second']
+    assert [record['url'] for record in archive.replay(kind='listing')]==['https://b']
+    assert [record['content'] for record in archive.replay(as_of='2024-05-01T23:00:00Z')]==[b'first',b'other']
+
+def test_recover_index_tail(tmp_path):
+    """
+    Records missing from the index (a crash between writing a record and its entry) are recovered, a cut-off record is dropped
+    """
+    file_path=str(tmp_path/'pages.arch')
+    archive=PageArchive(file_path)
+    for number in range(3):
+        archive.append(f'https://{number}',f'page {number}'.encode(),timestamp=f'2024-05-0{number+1}T10:00:00+00:00')
+    archive.close()
+    with open(file_path+'.idx',encoding='utf-8') as index_file:
+        lines=index_file.readlines()
+    with open(file_path+'.idx','w',encoding='utf-8') as index_file:
+        index_file.write(lines[0]+lines[1][:10]) #Second entry cut off, third one missing
+    with open(file_path,'ab') as archive_file:
+        archive_file.write(b'{"url": "https://cut') #Record cut off by a crash
+    archive=PageArchive(file_path)
+    assert [entry['url'] for entry in archive.readIndex()]==['https://0','https://1','https://2']
+    assert archive.read('https://2')['content']==b'page 2'
+    archive.append('https://3',b'page 3',timestamp='2024-05-04T10:00:00+00:00')
+    archive.close()
+    archive=PageArchive(file_path) #The repaired index is read as it is
+    assert [record['content'] for record in archive.replay()]==[b'page 0',b'page 1',b'page 2',b'page 3']
+    with open(file_path+'.idx',encoding='utf-8') as index_file:
+        lines=index_file.read().split('\n')
+    assert len(lines[1])==10 and lines[-1]=='' #The cut-off line was terminated, the recovered entries follow it
+    assert [json.loads(line)['url'] for line in lines[2:-1]]==['https://1','https://2','https://3']
+
+def test_rebuild_missing_index(tmp_path):
+    file_path=str(tmp_path/'pages.arch')
+    archive=PageArchive(file_path)
+    archive.append('https://a',b'first')
+    archive.append('https://b',b'second')
+    archive.close()
+    os.remove(file_path+'.idx')
+    assert [record['content'] for record in PageArchive(file_path).replay()]==[b'first',b'second']
+    assert os.path.exists(file_path+'.idx')
@@ -0,0 +1,100 @@
+from tools.RateLimiter import RateLimiter
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+import pytest
+
+class FakeClock:
+    """
+    A clock that only moves when the limiter sleeps (or when the test advances it)
+    """
+    def __init__(self):
+        self.now=100.0
+        self.sleeps=[]
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self,seconds):
+        self.sleeps.append(seconds)
+        self.now+=seconds
+
+url='https://www.zlatestranky.cz/profil/repre-restaurant-C000001/'
+
+def makeLimiter(**kwargs):
+    """
+    A function to build a limiter running on a FakeClock
+    """
+    clock=FakeClock()
+    limiter=RateLimiter(clock=clock,sleep=clock.sleep,**kwargs)
+    return limiter, clock
+
+def test_token_bucket():
+    """
+    The first request passes right away, the next ones are spaced out by 1/rate
+    """
+    limiter, clock=makeLimiter(rate=4.0)
+    for i in range(3):
+        limiter.acquire(url)
+    assert clock.sleeps==pytest.approx([0.25,0.25])
+    limiter.acquire('https://cs.wikipedia.org/wiki/Praha') #Every host has its own bucket
+    assert len(clock.sleeps)==2
+
+def test_decrease_on_429():
+    """
+    A 429, a 5xx or a failed request halves the rate down to min_rate and empties the bucket
+    """
+    limiter, clock=makeLimiter(rate=4.0,min_rate=0.5)
+    limiter.update(url,429)
+    assert limiter.getRate(url)==2.0
+    limiter.update(url,503)
+    limiter.update(url,None)
+    assert limiter.getRate(url)==0.5
+    limiter.update(url,500)
+    assert limiter.getRate(url)==0.5
+    limiter.acquire(url)
+    assert clock.sleeps==pytest.approx([2.0]) #Empty bucket at 0.5 requests per second
+
+def test_retry_after_seconds():
+    """
+    A Retry-After in seconds pauses the host for that long
+    """
+    limiter, clock=makeLimiter(rate=4.0,burst=5.0)
+    limiter.update(url,429,{'Retry-After':'30'})
+    limiter.acquire(url)
+    assert sum(clock.sleeps)==pytest.approx(30)
+    assert clock.now==pytest.approx(130)
+
+def test_parseRetryAfter():
+    """
+    Retry-After is either a number of seconds or an HTTP date, anything else is ignored
+    """
+    limiter, clock=makeLimiter()
+    assert limiter.parseRetryAfter('120')==120.0
+    assert limiter.parseRetryAfter('-5')==0.0
+    date=format_datetime(datetime.now(timezone.utc)+timedelta(seconds=120),usegmt=True)
+    assert limiter.parseRetryAfter(date)==pytest.approx(120,abs=2)
+    assert limiter.parseRetryAfter('Sat, 17 Oct 2020 10:00:00 GMT')==0.0
+    for value in [None,'','soon']:
+        assert limiter.parseRetryAfter(value) is None
+
+def test_retry_after_date():
+    """
+    A Retry-After HTTP date pauses the host until that time
+    """
+    limiter, clock=makeLimiter(rate=10.0,burst=5.0)
+    date=format_datetime(datetime.now(timezone.utc)+timedelta(seconds=60),usegmt=True)
+    limiter.update(url,503,{'Retry-After':date})
+    limiter.acquire(url)
+    assert sum(clock.sleeps)==pytest.approx(60,abs=2)
+
+def test_recovery():
+    """
+    Successful responses raise the rate again by increase, up to max_rate
+    """
+    limiter, clock=makeLimiter(rate=4.0,max_rate=5.0,increase=0.5)
+    limiter.update(url,429)
+    for expected in [2.5,3.0,3.5,4.0,4.5,5.0,5.0]:
+        limiter.update(url,200)
+        assert limiter.getRate(url)==expected
+    limiter.update(url,404) #A client error is not the server pushing back
+    assert limiter.getRate(url)==5.0
@@ -0,0 +1,106 @@
+from tools.ResponseCache import ResponseCache
+from tools.HttpClient import HttpClient
+from tests.clients import makeResponse
+import os
+
+class RevalidatingSession:
+    """
+    A stand-in for requests.Session serving a page with a validator: a request with the current validator gets a 304, any other one the whole page
+    """
+    def __init__(self,body,etag=None,last_modified=None):
+        self.body=body
+        self.etag=etag
+        self.last_modified=last_modified
+        self.sent_headers=[]
+
+    def get(self,url,headers=None,**kwargs):
+        headers=headers or {}
+        self.sent_headers.append(headers)
+        if (self.etag and headers.get('If-None-Match')==self.etag) or (self.last_modified and headers.get('If-Modified-Since')==self.last_modified):
+            return makeResponse(url,b'',304)
+        validators={'ETag':self.etag,'Last-Modified':self.last_modified}
+        return makeResponse(url,self.body,200,{name:value for name, value in validators.items() if value})
+
+def makeEntry(content,etag='"1"'):
+    """
+    A function to build a cacheable response with an ETag
+    """
+    return makeResponse('https://example.com/',content,200,{'ETag':etag})
+
+def test_revalidation(tmp_path):
+    """
+    A 304 serves the cached body, a changed page replaces the entry
+    """
+    client=HttpClient(cache=ResponseCache(str(tmp_path)),backoff=0)
+    client.session=RevalidatingSession(b'first',etag='"1"')
+    url='https://www.zlatestranky.cz/profil/repre-restaurant-C000001/'
+    request=client.get(url)
+    assert request.content==b'first' and not request.from_cache
+    request=client.get(url)
+    assert request.content==b'first' and request.from_cache and request.status_code==200
+    assert client.session.sent_headers[1]['If-None-Match']=='"1"'
+    client.session.body, client.session.etag=b'second', '"2"'
+    request=client.get(url)
+    assert request.content==b'second' and not request.from_cache
+    assert ResponseCache(str(tmp_path)).get(url)['content']==b'second'
+
+def test_revalidation_last_modified(tmp_path):
+    """
+    A page with only a Last-Modified header is revalidated with If-Modified-Since
+    """
+    client=HttpClient(cache=ResponseCache(str(tmp_path)),backoff=0)
+    client.session=RevalidatingSession(b'page',last_modified='Sat, 17 Oct 2026 10:00:00 GMT')
+    client.get('https://example.com/')
+    request=client.get('https://example.com/')
+    assert request.from_cache and request.content==b'page'
+    assert client.session.sent_headers[1]=={'If-Modified-Since':'Sat, 17 Oct 2026 10:00:00 GMT'}
+
+def test_put_without_validator(tmp_path):
+    """
+    Responses that cannot be revalidated are not stored
+    """
+    cache=ResponseCache(str(tmp_path))
+    assert not cache.put('https://example.com/',makeResponse('https://example.com/',b'page'))
+    assert not cache.put('https://example.com/',makeResponse('https://example.com/',b'',500,{'ETag':'"1"'}))
+    assert cache.get('https://example.com/') is None and not cache.entries
+
+def test_lru_eviction(tmp_path):
+    """
+    The least recently used entry is evicted once the size cap is exceeded
+    """
+    cache=ResponseCache(str(tmp_path),max_size=10)
+    for name in ['a','b']:
+        cache.put(f'https://example.com/{name}',makeEntry(b'1234'))
+    cache.touch('https://example.com/a')
+    cache.put('https://example.com/c',makeEntry(b'1234'))
+    assert cache.get('https://example.com/b') is None
+    assert cache.get('https://example.com/a')['content']==b'1234'
+    assert cache.size==8 and list(cache.entries)==[cache.getKey('https://example.com/a'),cache.getKey('https://example.com/c')]
+    assert sorted(os.listdir(tmp_path))==sorted(f'{cache.getKey(f"https://example.com/{name}")}.{extension}' for name in 'ac' for extension in ['body','json'])
+    reloaded=ResponseCache(str(tmp_path),max_size=10)
+    assert set(reloaded.entries)==set(cache.entries) and reloaded.size==8
+
+def test_redaction(tmp_path):
+    """
+    Secret query parameters are never written to the disk, the entry is still found by the full URL
+    """
+    cache=ResponseCache(str(tmp_path))
+    url='https://maps.googleapis.com/maps/api/place/details/json?place_id=abc&key=SECRET123&fields=name%2Crating'
+    assert cache.redactUrl(url)=='https://maps.googleapis.com/maps/api/place/details/json?place_id=abc&key=REDACTED&fields=name,rating'
+    assert cache.redactUrl('https://example.com/page')=='https://example.com/page'
+    cache.put(url,makeEntry(b'{}'))
+    for file_name in os.listdir(tmp_path):
+        with open(tmp_path/file_name,'rb') as stored_file:
+            assert b'SECRET123' not in stored_file.read()
+    assert cache.get(url)['url']==cache.redactUrl(url)
+
+def test_leftover_temporary_files(tmp_path):
+    """
+    Temporary files of an interrupted put are removed when the cache is opened
+    """
+    cache=ResponseCache(str(tmp_path))
+    cache.put('https://example.com/',makeEntry(b'page'))
+    (tmp_path/'tmpabc.tmp').write_bytes(b'half')
+    cache=ResponseCache(str(tmp_path))
+    assert not [file_name for file_name in os.listdir(tmp_path) if file_name.endswith('.tmp')]
+    assert cache.get('https://example.com/')['content']==b'page'
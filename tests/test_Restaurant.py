@@ -0,0 +1,61 @@
+from tools.Restaurant import Restaurant
+from tests.conftest import pages_path
+from tests.clients import OfflineClient
+import pytest
+import json
+import os
+
+page_names=sorted(name for name in os.listdir(pages_path) if name.endswith('.html'))
+
+def readPage(name):
+    with open(os.path.join(pages_path,name),'rb') as page_file:
+        return page_file.read()
+
+@pytest.mark.parametrize('parser',['html.parser','lxml'])
+@pytest.mark.parametrize('name',page_names)
+def test_partial_equals_full(name,parser):
+    """
+    Parsing only the subtrees read by the extractors gives the same record as parsing the whole page
+    """
+    content=readPage(name)
+    assert Restaurant.fromHTML(content,name,parser,partial=True).toRecord()==Restaurant.fromHTML(content,name,parser).toRecord()
+
+@pytest.mark.parametrize('partial',[False,True])
+def test_getPaymentMethods_section(partial):
+    """
+    A payment heading without a list has no payment methods, the lists of the following sections are not taken instead
+    """
+    assert Restaurant.fromHTML(readPage('kavarna.html'),'kavarna.html',partial=partial).payment_methods is None
+    assert Restaurant.fromHTML(readPage('pizzeria.html'),'pizzeria.html',partial=partial).payment_methods==['hotově','VISA']
+
+def test_toRecord_matches_baseline():
+    """
+    The single-pass extractors give the values of the original per-getter extraction (pages/expected_records.json, generated with the getters searching the whole soup for every field)
+    """
+    with open(os.path.join(pages_path,'expected_records.json'),encoding='utf-8') as json_file:
+        expected_records=json.load(json_file)
+    expected_records['kavarna.html']['payment_methods']=None #The original getter took the list of the next section, see getSectionList
+    assert sorted(expected_records)==page_names
+    for name in page_names:
+        record=Restaurant.fromHTML(readPage(name),name).toRecord()
+        assert record.pop('link')==name
+        assert record==expected_records[name], name
+
+def test_getServicesSeparator():
+    restaurant=Restaurant.fromHTML(readPage('hospoda.html'),'hospoda.html')
+    assert restaurant.getServicesSeparator('Produkty')==['plzeňské pivo','polední menu']
+    assert restaurant.getServicesSeparator('Značky')==['zahrádka']
+    assert restaurant.getServicesSeparator('Služby') is None
+
+def test_fromHTML_offline(monkeypatch):
+    """
+    A page given as bytes is parsed without any request, neither through the given client nor through the shared one
+    """
+    monkeypatch.setattr('tools.Restaurant.getDefaultClient',OfflineClient)
+    content=readPage('repre.html')
+    link='https://www.zlatestranky.cz/profil/repre-restaurant-C000001/'
+    restaurant=Restaurant.fromHTML(content,link,'lxml')
+    assert restaurant.link==link and restaurant.name=='Repre restaurant' and restaurant.district=='Praha 1'
+    assert Restaurant(link,client=OfflineClient(),content=content).toRecord()==restaurant.toRecord()
+    with pytest.raises(AssertionError): #Without the page, the client would be asked for it
+        Restaurant(link,client=OfflineClient())
@@ -0,0 +1,34 @@
+from tools.DataInterpreter import DataInterpreter
+from tools.RestaurantStore import RestaurantStore
+import pandas as pd
+import sqlite3
+
+def test_store_fingerprint(dataset,store_interpreter):
+    """
+    A store holding another data set is rebuilt, a store holding the same one is reused
+    """
+    store=RestaurantStore(':memory:')
+    store.writeDataset(store_interpreter.dataset.iloc[:100])
+    fingerprint=store.readFingerprint()
+    di=DataInterpreter(dataset.copy(),store=store)
+    assert store.getRestaurantCount()==len(di.dataset)
+    assert store.readFingerprint()==store.getFingerprint(di.dataset)!=fingerprint
+    store.connection.execute('DELETE FROM tags') #Not rebuilt again => the deleted rows stay deleted
+    DataInterpreter(dataset.copy(),store=store)
+    assert store.connection.execute('SELECT COUNT(*) FROM tags').fetchone()[0]==0
+
+def test_readDataset_many_ids(store_interpreter):
+    """
+    Any number of ids can be read (more than SQLite allows as parameters of one query)
+    """
+    store=store_interpreter.store
+    full=store.readDataset()
+    assert len(full)>1000
+    ids=list(full.index)[::-1]+list(full.index[:10])+list(range(10**6,10**6+40000)) #Any order, duplicates and unknown ids
+    limit=store.connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER,999) #The default of SQLite before 3.32
+    try:
+        pd.testing.assert_frame_equal(store.readDataset(ids),full)
+        pd.testing.assert_frame_equal(store.readDataset(full.index[5:1205]),full.iloc[5:1205])
+        assert store.readDataset([]).empty
+    finally:
+        store.connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER,limit)
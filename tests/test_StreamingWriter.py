@@ -0,0 +1,46 @@
+from tools.StreamingWriter import StreamingWriter
+import pandas as pd
+import json
+import os
+
+fields=['name','ratings','services','link']
+records=[{'name':'Repre','ratings':85.0,'services':['česká kuchyně','pizzerie'],'link':'https://c'},{'name':'U Fleků','ratings':None,'services':None,'link':'https://a'},{'name':'Lokál, "Dlouhá"','ratings':90.5,'services':['pivnice'],'link':'https://b'}]
+
+def test_csv_order(tmp_path):
+    """
+    Rows written in the order of completion are sorted by the data set order, the file matches DataFrame.to_csv
+    """
+    file_path=str(tmp_path/'restaurants.csv')
+    with StreamingWriter(file_path,fields=fields,flush_every=1) as writer:
+        for record in records:
+            writer.write(record)
+        writer.close(order=['https://a','https://b','https://c'])
+    expected=pd.DataFrame([records[1],records[2],records[0]],columns=fields)
+    expected.to_csv(str(tmp_path/'expected.csv'))
+    with open(file_path,encoding='utf-8') as streamed_file, open(str(tmp_path/'expected.csv'),encoding='utf-8') as expected_file:
+        assert streamed_file.read()==expected_file.read()
+    assert not os.path.exists(file_path+'.partial')
+
+def test_jsonl_order(tmp_path):
+    """
+    Links missing from the order are kept at the end in the order they were written
+    """
+    file_path=str(tmp_path/'restaurants.jsonl')
+    with StreamingWriter(file_path,fields=fields) as writer:
+        for record in records:
+            writer.write(record)
+        writer.close(order=['https://b'])
+    with open(file_path,encoding='utf-8') as streamed_file:
+        assert [json.loads(line)['link'] for line in streamed_file]==['https://b','https://c','https://a']
+
+def test_incomplete(tmp_path):
+    """
+    An interrupted crawl keeps the ".partial" file in the order of writing
+    """
+    file_path=str(tmp_path/'restaurants.csv')
+    writer=StreamingWriter(file_path,fields=fields)
+    for record in records:
+        writer.write(record)
+    writer.close(complete=False,order=['https://a','https://b','https://c'])
+    assert not os.path.exists(file_path)
+    assert pd.read_csv(file_path+'.partial',index_col=0).link.tolist()==['https://c','https://a','https://b']
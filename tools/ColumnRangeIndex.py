@@ -0,0 +1,144 @@
+import numpy as np
+
+class ColumnRangeIndex:
+    """
+    A class answering range filters on the numeric columns of a data set without comparing every row. For each column the positions of the rows are sorted by their value once, so the rows within a range are found by two binary searches (O(log n + k) for k matching rows). Several range filters are combined by starting from the smallest range and checking only its rows against the other ones.
+
+    ...
+
+    Attributes
+    ----------
+    columns : list
+        Indexed columns
+
+    number_of_restaurants : int
+        Number of rows of the data set
+
+    values : dict
+        Column as key, numpy array of its values (float, NaN for missing ones) in the order of the data set as value
+
+    sorted_values : dict
+        Column as key, sorted values without the missing ones as value
+
+    permutations : dict
+        Column as key, positions of the rows in the order of sorted_values as value
+
+    Methods
+    -------
+    parseBounds(bounds):
+        A function to convert a lower bound or a (lower, upper) tuple to a pair of bounds
+
+    getRange(column, low=None, high=None):
+        A function to get the slice of the sorted values within a range
+
+    getRows(filters):
+        A function to get the positions of the rows matching all range filters
+    """
+    def __init__(self,dataset,columns=['ratings','review_count','weekly_opening_duration']):
+        """
+        Constructs the sorted permutations of the columns
+
+        Parameters
+        ----------
+        dataset : pd.DataFrame
+            A proccessed data set (see DataInterpreter)
+
+        columns : list
+            Numeric columns to index. Defaults to ['ratings', 'review_count', 'weekly_opening_duration']
+        """
+        self.columns=columns
+        self.number_of_restaurants=len(dataset)
+        self.values, self.sorted_values, self.permutations = {}, {}, {}
+        for column in self.columns:
+            values=dataset[column].to_numpy(dtype=float,na_value=np.nan)
+            available=np.flatnonzero(~np.isnan(values)) #Missing values never match a range
+            order=np.argsort(values[available],kind='stable') #Stable => rows with the same value stay in the order of the data set
+            self.values[column]=values
+            self.permutations[column]=available[order]
+            self.sorted_values[column]=values[self.permutations[column]]
+
+    @classmethod
+    def parseBounds(cls,bounds):
+        """
+        A function to convert a lower bound or a (lower, upper) tuple to a pair of bounds
+
+        Parameters
+        ----------
+        bounds : int, float, str or tuple
+            A lower bound, or a (lower, upper) tuple in which either bound can be None
+
+        Returns
+        -------
+        low, high : tuple
+            Inclusive bounds as floats, None for an unbounded side
+        """
+        if isinstance(bounds,(tuple,list)):
+            if len(bounds)!=2:
+                raise ValueError(f'Invalid range: {bounds}. Please specify a lower bound or a (lower, upper) tuple')
+            low, high = bounds
+        else:
+            low, high = bounds, None
+        low=None if low is None else float(low) #A non-numeric bound raises a ValueError
+        high=None if high is None else float(high)
+        return low, high
+
+    def getRange(self,column,low=None,high=None):
+        """
+        A function to get the slice of the sorted values within a range
+
+        Parameters
+        ----------
+        column : str
+            Indexed column
+
+        low : float or None
+            Inclusive lower bound, None for no lower bound
+
+        high : float or None
+            Inclusive upper bound, None for no upper bound
+
+        Returns
+        -------
+        first, last : tuple
+            The rows within the range are self.permutations[column][first:last]
+        """
+        sorted_values=self.sorted_values[column]
+        first=0 if low is None else np.searchsorted(sorted_values,low,side='left')
+        last=len(sorted_values) if high is None else np.searchsorted(sorted_values,high,side='right')
+        return first, max(first,last)
+
+    def getRows(self,filters):
+        """
+        A function to get the positions of the rows matching all range filters. The filter with the fewest matching rows is looked up in its permutation, its rows are then checked against the bounds of the other filters.
+
+        Parameters
+        ----------
+        filters : dict
+            Indexed column as key, a lower bound or a (lower, upper) tuple as value (see parseBounds)
+
+        Returns
+        -------
+        rows : numpy.ndarray
+            Sorted positions of the matching rows in the data set
+        """
+        ranges={}
+        for column, bounds in filters.items():
+            if column not in self.permutations:
+                raise ValueError(f'{column} is not indexed. Please specify one of the following columns: {self.columns}')
+            low, high = self.parseBounds(bounds)
+            ranges[column]=(low,high)+self.getRange(column,low,high)
+        if not ranges:
+            return np.arange(self.number_of_restaurants)
+        smallest=min(ranges,key=lambda column: ranges[column][3]-ranges[column][2])
+        low, high, first, last = ranges.pop(smallest)
+        rows=self.permutations[smallest][first:last]
+        for column, (low, high, first, last) in ranges.items(): #Intersect with the other ranges by checking only the candidate rows
+            values=self.values[column][rows]
+            keep=~np.isnan(values)
+            if low is not None:
+                keep&=values>=low
+            if high is not None:
+                keep&=values<=high
+            rows=rows[keep]
+        rows=np.sort(rows)
+        return rows
@@ -0,0 +1,302 @@
+from tools.OpeningHours import OpeningHours
+import pandas as pd
+import numpy as np
+import time
+import os
+
+class ColumnarStorage:
+    """
+    A class storing the data sets in typed columnar files (Parquet or Arrow IPC) instead of csv files. Dictionaries and lists are kept as nested struct, map and list columns with a declared schema, so loading a data set does not need to parse any strings. Requires the pyarrow package.
+
+    ...
+
+    Attributes
+    ----------
+    extensions : dict
+        File extensions of the supported formats with the format as value (class attribute)
+
+    index_column : str
+        Name of the column holding the index of the data set in the file (class attribute)
+
+    Methods
+    -------
+    isColumnar(file_path):
+        A function to check whether a file should be stored in a columnar format
+
+    getSchema(kind):
+        A function to get the declared schema of a data set
+
+    encodeColumn(values, field_type):
+        A function to convert a column of Python objects to an Arrow array of the declared type
+
+    decodeColumn(column, name):
+        A function to convert an Arrow column back to the Python objects used by the rest of the package
+
+    write(dataset, file_path, kind='restaurants'):
+        A function to write a data set to a Parquet or Arrow IPC file
+
+    read(file_path):
+        A function to read a data set from a Parquet or Arrow IPC file
+    """
+    extensions={'.parquet':'parquet','.arrow':'arrow','.feather':'arrow'}
+    index_column='__index__'
+
+    @classmethod
+    def isColumnar(cls,file_path):
+        """
+        A function to check whether a file should be stored in a columnar format, based on its extension
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file
+
+        Returns
+        -------
+        columnar : bool
+            True for ".parquet", ".arrow" and ".feather" files
+        """
+        columnar=os.path.splitext(file_path)[1].lower() in cls.extensions
+        return columnar
+
+    def getSchema(self,kind):
+        """
+        A function to get the declared schema of a data set
+
+        Parameters
+        ----------
+        kind : str
+            "restaurants" for data sets compiled by DatasetCompiler or "places" for data sets compiled by GooglePlacesCompiler
+
+        Returns
+        -------
+        schema : pyarrow.Schema
+            Types of the columns
+        """
+        import pyarrow as pa #Optional dependency, only needed for columnar files
+        if kind=='restaurants':
+            schema=pa.schema([
+                ('name',pa.string()),
+                ('address',pa.string()),
+                ('district',pa.string()),
+                ('ratings',pa.float64()),
+                ('review_count',pa.int64()),
+                ('opening_hours',pa.struct([(day,pa.list_(pa.string())) for day in OpeningHours.week_days])), #One or more time ranges per day, null if closed
+                ('opening_hours_span',pa.struct([(day,pa.float64()) for day in OpeningHours.week_days])),
+                ('email_address',pa.string()),
+                ('phones',pa.map_(pa.string(),pa.string())), #Label as key, number as value, in the order of the page
+                ('web_page',pa.string()),
+                ('payment_methods',pa.list_(pa.string())),
+                ('products',pa.list_(pa.string())),
+                ('services',pa.list_(pa.string())),
+                ('marks',pa.list_(pa.string())),
+                ('coordinates',pa.struct([('latitude',pa.float64()),('longitude',pa.float64())])),
+                ('link',pa.string())
+            ])
+        elif kind=='places':
+            schema=pa.schema([
+                ('ZS_name',pa.string()),
+                ('name',pa.string()),
+                ('formatted_address',pa.string()),
+                ('location',pa.struct([('lat',pa.float64()),('lng',pa.float64())])),
+                ('rating',pa.float64()),
+                ('user_ratings_total',pa.float64()),
+                ('formatted_phone_number',pa.string())
+            ])
+        else:
+            raise ValueError('Please specify the kind of the data set as "restaurants" or "places"')
+        return schema
+
+    def encodeColumn(self,values,field_type):
+        """
+        A function to convert a column of Python objects to an Arrow array of the declared type. Missing values (None or NaN) become nulls, the opening hours get a list of time ranges for every day and the phones a list of (label, number) pairs. Values of an integer column are cast explicitly (a column with missing values is float in pandas), a value with a fractional part raises a ValueError instead of being truncated.
+
+        Parameters
+        ----------
+        values : iterable
+            Values of the column
+
+        field_type : pyarrow.DataType
+            Declared type of the column
+
+        Returns
+        -------
+        array : pyarrow.Array
+            The converted column
+        """
+        import pyarrow as pa
+        converted=[]
+        for value in values:
+            if value is None or (isinstance(value,float) and np.isnan(value)):
+                converted.append(None)
+            elif pa.types.is_integer(field_type):
+                if value!=int(value):
+                    raise ValueError(f'The value {value} cannot be stored in an integer column')
+                converted.append(int(value))
+            elif pa.types.is_map(field_type):
+                converted.append(list(value.items()))
+            elif pa.types.is_struct(field_type) and pa.types.is_list(field_type.field(0).type): #Opening hours
+                converted.append({day:(None if ranges is None else ranges if type(ranges)==list else [ranges]) for day, ranges in value.items()})
+            else:
+                converted.append(value)
+        array=pa.array(converted,type=field_type)
+        return array
+
+    def decodeColumn(self,column,name):
+        """
+        A function to convert an Arrow column back to the Python objects used by the rest of the package (the same ones readExistingDataset creates from a csv file)
+
+        Parameters
+        ----------
+        column : pyarrow.ChunkedArray
+            Column read from the file
+
+        name : str
+            Name of the column
+
+        Returns
+        -------
+        values : pd.Series or list
+            Values of the column
+        """
+        import pyarrow as pa
+        field_type=column.type
+        if not (pa.types.is_struct(field_type) or pa.types.is_list(field_type) or pa.types.is_map(field_type)):
+            return column.to_pandas() #Flat columns keep their numeric or string dtype
+        values=column.to_pylist()
+        if pa.types.is_map(field_type):
+            values=[None if value is None else dict(value) for value in values]
+        elif name=='opening_hours': #A single time range is stored as a string, several ones as a list
+            values=[None if value is None else {day:(None if ranges is None else ranges[0] if len(ranges)==1 else ranges) for day, ranges in value.items()} for value in values]
+        values=[np.nan if value is None else value for value in values] #Missing values are NaN, as in a data set read from a csv file
+        return values
+
+    def write(self,dataset,file_path,kind='restaurants'):
+        """
+        A function to write a data set to a Parquet or Arrow IPC file (chosen by the extension). Columns of the schema get their declared type, other columns are stored with an inferred type. The index is stored in the column self.index_column, so that read returns the rows with the same labels.
+
+        Parameters
+        ----------
+        dataset : pd.DataFrame
+            Data set to write
+
+        file_path : str
+            Path to a ".parquet", ".arrow" or ".feather" file
+
+        kind : str
+            "restaurants" or "places" (see getSchema). Defaults to "restaurants"
+
+        Returns
+        -------
+
+        """
+        import pyarrow as pa
+        if not self.isColumnar(file_path):
+            raise ValueError('Please specify a ".parquet", ".arrow" or ".feather" file')
+        schema=self.getSchema(kind)
+        arrays=[pa.array(dataset.index.tolist(),from_pandas=True)] #Filtered data sets do not have a default index
+        fields=[pa.field(self.index_column,arrays[0].type)]
+        for column in dataset.columns:
+            if column in schema.names:
+                field=schema.field(column)
+                arrays.append(self.encodeColumn(dataset[column],field.type))
+            else:
+                arrays.append(pa.array(dataset[column].tolist(),from_pandas=True))
+                field=pa.field(column,arrays[-1].type)
+            fields.append(field)
+        metadata={'kind':kind}
+        if dataset.index.name is not None:
+            metadata['index_name']=str(dataset.index.name)
+        table=pa.Table.from_arrays(arrays,schema=pa.schema(fields,metadata=metadata))
+        if self.extensions[os.path.splitext(file_path)[1].lower()]=='parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table,file_path,compression='zstd')
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(table,file_path,compression='zstd')
+
+    def read(self,file_path):
+        """
+        A function to read a data set from a Parquet or Arrow IPC file (chosen by the extension)
+
+        Parameters
+        ----------
+        file_path : str
+            Path to a ".parquet", ".arrow" or ".feather" file
+
+        Returns
+        -------
+        dataset : pd.DataFrame
+            The data set with dictionaries and lists as Python objects, indexed as it was written (files written without the index get a default one)
+        """
+        if not self.isColumnar(file_path):
+            raise ValueError('Please specify a ".parquet", ".arrow" or ".feather" file')
+        if self.extensions[os.path.splitext(file_path)[1].lower()]=='parquet':
+            import pyarrow.parquet as pq
+            table=pq.read_table(file_path)
+        else:
+            import pyarrow.feather as feather
+            table=feather.read_table(file_path)
+        index=None
+        if self.index_column in table.column_names:
+            index=pd.Index(table.column(self.index_column).to_pylist(),name=(table.schema.metadata or {}).get(b'index_name',b'').decode('utf-8') or None)
+            table=table.drop_columns([self.index_column])
+        dataset=pd.DataFrame({name:self.decodeColumn(table.column(name),name) for name in table.column_names})
+        if index is not None:
+            dataset.index=index
+        return dataset
+
+def benchmarkStorage(dataset,directory='data',repeat=3):
+    """
+    A function comparing the time needed to write and read a data set as a csv file (decoded by DatasetLoader, without and with its cache), a Parquet file and an Arrow IPC file
+
+    Parameters
+    ----------
+    dataset : pd.DataFrame
+        Data set compiled by DatasetCompiler
+
+    directory : str
+        Directory for the temporary files. Defaults to "data"
+
+    repeat : int
+        Number of round trips of each format, the fastest one is reported. Defaults to 3
+
+    Returns
+    -------
+    timings : pd.DataFrame
+        Write time, read time (in seconds) and file size (in bytes) of each format
+    """
+    from tools.DatasetCompiler import readDataset
+    from tools.DatasetLoader import DatasetLoader
+    storage=ColumnarStorage()
+    timings={}
+    for extension in ['csv','parquet','arrow']:
+        file_path=os.path.join(directory,f'benchmark_storage.{extension}')
+        write_times, read_times = [], []
+        for i in range(repeat):
+            start=time.perf_counter()
+            if extension=='csv':
+                dataset.to_csv(file_path)
+            else:
+                storage.write(dataset,file_path)
+            write_times.append(time.perf_counter()-start)
+            start=time.perf_counter()
+            readDataset(file_path,cache=False)
+            read_times.append(time.perf_counter()-start)
+        timings[extension]={'write':min(write_times),'read':min(read_times),'size':os.path.getsize(file_path)}
+        if extension=='csv': #Warm load of the csv file from the cache of DatasetLoader
+            readDataset(file_path)
+            cache_times=[]
+            for i in range(repeat):
+                start=time.perf_counter()
+                readDataset(file_path)
+                cache_times.append(time.perf_counter()-start)
+            timings['csv (cached)']={'write':None,'read':min(cache_times),'size':os.path.getsize(file_path+DatasetLoader.cache_suffix)}
+            os.remove(file_path+DatasetLoader.cache_suffix)
+        os.remove(file_path)
+    timings=pd.DataFrame(timings).T
+    return timings
+
+if __name__ == "__main__": #Run only in case the file is run directly: benchmark on the shipped data set
+    from tools.DatasetCompiler import readDataset
+    print(benchmarkStorage(readDataset(os.path.join('data','restaurants_zlatestranky.csv'))))
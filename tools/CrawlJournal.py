@@ -0,0 +1,119 @@
+import threading
+import json
+import os
+
+class CrawlJournal:
+    """
+    A class keeping an append-only JSON lines file of restaurants that have already been compiled, so that an interrupted crawl can be resumed without requesting them again
+
+    ...
+
+    Attributes
+    ----------
+    file_path : str
+        Path to the journal file
+
+    Methods
+    -------
+    readRecords():
+        A function to read the records saved in the journal
+
+    append(record):
+        A function to durably add a record to the journal
+
+    clear():
+        A function to delete the journal file
+
+    rotate():
+        A function to move the journal of a completed crawl out of the way
+    """
+    def __init__(self,file_path):
+        """
+        Constructs the journal. The file is created on the first append.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the journal file
+        """
+        self.file_path=file_path
+        self.lock=threading.Lock()
+        if os.path.exists(self.file_path) and os.path.getsize(self.file_path)>0:
+            with open(self.file_path,'rb+') as journal_file:
+                journal_file.seek(-1,os.SEEK_END)
+                if journal_file.read(1)!=b'\n': #Terminate a line cut off by a crash so that the next record starts on a new line
+                    journal_file.write(b'\n')
+
+    def readRecords(self):
+        """
+        A function to read the records saved in the journal. A damaged last line (e.g. the process was killed while writing it) is ignored.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        records : dict
+            Records keyed by the restaurant's link
+        """
+        records={}
+        if not os.path.exists(self.file_path):
+            return records
+        with open(self.file_path,encoding='utf-8') as journal_file:
+            for line in journal_file:
+                try:
+                    record=json.loads(line)
+                except ValueError:
+                    continue
+                records[record['link']]=record
+        return records
+
+    def append(self,record):
+        """
+        A function to durably add a record to the journal. The line is flushed and synced to the disk before the function returns.
+
+        Parameters
+        ----------
+        record : dict
+            Record of a single restaurant (must contain the "link" key)
+
+        Returns
+        -------
+
+        """
+        line=json.dumps(record,ensure_ascii=False)+'\n'
+        with self.lock:
+            with open(self.file_path,'a',encoding='utf-8') as journal_file:
+                journal_file.write(line)
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+
+    def clear(self):
+        """
+        A function to delete the journal file
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+
+        """
+        with self.lock:
+            if os.path.exists(self.file_path):
+                os.remove(self.file_path)
+
+    def rotate(self):
+        """
+        A function to move the journal of a completed crawl to "<file_path>.done" (replacing an older one), so that its records are kept for inspection but never read instead of fresh pages by the next crawl
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+
+        """
+        with self.lock:
+            if os.path.exists(self.file_path):
+                os.replace(self.file_path,self.file_path+'.done')
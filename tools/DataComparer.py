@@ -85,7 +85,9 @@ class DataComparer:
                 df_ZS.exact_match.iat[i] = None
                 
             else:                              #assigns true in case of match and False in case of no match
-                zs_phones_dict = ast.literal_eval(df_ZS["phones"][i])
+                zs_phones_dict = df_ZS["phones"][i] #Already a dictionary if decoded by the loader (see DatasetCompiler.readDataset)
+                if isinstance(zs_phones_dict, str): #Data set read with a plain pd.read_csv
+                    zs_phones_dict = ast.literal_eval(zs_phones_dict)
                 
                 zs_phones_list = []
                 for n in zs_phones_dict:
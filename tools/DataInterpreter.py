@@ -1,4 +1,9 @@
 from xmlrpc.client import NOT_WELLFORMED_ERROR
+from tools.OpeningHours import OpeningHours
+from tools.OpenAtIndex import OpenAtIndex
+from tools.KeywordIndex import KeywordIndex
+from tools.ColumnRangeIndex import ColumnRangeIndex
+from tools.RestaurantQuery import RestaurantQuery
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
@@ -21,7 +26,25 @@ class DataInterpreter:
     
     district_counts : dict
         A dictionary containing the number of restaurants in each Prague municipal district
+
+    district_index : dict
+        A dictionary containing the positions of the restaurants in each district (including 'Not found')
     
+    opening_hours_table : pandas.DataFrame
+        Opening hours of all restaurants stored column-wise, one row per opening interval (row position of the restaurant, week day, start and end in minutes of the week)
+
+    open_at_index : OpenAtIndex
+        Index of the restaurants open at each time of the week
+
+    range_index : ColumnRangeIndex
+        Sorted permutations of the ratings, review counts and weekly opening hours durations
+
+    keyword_index : KeywordIndex
+        Inverted index of the normalized payment methods, products, services and marks
+
+    store : RestaurantStore or None
+        SQLite store of the data set answering the filters of scanThroughDataset
+
     array_of_sums_of_opening_hours_spans : numpy.ndarray
         An array containing the sum of weekly opening hours durations for each restaurant
 
@@ -42,9 +65,15 @@ class DataInterpreter:
     getDistrictCounts(dataset):
         A function to compute the number of restaurants in each district and put it in a dictionary
 
+    getDistrictIndex(dataset):
+        A function to get the positions of the restaurants in each district
+
     plotDistrictCounts(plot_type='pie'):
         A function to plot the district counts
 
+    getOpeningHoursTable(dataset):
+        A function to parse the opening hours of all restaurants once into a column-wise table of intervals
+
     getArrayOfSumsOfOpeningHoursSpans(dataset):
         A function to sum the weekly opening hours duration for each restaurant and put it in a numpy array
 
@@ -75,10 +104,22 @@ class DataInterpreter:
     showRows(no_of_rows=1):
         A function to show a specified number of rows from the top or from the bottom of the data set
 
-    scanThroughDataset(district=None,ratings=None,review_count=None,keyword=None,weekly_opening_duration=None,columns_to_display='all',max_no_of_rows=5):
+    openAt(moment,columns_to_display='all'):
+        A function to show the restaurants open at a given time of the week
+
+    query():
+        A function to start a query over the data set (see RestaurantQuery)
+
+    scanThroughDataset(district=None,ratings=None,review_count=None,keyword=None,weekly_opening_duration=None,open_at=None,columns_to_display='all',max_no_of_rows=5):
         A function to show a part of the data set based on the user's input
+
+    getRangeFilters(ratings=None,review_count=None,weekly_opening_duration=None):
+        A function to validate the numeric filters of scanThroughDataset
+
+    scanThroughStore(district=None,ratings=None,review_count=None,keyword=None,weekly_opening_duration=None,open_at=None,max_no_of_rows=5):
+        A function to filter the data set with indexed SQL queries on self.store
     """
-    def __init__(self,dataset):
+    def __init__(self,dataset,store=None):
         """
         Extracts valueable insight from the given data set and save it as attributes
 
@@ -86,14 +127,25 @@ class DataInterpreter:
         ----------
         dataset : pandas.DataFrame
             Data set generated by DatasetCompiler
+
+        store : RestaurantStore or None
+            SQLite store answering the filters of scanThroughDataset. A store that is empty or holds another data set (see RestaurantStore.getFingerprint) is filled with the processed data set. Defaults to None (the data set is filtered in memory)
         """
         self.dataset_raw=dataset
         self.dataset=self.removeEmptyObservations(self.dataset_raw)
         self.district_counts=self.getDistrictCounts(self.dataset)
+        self.district_index=self.getDistrictIndex(self.dataset)
+        self.opening_hours_table=self.getOpeningHoursTable(self.dataset)
+        self.open_at_index=OpenAtIndex(self.opening_hours_table,len(self.dataset))
+        self.keyword_index=KeywordIndex(self.dataset)
         self.array_of_sums_of_opening_hours_spans=self.getArrayOfSumsOfOpeningHoursSpans(self.dataset)
+        self.range_index=ColumnRangeIndex(self.dataset) #After the weekly opening hours durations were added
         self.categorical_data_counts_dict=self.getCategoricalDataCounts(self.dataset)
         self.number_of_phones_counts=self.getNumberOfPhonesCounts(self.dataset)
         self.email_providers_counts=self.getEmailProvidersCounts(self.dataset)
+        self.store=store
+        if self.store is not None and self.store.readFingerprint()!=self.store.getFingerprint(self.dataset): #Empty, or built from another data set (or schema)
+            self.store.writeDataset(self.dataset)
 
     def removeEmptyObservations(self,dataset):
         """
@@ -109,9 +161,9 @@ class DataInterpreter:
         dataset : pd.DataFrame
             Data set stripped of unuseful observations
         """
-        indic=[column for column in dataset.columns if column not in ['name','ratings','review_count']] #Name, ratings, and review count always have a value (ratings and review count usually 0). But if a restaurant has only these three values (a review count is zero), it is of no use to us => we drop it
+        indic=[column for column in dataset.columns if column not in ['name','ratings','review_count','link']] #Name, ratings, and review count always have a value (ratings and review count usually 0). But if a restaurant has only these three values (a review count is zero), it is of no use to us => we drop it. The link is always known as well
         for i in range(len(dataset)): #Check each observation
-            if (sum(pd.isna(dataset.loc[i,indic]))==12) & (dataset.review_count[i]==0): #If values in all other columns are missing and there are no reviews, drop the observation
+            if (sum(pd.isna(dataset.loc[i,indic]))==len(indic)) & (dataset.review_count[i]==0): #If values in all other columns are missing and there are no reviews, drop the observation
                 dataset.drop(i,inplace=True)
             else:
                 pass
@@ -135,6 +187,23 @@ class DataInterpreter:
         district_counts.drop('Not found',inplace=True) #Do not include the 'Not found' values. In these cases, only street is provided in the address so we cannot easily extract the district
         return district_counts
 
+    def getDistrictIndex(self,dataset):
+        """
+        A function to get the positions of the restaurants in each district, used by RestaurantQuery
+
+        Parameters
+        ----------
+        dataset : pd.DataFrame
+            A proccessed data set to be interpreted
+
+        Returns
+        -------
+        district_index : dict
+            District as key, sorted numpy array of the positions of its restaurants in the data set as value
+        """
+        district_index={district:np.array(rows,dtype=np.intp) for district, rows in dataset.reset_index(drop=True).groupby('district').indices.items()}
+        return district_index
+
     def plotDistrictCounts(self,plot_type='pie'):
         """
         A function to plot the district counts
@@ -160,9 +229,35 @@ class DataInterpreter:
         else:
             raise ValueError('Please specify the plot_type as "pie" or "bar"')
 
+    def getOpeningHoursTable(self,dataset):
+        """
+        A function to parse the opening hours of all restaurants once into a column-wise table of intervals in minutes of the week (see OpeningHours). Ranges past midnight, like '11 - 01', end on the next day.
+
+        Parameters
+        ----------
+        dataset : pd.DataFrame
+            A proccessed data set to be interpreted
+
+        Returns
+        -------
+        opening_hours_table : pd.DataFrame
+            One row per opening interval with the columns "row" (position of the restaurant in the data set), "day" (0 for Monday), "start" and "end" (minutes of the week)
+        """
+        rows, days, starts, ends = [], [], [], []
+        for row, opening_hours in enumerate(dataset.opening_hours):
+            if type(opening_hours)!=dict: #Opening hours not available
+                continue
+            for day, start, end in OpeningHours.fromDict(opening_hours).intervals:
+                rows.append(row)
+                days.append(day)
+                starts.append(start)
+                ends.append(end)
+        opening_hours_table=pd.DataFrame({'row':np.array(rows,dtype=np.int32),'day':np.array(days,dtype=np.int8),'start':np.array(starts,dtype=np.int32),'end':np.array(ends,dtype=np.int32)})
+        return opening_hours_table
+
     def getArrayOfSumsOfOpeningHoursSpans(self,dataset):
         """
-        A function to sum the weekly opening hours duration for each restaurant and put it in a numpy array
+        A function to sum the weekly opening hours duration for each restaurant and put it in a numpy array. The durations are computed from self.opening_hours_table at once.
 
         Parameters
         ----------
@@ -174,14 +269,9 @@ class DataInterpreter:
         array_of_sums_of_opening_hours_spans : numpy.ndarray
             An array containing the sum of weekly opening hours durations for each restaurant
         """
-        list_of_sums_of_opening_hours_spans=[]
-        for dict in dataset.opening_hours_span: #For each observation extract the opening hours dictionary
-            if pd.isna(dict): #If there is no dictionary, set value to NaN (we do not disregard it to keep the list length the same as in the data set)
-                value=np.NaN
-            else:
-                value=sum(filter(None,list(dict.values()))) #we make a list from the dicts values, filter out the None values and sum it
-            list_of_sums_of_opening_hours_spans.append(value)
-        array_of_sums_of_opening_hours_spans=np.array(list_of_sums_of_opening_hours_spans) #Convert to a numpy array for easier handling
+        table=self.opening_hours_table
+        minutes=np.bincount(table.row.to_numpy(),weights=(table.end-table.start).to_numpy(),minlength=len(dataset)) #Sum of the interval lengths of each restaurant
+        array_of_sums_of_opening_hours_spans=np.round(minutes/60,2)
         array_of_sums_of_opening_hours_spans[array_of_sums_of_opening_hours_spans==0]=np.nan #If the sum is zero, the restaurant is either closed or the opening hours are not available => we replace it with NaN
         self.dataset['weekly_opening_duration']=array_of_sums_of_opening_hours_spans #Adds a column to the data set
         return array_of_sums_of_opening_hours_spans
@@ -426,7 +516,43 @@ class DataInterpreter:
             dataset=self.dataset.tail(abs(no_of_rows))
         return dataset
 
-    def scanThroughDataset(self,district=None,ratings=None,review_count=None,keyword=None,weekly_opening_duration=None,columns_to_display='all',max_no_of_rows=5):
+    def openAt(self,moment,columns_to_display='all'):
+        """
+        A function to show the restaurants open at a given time of the week, looked up in self.open_at_index
+
+        Parameters
+        ----------
+        moment : str, tuple or datetime.datetime
+            A week day (Czech or English, full or abbreviated) followed by a time, e.g. 'Pá 23:30' or 'Friday 23:30', or a datetime
+
+        columns_to_display : list or str
+            A string representing a single column or a list of columns to be displayed. Defaults to 'all'
+
+        Returns
+        -------
+        dataset : pandas.DataFrame
+            Restaurants open at the given time
+        """
+        dataset=self.dataset[self.open_at_index.getOpenMask(moment)]
+        if columns_to_display!='all':
+            dataset=dataset[columns_to_display]
+        return dataset
+
+    def query(self):
+        """
+        A function to start a query over the data set. The query is built step by step and evaluated only when it is run, e.g. di.query().district('Praha 2').minRating(80).has('Wi-Fi').openAt('Fri 23:00').top(20,by='review_count').run() (see RestaurantQuery)
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        query : RestaurantQuery
+            A query matching the whole data set
+        """
+        return RestaurantQuery(self)
+
+    def scanThroughDataset(self,district=None,ratings=None,review_count=None,keyword=None,weekly_opening_duration=None,open_at=None,columns_to_display='all',max_no_of_rows=5):
         """
         A function to show a part of the data set based on the user's input
 
@@ -435,17 +561,20 @@ class DataInterpreter:
         district : str
             A string specifying the Prague municipal district (Praha 1-10)
         
-        ratings : int, float or str
-            A number specifying the lower bound for displayed ratings
+        ratings : int, float, str or tuple
+            A number specifying the lower bound for displayed ratings, or a (lower, upper) tuple of inclusive bounds (either can be None)
 
-        review_count : int, float or str
-            A number specifying the lower bound for the number of displayed review counts
+        review_count : int, float, str or tuple
+            A number specifying the lower bound for the number of displayed review counts, or a (lower, upper) tuple
 
-        keyword : str
-            A string use to search through categorical data and look for a match
+        keyword : str or list
+            A keyword searched in the payment methods, products, services and marks, ignoring the case and diacritics. It matches a whole element or one of its words, "*" at the end matches a prefix and several keywords can be combined with "AND" and "OR" (e.g. 'visa AND pizz*'). A list of keywords means all of them (see KeywordIndex.parseQuery)
 
-        weekly_opening_duration : int, float or str
-            A number specifying the lower bound for the displayed weekly opening hours duration
+        weekly_opening_duration : int, float, str or tuple
+            A number specifying the lower bound for the displayed weekly opening hours duration, or a (lower, upper) tuple
+
+        open_at : str, tuple or datetime.datetime
+            A time of the week at which the displayed restaurants are open, e.g. 'Pá 23:30' or 'Friday 23:30' (see openAt)
 
         columns_to_display : list or str
             A string representing a single column or a list of columns to be displayed. Defaults to 'all'
@@ -458,47 +587,25 @@ class DataInterpreter:
         dataset : pandas.DataFrame
             A dataset filtered with the user's input
         """
-        dataset=self.dataset
-        if district:
-            try:
-                dataset=dataset[dataset.district==district]
-            except:
-                raise ValueError('Invalid municipal district')
-        if ratings:
-            try:
-                ratings=float(ratings)
-                dataset=dataset[dataset.ratings>=ratings]
-            except:
-                raise ValueError('Invalid ratings')
-        if review_count:
-            try:
-                review_count=float(review_count)
-                dataset=dataset[dataset.review_count>=review_count]
-            except:
-                raise ValueError('Invalid number of reviews')
-        if keyword:
-            indices=[]
-            for column in ['payment_methods','products','services','marks']:
-                for idx, value in enumerate(dataset[column]):
-                    if type(value)==type([]):
-                        if keyword in value:
-                            indices.append(idx)
-                        else:
-                            pass
-                    elif pd.isna(value):
-                        pass
-                    elif keyword==value:
-                        indices.append(idx)
-                    else:
-                        pass
-            indices=list(set(indices)) #To avoid duplicate indices
-            dataset=dataset.iloc[indices]
-        if weekly_opening_duration:
-            try:
-                weekly_opening_duration=float(weekly_opening_duration)
-                dataset=dataset[dataset.weekly_opening_duration>=weekly_opening_duration]
-            except:
-                raise ValueError('Invalid weekly_opening_duration')
+        if self.store is not None: #Filters pushed down to the indexes of the store
+            dataset=self.scanThroughStore(district,ratings,review_count,keyword,weekly_opening_duration,open_at,max_no_of_rows)
+            district=ratings=review_count=keyword=weekly_opening_duration=open_at=None
+        else: #Built as a query, so the most selective filter is evaluated first and the data set is sliced only once
+            query=self.query()
+            for column, (low, high) in self.getRangeFilters(ratings,review_count,weekly_opening_duration).items():
+                query=query.range(column,low,high)
+            if district:
+                query=query.district(district)
+            if keyword:
+                query=query.has(keyword)
+            if open_at:
+                query=query.openAt(open_at)
+            if max_no_of_rows:
+                try:
+                    query=query.limit(int(max_no_of_rows))
+                except:
+                    raise ValueError('Invalid number of rows specified')
+            dataset=query.run()
         if len(dataset)==0:
             print('No results found for Your input')
         else:
@@ -515,4 +622,49 @@ class DataInterpreter:
             else:
                 return dataset
 
+    def getRangeFilters(self,ratings=None,review_count=None,weekly_opening_duration=None):
+        """
+        A function to validate the numeric filters of scanThroughDataset
+
+        Parameters
+        ----------
+        ratings, review_count, weekly_opening_duration : int, float, str or tuple
+            A lower bound or a (lower, upper) tuple, filters that are not given (or zero) are skipped
+
+        Returns
+        -------
+        range_filters : dict
+            Column as key, (lower, upper) bounds as value (see ColumnRangeIndex.parseBounds)
+        """
+        range_filters={}
+        for column, bounds, message in [('ratings',ratings,'Invalid ratings'),('review_count',review_count,'Invalid number of reviews'),('weekly_opening_duration',weekly_opening_duration,'Invalid weekly_opening_duration')]:
+            if bounds:
+                try:
+                    range_filters[column]=ColumnRangeIndex.parseBounds(bounds)
+                except (ValueError,TypeError):
+                    raise ValueError(message)
+        return range_filters
+
+    def scanThroughStore(self,district=None,ratings=None,review_count=None,keyword=None,weekly_opening_duration=None,open_at=None,max_no_of_rows=5):
+        """
+        A function to filter the data set with indexed SQL queries on self.store instead of comparing every row. The filters have the same meaning as in scanThroughDataset, the store has to hold the same data set.
 
+        Parameters
+        ----------
+        district, ratings, review_count, keyword, weekly_opening_duration, open_at, max_no_of_rows :
+            Filters of scanThroughDataset
+
+        Returns
+        -------
+        dataset : pandas.DataFrame
+            The matching rows of the data set
+        """
+        range_filters=self.getRangeFilters(ratings,review_count,weekly_opening_duration)
+        try:
+            limit=int(max_no_of_rows) if max_no_of_rows else None
+        except:
+            raise ValueError('Invalid number of rows specified')
+        open_at=self.open_at_index.parseMoment(open_at) if open_at else None
+        ids=self.store.selectIds(district=district or None,keyword=keyword or None,open_at=open_at,limit=limit,**range_filters)
+        dataset=self.dataset[self.dataset.index.isin(ids)]
+        return dataset
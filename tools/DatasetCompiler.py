@@ -1,6 +1,20 @@
 from tools.Restaurant import Restaurant
+from tools.RestaurantRecord import RestaurantRecord
+from tools.HttpClient import getDefaultClient
+from tools.CrawlJournal import CrawlJournal
+from tools.PageArchive import PageArchive
+from tools.StreamingWriter import StreamingWriter
+from tools.ColumnarStorage import ColumnarStorage
+from tools.DatasetLoader import DatasetLoader
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+import itertools
+import requests
 import pandas as pd
-import ast
+import hashlib
+import zipfile
+import json
+import os
 
 class DatasetCompiler:
     """
@@ -11,32 +25,101 @@ class DatasetCompiler:
     Attributes
     ----------
     dataset : pd.DataFrame
-        Data set either compiled from the given links or loaded from an existing file
+        Data set either compiled from the given links or loaded from an existing file. Its columns are RestaurantRecord.fields, the last of them, "link", identifies the restaurant's page so that updateDataset can tell which restaurants are new, changed or gone (data sets compiled before it was added have no "link" column)
     
     links : list or str
         Either a list of strings for each restaurant or a string containing a link for a single restaurant
     
     list_of_restaurants : list
-        List of Restaurant objects created from the links
+        List of RestaurantRecord objects created from the links (the parsed pages are not kept)
+
+    concurrency : int
+        Maximum number of restaurant pages requested at the same time
+
+    client : HttpClient or None
+        Client shared by all Restaurant objects to request their pages. If None, the shared client from tools.HttpClient is created on the first request
+
+    journal : CrawlJournal or None
+        Journal of already compiled restaurants used to resume an interrupted crawl
+
+    refresh : set
+        Links that are always requested again, even if they are saved in the journal or their page has not changed
+
+    failed_links : dict
+        Links that could not be compiled with the reason of the failure
+
+    save_pages : str or None
+        Directory to which every downloaded restaurant page is saved
+
+    archive : PageArchive or None
+        Archive to which every downloaded restaurant page is written
+
+    processes : int or None
+        Number of worker processes parsing the pages
+
+    parser : str
+        Beautiful Soup tree builder used to parse the pages
+
+    partial : bool
+        Whether only the parts of the pages read by the extractors are parsed
+
+    writer : StreamingWriter or None
+        Writer appending every compiled record to a file while the crawl runs
 
     Methods
     -------
-    getListOfRestaurants(links):
-        A function creating a list or Restaurant objects given the links
+    getRecords(links):
+        A function to get a record for each link, reusing the records saved in the journal
+
+    getRestaurant(link, content=None):
+        A function creating a single Restaurant object and saving its record to the journal
+
+    iterRecords(links):
+        A function to compile the restaurants one by one, yielding a compact record for each of them
+
+    getRecord(link, content=None):
+        A function to compile a single restaurant into a compact record, freeing its parsed page right away
+
+    getPage(link, request=None):
+        A function to download a restaurant's page (and save it if self.save_pages is set)
+
+    getRecordsFromPages(pages):
+        A function to get a record for each stored page without sending any request
+
+    readStoredPages(pages):
+        A function to read the pages stored in a directory, a zip archive or a PageArchive file
+
+    saveManifest():
+        A function to save the links of the pages saved during the crawl
+
+    iterPages(links):
+        A function to download the pages of the given links, yielding them as they arrive
+
+    getRecordsInProcesses(pages):
+        A function to parse pages in a pool of worker processes
+
+    compareParsers(pages, parsers=['html.parser','lxml']):
+        A function to check that several parsers extract exactly the same values from stored pages
     
     getDataset(list_of_restaurants):
-        A function to compile a data set given a list of Restaurant objects
+        A function to compile a data set given a list of Restaurant or RestaurantRecord objects
 
     dumpToCSV(file_name='restaurants_zlatestranky.csv'):
-        A function to export the compiled data set to a csv file named "file_name"
+        A function to export the compiled data set to a csv, Parquet or Arrow file named "file_name"
 
     readExistingDataset(file_name):
-        A function to read an existing data set from a csv file named "file_name". It also converts strings to Python objects.
+        A function to read an existing data set from a csv, Parquet or Arrow file named "file_name". It also converts strings to Python objects.
+
+    updateDataset(existing_dataset, links):
+        A function to update an existing data set so that it matches the given links, requesting only new or changed restaurants
+
+    revalidate(link):
+        A function to check whether a restaurant's page has changed since it was last requested, compiling it right away if it has
 
     """
-    def __init__(self,links=None,existing=True,file_name='restaurants_zlatestranky.csv'):
+    def __init__(self,links=None,existing=True,file_name='restaurants_zlatestranky.csv',concurrency=1,client=None,incremental=False,checkpoint=None,pages=None,save_pages=None,archive=None,processes=None,parser='html.parser',partial=False,stream_to=None,refresh=None):
         """
-        Constructs all the attributes given the parameters. If existing=False, compiles a new data set. Otherwise, reads an existing one based on file_name
+        Constructs all the attributes given the parameters. If existing=False, compiles a new data set (or updates the one in file_name if incremental=True, or parses stored pages if pages is given). Otherwise, reads an existing one based on file_name
 
         Parameters
         ----------
@@ -47,84 +130,465 @@ class DatasetCompiler:
             A boolean indicating whether an existing data set should be loaded or a new one should be compiled. Defaults to True
 
         file_name : str
-            Name of the file to read in case existing=True. Defaults to "restaurants_zlatestranky.csv"
+            Name of the file to read in case existing=True or incremental=True. Defaults to "restaurants_zlatestranky.csv"
+
+        concurrency : int
+            Maximum number of restaurant pages requested at the same time. Defaults to 1 (one page after another)
+
+        client : HttpClient or None
+            Client shared by all Restaurant objects to request their pages. Defaults to the shared client from tools.HttpClient, which is only created once a page is requested (loading an existing data set or stored pages does not create it or its cache directory)
+
+        incremental : bool
+            If True (and existing=False), the data set in file_name is updated instead of compiled from scratch: new restaurants are added, changed ones are requested again and restaurants missing from the links are dropped. Defaults to False
+
+        checkpoint : str or None
+            Name of a journal file in the data folder. Every compiled restaurant is appended to it, so that running the compiler again with the same links after an interruption skips the restaurants that are already done. Once the data set is compiled, the journal is rotated to "<checkpoint>.done" and the next run starts from scratch. Defaults to None (no journal)
+
+        pages : str or None
+            Path to a directory or a zip archive of stored restaurant pages (e.g. saved with save_pages) or to a PageArchive file. If given (and existing=False), the data set is compiled from these pages without sending any request. Defaults to None
+
+        save_pages : str or None
+            Directory to which every downloaded restaurant page is saved, so that the data set can later be compiled again with pages=save_pages. Defaults to None
+
+        archive : PageArchive or None
+            Archive to which every downloaded restaurant page is written together with its headers and fetch time. Defaults to None
+
+        processes : int or None
+            If greater than 1, the pages are parsed in this many worker processes while the main process keeps downloading. Only the small extracted records are sent back as dictionaries, so self.list_of_restaurants stays empty. Defaults to None (pages are parsed in the main process)
+
+        parser : str
+            Beautiful Soup tree builder used to parse the pages: "html.parser", "lxml" (requires the lxml package) or "html5lib". Use compareParsers to check a parser against stored pages. Defaults to "html.parser"
+
+        partial : bool
+            If True, only the parts of the pages read by the extractors are parsed (see Restaurant.partial_queries), which is faster and needs less memory. Use compareParsers with ('html.parser', True) to check it against stored pages. Defaults to False
+
+        stream_to : str or None
+            Name of a ".csv" or ".jsonl" file in the data folder. Every record is appended to "<stream_to>.partial" as soon as it is compiled. Once the data set is complete, the rows are sorted into its order and the file gets its final name. If the compilation fails, the ".partial" file keeps the records compiled so far. Defaults to None
+
+        refresh : list or None
+            Links that are requested again even if they are saved in the journal (or, if incremental=True, even if their page has not changed). Defaults to None
         """
+        self.concurrency=concurrency
+        self.client=client
+        self.journal=CrawlJournal(os.path.join('data',checkpoint)) if checkpoint else None
+        self.refresh=set([refresh] if type(refresh)==type('') else refresh or [])
+        self.failed_links={}
+        self.save_pages=save_pages
+        self.saved_pages={}
+        self.archive=archive
+        self.processes=processes
+        self.parser=parser
+        self.partial=partial
+        self.writer=None
         if existing:
             self.dataset=self.readExistingDataset(file_name)
+        elif pages or links:
+            self.writer=StreamingWriter(os.path.join('data',stream_to)) if stream_to else None
+            try:
+                if pages:
+                    self.dataset=pd.DataFrame(self.getRecordsFromPages(pages))
+                else:
+                    self.links=links
+                    if incremental:
+                        self.dataset=self.updateDataset(self.readExistingDataset(file_name),self.links)
+                    else:
+                        self.dataset=pd.DataFrame(self.getRecords(self.links))
+            except BaseException:
+                if self.writer is not None:
+                    self.writer.close(complete=False) #Keep the records written so far in the .partial file
+                raise
+            if self.writer is not None:
+                self.writer.close(order=list(self.dataset.link) if 'link' in self.dataset.columns else None) #Rows were written as they were completed => same order as the data set (and dumpToCSV)
+                print(f'{self.writer.rows_written} restaurants streamed to {self.writer.file_path}')
+            if self.journal:
+                self.journal.rotate() #The crawl is complete => its records must not be reused instead of fresh pages by the next run
         else:
-            if links:
-                self.links=links
-                self.list_of_restaurants=self.getListOfRestaurants(self.links)
-                self.dataset=self.getDataset(self.list_of_restaurants)
-            else:
-                print('Please either provide the links or set the "existing" parameter to True')
+            print('Please either provide the links (or the stored pages) or set the "existing" parameter to True')
 
-    def getListOfRestaurants(self,links):
+    def getRecords(self,links):
         """
-        A function creating a list or Restaurant objects given the links
+        A function to get a record (dictionary of attributes) for each link. Links already saved in the journal are not requested again (unless they are in self.refresh), the remaining ones are stored in self.list_of_restaurants as RestaurantRecord objects. Links that failed are left out (see self.failed_links).
 
         Parameters
         ----------
-        links : str
+        links : list or str
             Either a list of links for each restaurant or a string containing a link for a single restaurant
 
         Returns
         -------
-        list_of_restaurants : list
-            List of Restaurant objects created from the links
+        records : list
+            List of dictionaries in the order of the links
+        """
+        if type(links)==type(''):
+            links=[links]
+        done=self.journal.readRecords() if self.journal else {}
+        done={link:record for link, record in done.items() if link not in self.refresh} #Links requested for a re-scrape never come from the journal
+        links_to_request=[link for link in links if link not in done]
+        if len(links_to_request)<len(links):
+            print(f'Skipping {len(links)-len(links_to_request)} restaurants found in the checkpoint')
+            if self.writer is not None: #Restaurants from the checkpoint are streamed first
+                for link in links:
+                    if link in done:
+                        self.writer.write(done[link])
+        if self.processes and self.processes>1:
+            self.list_of_restaurants=[]
+            fresh=self.getRecordsInProcesses(self.iterPages(links_to_request))
+        else:
+            self.list_of_restaurants=[]
+            for record in self.iterRecords(links_to_request):
+                self.list_of_restaurants.append(record)
+                if self.writer is not None:
+                    self.writer.write(record)
+            fresh={record.link:record.toRecord() for record in self.list_of_restaurants}
+        records=[done[link] if link in done else fresh[link] for link in links if link in done or link in fresh]
+        return records
+
+    def getRestaurant(self,link,content=None):
+        """
+        A function creating a single Restaurant object. If there is a journal, the restaurant's record is saved to it as soon as it is compiled. If the page cannot be requested or parsed, the reason is saved to self.failed_links instead of stopping the whole crawl.
+
+        Parameters
+        ----------
+        link : str
+            Link to the restaurant's page
+
+        content : bytes or None
+            Already downloaded HTML of the page. If None, the page is requested. Defaults to None
+
+        Returns
+        -------
+        restaurant : Restaurant or None
+            Restaurant object created from the link, None if it failed
+        """
+        try:
+            if content is None:
+                content=self.getPage(link)
+            restaurant=Restaurant.fromHTML(content,link,self.parser,self.partial)
+        except Exception as error: #Any failure of a single page (request or parsing) should not stop the crawl
+            self.failed_links[link]=f'{type(error).__name__}: {error}'
+            return None
+        if self.journal:
+            self.journal.append(restaurant.toRecord())
+        return restaurant
+
+    def iterRecords(self,links):
+        """
+        A function to compile the restaurants one by one, yielding a compact record for each of them in the order of the links. Each page is freed as soon as its attributes are extracted and at most 2*self.concurrency restaurants are in progress at the same time, so the memory used does not grow with the number of links. Restaurants that cannot be compiled are reported in self.failed_links and left out.
+
+        Parameters
+        ----------
+        links : list or str
+            Either a list of links for each restaurant or a string containing a link for a single restaurant
+
+        Returns
+        -------
+        records : generator
+            Generator of RestaurantRecord objects
         """
-        list_of_restaurants=[]
         if type(links)==type(''):
-            links=[links] #In case of a single string we convert it to a list
-        for link in links:
-            list_of_restaurants.append(Restaurant(link))
-        return list_of_restaurants
+            links=[links]
+        failed=0
+        with ThreadPoolExecutor(max_workers=max(1,self.concurrency)) as executor:
+            pending=deque()
+            for link in links:
+                pending.append(executor.submit(self.getRecord,link))
+                if len(pending)>=2*max(1,self.concurrency): #Bounded window => finished records do not pile up when the consumer is slower
+                    record=pending.popleft().result()
+                    if record is None:
+                        failed+=1
+                    else:
+                        yield record
+            while pending:
+                record=pending.popleft().result()
+                if record is None:
+                    failed+=1
+                else:
+                    yield record
+        if self.save_pages:
+            self.saveManifest()
+        if failed:
+            print(f'Failed to compile {failed} restaurants (see failed_links)')
+
+    def getRecord(self,link,content=None):
+        """
+        A function to compile a single restaurant into a compact record. The Restaurant object and its parsed page are freed right after the attributes are extracted.
+
+        Parameters
+        ----------
+        link : str
+            Link to the restaurant's page
+
+        content : bytes or None
+            Already downloaded HTML of the page. If None, the page is requested. Defaults to None
+
+        Returns
+        -------
+        record : RestaurantRecord or None
+            Record of the restaurant, None if it failed
+        """
+        restaurant=self.getRestaurant(link,content)
+        if restaurant is None:
+            return None
+        restaurant.releaseSoup()
+        record=RestaurantRecord.fromRestaurant(restaurant)
+        return record
+
+    def getPage(self,link,request=None):
+        """
+        A function to download a restaurant's page. If self.save_pages is set, the page is also saved to that directory.
+
+        Parameters
+        ----------
+        link : str
+            Link to the restaurant's page
+
+        request : requests.Response or None
+            Already received response for the link (e.g. from revalidate). If None, the page is requested. Defaults to None
+
+        Returns
+        -------
+        content : bytes
+            HTML of the page
+        """
+        if request is None:
+            client=self.client or getDefaultClient()
+            request=client.get(link)
+        if request.status_code!=200:
+            raise requests.HTTPError(f'Unsuccessful request ({request.status_code}) for {link}',response=request)
+        content=request.content
+        if self.archive is not None:
+            self.archive.append(link,content,request.headers,request.status_code,kind='detail')
+        if self.save_pages:
+            os.makedirs(self.save_pages,exist_ok=True)
+            page_name=f'{hashlib.sha256(link.encode("utf-8")).hexdigest()}.html'
+            with open(os.path.join(self.save_pages,page_name),'wb') as page_file:
+                page_file.write(content)
+            self.saved_pages[page_name]=link
+        return content
+
+    def saveManifest(self):
+        """
+        A function to save the links of the pages saved during the crawl to "links.json" in self.save_pages (file name as key, link as value). Links saved by previous crawls are kept.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+
+        """
+        manifest_path=os.path.join(self.save_pages,'links.json')
+        manifest={}
+        if os.path.exists(manifest_path):
+            with open(manifest_path,encoding='utf-8') as json_file:
+                manifest=json.load(json_file)
+        manifest.update(self.saved_pages)
+        with open(manifest_path,'w',encoding='utf-8') as json_file:
+            json.dump(manifest,json_file,ensure_ascii=False,indent=0)
+
+    def getRecordsFromPages(self,pages):
+        """
+        A function to get a record (dictionary of attributes) for each stored page without sending any request. Pages that cannot be parsed are reported in self.failed_links.
+
+        Parameters
+        ----------
+        pages : str
+            Path to a directory, a zip archive or a PageArchive file of stored pages
+
+        Returns
+        -------
+        records : list
+            List of dictionaries, one per successfully parsed page
+        """
+        if self.processes and self.processes>1:
+            records=list(self.getRecordsInProcesses(self.readStoredPages(pages)).values())
+        else:
+            records=[]
+            for link, content in self.readStoredPages(pages):
+                record=self.getRecord(link,content)
+                if record is not None:
+                    records.append(record.toRecord())
+                    if self.writer is not None:
+                        self.writer.write(record)
+            if self.failed_links:
+                print(f'Failed to compile {len(self.failed_links)} restaurants (see failed_links)')
+        return records
+
+    def iterPages(self,links):
+        """
+        A function to download the pages of the given links (up to self.concurrency at the same time), yielding them as they arrive. At most 2*self.concurrency links are submitted at once and the next ones only when a download is finished, so neither the queued links nor the downloaded pages pile up, and a slow page does not hold back the ones after it. Pages that cannot be downloaded are reported in self.failed_links.
+
+        Parameters
+        ----------
+        links : list
+            Links to the restaurants' pages
+
+        Returns
+        -------
+        pages : generator
+            Generator of (link, content) tuples in the order in which the downloads are finished
+        """
+        def tryGetPage(link):
+            try:
+                return self.getPage(link)
+            except Exception as error:
+                self.failed_links[link]=f'{type(error).__name__}: {error}'
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1,self.concurrency)) as executor:
+            for (link,), future in iterCompleted(executor,tryGetPage,((link,) for link in links),2*max(1,self.concurrency)):
+                content=future.result()
+                if content is not None:
+                    yield link, content
+        if self.save_pages:
+            self.saveManifest()
+
+    def getRecordsInProcesses(self,pages):
+        """
+        A function to parse pages in a pool of self.processes worker processes. Pages are handed to the workers as soon as they arrive, so parsing overlaps with downloading, and each worker sends back only the extracted record. At most 2*self.processes pages are waiting in the pool and the next page is only taken once a record has been saved to the journal (and the writer), so an interrupted crawl loses at most that many pages and the pages do not pile up in memory. Pages that cannot be parsed are reported in self.failed_links.
+
+        Parameters
+        ----------
+        pages : iterable
+            Iterable of (link, content) tuples
+
+        Returns
+        -------
+        records : dict
+            Records keyed by the link, in the order of the pages
+        """
+        records={}
+        def iterArguments():
+            for link, content in pages:
+                records[link]=None #Reserve the position to keep the order of the pages
+                yield link, content, self.parser, self.partial
+
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            for arguments, future in iterCompleted(executor,parsePage,iterArguments(),2*self.processes):
+                link=arguments[0]
+                try:
+                    records[link]=future.result()
+                except Exception as error:
+                    self.failed_links[link]=f'{type(error).__name__}: {error}'
+                    continue
+                if self.journal:
+                    self.journal.append(records[link])
+                if self.writer is not None:
+                    self.writer.write(records[link])
+        records={link:record for link, record in records.items() if record is not None}
+        if self.failed_links:
+            print(f'Failed to compile {len(self.failed_links)} restaurants (see failed_links)')
+        return records
+
+    def compareParsers(self,pages,parsers=['html.parser','lxml']):
+        """
+        A function to check that several parsers extract exactly the same values from stored pages. The first parser is the reference and every field of every page is compared with it. A parser can also be given as a (parser, partial) tuple to check partial parsing, e.g. parsers=['html.parser',('html.parser',True)].
+
+        Parameters
+        ----------
+        pages : str
+            Path to a directory, a zip archive or a PageArchive file of stored pages
+
+        parsers : list
+            Beautiful Soup tree builders (or (parser, partial) tuples) to compare. Defaults to ['html.parser','lxml']
+
+        Returns
+        -------
+        differences : pd.DataFrame
+            One row per differing field (link, field, parser, reference value, value). Empty if all parsers agree
+        """
+        differences=[]
+        for link, content in self.readStoredPages(pages):
+            results={}
+            for parser in parsers:
+                parser_name, partial = parser if isinstance(parser,tuple) else (parser, False)
+                try:
+                    results[parser]=Restaurant.fromHTML(content,link,parser_name,partial).toRecord()
+                except Exception as error:
+                    results[parser]={'error':f'{type(error).__name__}: {error}'}
+            reference=results[parsers[0]]
+            for parser in parsers[1:]:
+                for field in set(reference)|set(results[parser]):
+                    if reference.get(field)!=results[parser].get(field):
+                        differences.append({'link':link,'field':field,'parser':parser,'reference':reference.get(field),'value':results[parser].get(field)})
+        differences=pd.DataFrame(differences,columns=['link','field','parser','reference','value'])
+        return differences
+
+    def readStoredPages(self,pages):
+        """
+        A function to read the pages stored in a directory, a zip archive or a PageArchive file. In a directory or a zip archive, each HTML file is one page. The link of a page is looked up in "links.json" (file name as key, link as value) and the file name is used if it is not there. From a PageArchive, the latest version of every restaurant page is read.
+
+        Parameters
+        ----------
+        pages : str
+            Path to a directory, a zip archive or a PageArchive file of stored pages
+
+        Returns
+        -------
+        stored_pages : generator
+            Generator of (link, content) tuples
+        """
+        if os.path.isfile(pages) and not zipfile.is_zipfile(pages):
+            for record in PageArchive(pages).replay(kind='detail'):
+                yield record['url'], record['content']
+        elif zipfile.is_zipfile(pages):
+            with zipfile.ZipFile(pages) as archive:
+                names=archive.namelist()
+                manifest=json.loads(archive.read('links.json')) if 'links.json' in names else {}
+                for name in sorted(names):
+                    if name.endswith(('.html','.htm')):
+                        yield manifest.get(name,name), archive.read(name)
+        else:
+            manifest_path=os.path.join(pages,'links.json')
+            manifest={}
+            if os.path.exists(manifest_path):
+                with open(manifest_path,encoding='utf-8') as json_file:
+                    manifest=json.load(json_file)
+            for name in sorted(os.listdir(pages)):
+                if name.endswith(('.html','.htm')):
+                    with open(os.path.join(pages,name),'rb') as page_file:
+                        yield manifest.get(name,name), page_file.read()
 
     def getDataset(self,list_of_restaurants):
         """
-        A function to compile a data set given a list of Restaurant objects
+        A function to compile a data set given a list of Restaurant or RestaurantRecord objects
 
         Parameters
         ----------
         list_of_restaurants : list
-            List of Restaurant objects created from the links
+            List of Restaurant or RestaurantRecord objects created from the links
 
         Returns
         -------
         df : pd.DataFrame
-            Data set compiled from the list of Restaurant objects
-        """
-        attributes=list(list_of_restaurants[0].__dict__.keys()) #Attributes are the same accross instances => need to get them only once.
-        attributes.remove('soup')
-        attributes.remove('dist_dict')  #We disregard soup and dist_dict since we do not need them in the data set
-        restaurants_list_of_dicts=[] #Making a list of dictionaries to be able to transform it into a pd.DataFrame 
-        for restaurant in list_of_restaurants:
-            restaurant_dict={} #Dictionary for each restaurant
-            for attribute in attributes: #Add each attribute to the dictionary
-                restaurant_dict[attribute]=getattr(restaurant,attribute)
-            restaurants_list_of_dicts.append(restaurant_dict)
+            Data set compiled from the list of objects
+        """
+        restaurants_list_of_dicts=[restaurant.toRecord() for restaurant in list_of_restaurants] #Making a list of dictionaries to be able to transform it into a pd.DataFrame 
         df=pd.DataFrame(restaurants_list_of_dicts)
         return df
 
     def dumpToCSV(self,file_name='restaurants_zlatestranky.csv'):
         """
-        A function to export the compiled data set to a csv file named file_name
+        A function to export the compiled data set to a file named file_name. A ".parquet", ".arrow" or ".feather" file is written with typed columns (see ColumnarStorage), any other file as a csv file.
 
         Parameters
         ----------
         file_name : str
-            Desired name of the exported csv file
+            Desired name of the exported file
 
         Returns
         -------
 
         """
         file_path=f'data\\{file_name}'
-        self.dataset.to_csv(file_path)
+        if ColumnarStorage.isColumnar(file_path):
+            ColumnarStorage().write(self.dataset,file_path)
+        else:
+            self.dataset.to_csv(file_path)
 
     def readExistingDataset(self,file_name):
         """
-        A function to read an existing data set from a csv file. It also converts strings to Python objects.
+        A function to read an existing data set from a csv, Parquet or Arrow file (see readDataset). Dictionaries and lists are converted to Python objects.
 
         Parameters
         ----------
@@ -137,12 +601,170 @@ class DatasetCompiler:
             Data set read from the file named file_name
         """
         file_path=f'data\\{file_name}'
-        df=pd.read_csv(file_path,index_col=0)
-        #Dictionaries and lists are read from csv as strings=> we need to convert them back
-        for column in ['opening_hours','opening_hours_span','phones','payment_methods','products','services','marks','coordinates']:
-            for idx in df.index:
-                try:
-                    df.at[idx,column]=ast.literal_eval(df.at[idx,column])  
-                except ValueError:
-                    pass #In case there is NaN, ast.literal_eval throws an error => we will pass since we do not need to convert NaNs anyway
-        return df
\ No newline at end of file
+        df=readDataset(file_path)
+        return df
+
+    def updateDataset(self,existing_dataset,links):
+        """
+        A function to update an existing data set so that it matches the given links. Every known restaurant is revalidated once (see revalidate) and compiled again only if its page has changed, restaurants that are not in the existing data set are requested and restaurants that are no longer listed are dropped.
+
+        Parameters
+        ----------
+        existing_dataset : pd.DataFrame
+            Previously compiled data set. Its "link" column matches the rows to the links, a data set without it is compiled again from scratch
+
+        links : list or str
+            Either a list of freshly retrieved links for each restaurant or a string containing a link for a single restaurant
+
+        Returns
+        -------
+        df : pd.DataFrame
+            Updated data set with the restaurants in the order of the links
+        """
+        if type(links)==type(''):
+            links=[links]
+        if 'link' not in existing_dataset.columns: #Data sets compiled before the link was stored cannot be matched => compile everything
+            print('The existing data set does not contain the links, compiling a new one')
+            return pd.DataFrame(self.getRecords(links))
+        known={link:idx for idx, link in zip(existing_dataset.index,existing_dataset.link) if not pd.isna(link)}
+        known_links=[link for link in links if link in known]
+        if self.concurrency>1:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                revalidated=dict(zip(known_links,executor.map(self.revalidate,known_links)))
+        else:
+            revalidated={link:self.revalidate(link) for link in known_links}
+        new_links=[link for link in links if link not in known]
+        rows={record['link']:record for record in self.getRecords(new_links)}
+        done=self.journal.readRecords() if self.journal else {}
+        for link in known_links:
+            unchanged, record = revalidated[link]
+            if record is not None: #Changed page, compiled from the body received while revalidating it
+                rows[link]=record.toRecord()
+            elif unchanged and link in done: #Compiled again by an interrupted run, so the cached page already is the changed one
+                rows[link]=done[link]
+            else: #Unchanged restaurants and the ones that failed to be requested again keep their previous values
+                rows[link]=existing_dataset.loc[known[link]].to_dict()
+            if self.writer is not None:
+                self.writer.write(rows[link])
+        if self.save_pages:
+            self.saveManifest()
+        df=pd.DataFrame([rows[link] for link in links if link in rows],columns=existing_dataset.columns)
+        unchanged_count=sum(unchanged for unchanged, record in revalidated.values())
+        print(f'Kept {unchanged_count}, requested {len(known_links)-unchanged_count} changed and {len(new_links)} new and dropped {len(set(known)-set(links))} restaurants')
+        return df
+
+    def revalidate(self,link):
+        """
+        A function to check whether a restaurant's page has changed since it was last requested. This can only be found out if the client has a response cache, otherwise the page is assumed to be unchanged. Links in self.refresh are always treated as changed. A changed page is compiled from the body of the revalidation response, so it is downloaded only once. Failures are reported in self.failed_links.
+
+        Parameters
+        ----------
+        link : str
+            Link to the restaurant's page
+
+        Returns
+        -------
+        unchanged : bool
+            True if the server confirmed that the cached page is still valid (or if there is no cache)
+
+        record : RestaurantRecord or None
+            Record compiled from the changed page, None if the page is unchanged or could not be requested or parsed
+        """
+        refresh=link in self.refresh
+        client=self.client or getDefaultClient()
+        if client.cache is None and not refresh:
+            return True, None
+        try:
+            request=client.get(link) #A 304 answer means the page has not changed, anything else carries the whole new page
+            if request.from_cache and not refresh:
+                return True, None
+            content=self.getPage(link,request)
+        except requests.RequestException as error:
+            self.failed_links[link]=f'{type(error).__name__}: {error}'
+            return False, None
+        record=self.getRecord(link,content)
+        return False, record
+
+def readDataset(file_path,cache=True):
+    """
+    A function to read a data set compiled by DatasetCompiler. A ".parquet", ".arrow" or ".feather" file already holds typed columns (see ColumnarStorage), in a csv file the dictionaries and lists are strings that are decoded by DatasetLoader.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file
+
+    cache : bool
+        Whether the decoded csv file is cached (see DatasetLoader). Defaults to True
+
+    Returns
+    -------
+    df : pd.DataFrame
+        The data set
+    """
+    if ColumnarStorage.isColumnar(file_path):
+        return ColumnarStorage().read(file_path)
+    df=DatasetLoader(cache=cache).load(file_path)
+    return df
+
+def iterCompleted(executor,function,arguments,window):
+    """
+    A function submitting function(*argument) to an executor for each argument while at most "window" calls are in flight. The next argument is only taken from the iterable once a call is finished and its result has been handed out, so a slow or endless iterable never gets submitted all at once.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor
+        Executor running the calls
+
+    function : callable
+        Function to call (it must be picklable for a ProcessPoolExecutor)
+
+    arguments : iterable
+        Iterable of tuples of positional arguments, one per call
+
+    window : int
+        Maximum number of calls submitted at the same time
+
+    Returns
+    -------
+    calls : generator
+        Generator of (argument, future) tuples in the order in which the calls are finished
+    """
+    arguments=iter(arguments)
+    pending={}
+    for argument in itertools.islice(arguments,max(1,window)):
+        pending[executor.submit(function,*argument)]=argument
+    while pending:
+        done, _ = wait(pending,return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future
+            for argument in itertools.islice(arguments,1): #Replace the finished call only once its result has been used
+                pending[executor.submit(function,*argument)]=argument
+
+def parsePage(link,content,parser='html.parser',partial=False):
+    """
+    A function run in the worker processes of DatasetCompiler.getRecordsInProcesses. It parses a single page and returns only the extracted record, so the soup never leaves the worker.
+
+    Parameters
+    ----------
+    link : str
+        Link to the restaurant's page
+
+    content : bytes
+        HTML of the page
+
+    parser : str
+        Beautiful Soup tree builder used to parse the page. Defaults to "html.parser"
+
+    partial : bool
+        If True, only the parts of the page read by the extractors are parsed. Defaults to False
+
+    Returns
+    -------
+    record : dict
+        Dictionary of the restaurant's attributes
+    """
+    restaurant=Restaurant.fromHTML(content,link,parser,partial)
+    restaurant.releaseSoup() #The worker parses many pages, free each tree right away
+    record=restaurant.toRecord()
+    return record
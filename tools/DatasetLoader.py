@@ -0,0 +1,220 @@
+import pandas as pd
+import hashlib
+import pickle
+import json
+import ast
+import re
+import os
+
+class DatasetLoader:
+    """
+    A class reading a data set compiled by DatasetCompiler from a csv file. The dictionaries and lists stored as strings are decoded a whole column at a time: the cells holding only plain strings, numbers and None are rewritten to JSON and parsed by a single json.loads call, the remaining cells are parsed by ast.literal_eval once per distinct value. The decoded data set is saved to a binary cache next to the csv file, which is reused for as long as the file keeps its hash and modification time. The cache is a pickle file and unpickling runs arbitrary code, so only enable the cache for directories that nobody else can write to (use cache=False otherwise).
+
+    ...
+
+    Attributes
+    ----------
+    cache : bool
+        Whether the binary cache is read and written
+
+    literal_columns : list
+        Columns holding dictionaries and lists (class attribute)
+
+    cache_suffix : str
+        Suffix appended to the path of the csv file to get the path of its cache (class attribute)
+
+    Methods
+    -------
+    load(file_path):
+        A function to read a data set, from its cache if it is still valid
+
+    readCSV(file_path):
+        A function to read a data set from a csv file and decode its dictionaries and lists
+
+    decodeColumn(values):
+        A function to convert a column of strings to Python objects
+
+    getFileKey(file_path):
+        A function to get the hash and modification time of a file
+
+    readCache(file_path, key):
+        A function to read the cached data set of a file
+
+    writeCache(file_path, key, dataset):
+        A function to save the decoded data set of a file to its cache
+    """
+    literal_columns=['opening_hours','opening_hours_span','phones','payment_methods','products','services','marks','coordinates']
+    cache_suffix='.cache.pkl'
+
+    def __init__(self,cache=True):
+        """
+        Constructs the loader
+
+        Parameters
+        ----------
+        cache : bool
+            Whether the binary cache is read and written. The cache is a pickle file, reading a cache planted by someone else would run their code. Defaults to True
+        """
+        self.cache=cache
+
+    def load(self,file_path):
+        """
+        A function to read a data set. If the cache of the file matches its current hash and modification time, the data set is read from the cache, otherwise the file is decoded and the cache is rebuilt.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the csv file
+
+        Returns
+        -------
+        df : pd.DataFrame
+            The data set with dictionaries and lists as Python objects
+        """
+        if not self.cache:
+            return self.readCSV(file_path)
+        key=self.getFileKey(file_path)
+        df=self.readCache(file_path,key)
+        if df is None:
+            df=self.readCSV(file_path)
+            self.writeCache(file_path,key,df)
+        return df
+
+    def readCSV(self,file_path):
+        """
+        A function to read a data set from a csv file and decode its dictionaries and lists
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the csv file
+
+        Returns
+        -------
+        df : pd.DataFrame
+            The data set with dictionaries and lists as Python objects
+        """
+        df=pd.read_csv(file_path,index_col=0)
+        for column in self.literal_columns:
+            if column in df.columns:
+                df[column]=pd.Series(self.decodeColumn(df[column].tolist()),index=df.index,dtype=object)
+        return df
+
+    def decodeColumn(self,values):
+        """
+        A function to convert a column of strings holding Python dictionaries and lists to Python objects. Missing values (NaN) are kept as they are.
+
+        Parameters
+        ----------
+        values : list
+            Values of the column
+
+        Returns
+        -------
+        decoded : list
+            The converted values in the same order
+        """
+        decoded=list(values)
+        plain=[] #Positions of the cells without escapes and double quoted strings, which can be rewritten to JSON
+        for position, value in enumerate(values):
+            if isinstance(value,str) and '\\' not in value and '"' not in value:
+                plain.append(position)
+        text='['+','.join(values[position] for position in plain)+']'
+        strings='\x00'.join(re.findall("'[^']*'",text))
+        if re.search(r'\b(?:None|True|False)\b',strings) is None: #Keywords inside the strings would be rewritten as well
+            text=re.sub(r'\bNone\b','null',text.replace("'",'"'))
+            text=re.sub(r'\bFalse\b','false',re.sub(r'\bTrue\b','true',text))
+            try:
+                for position, value in zip(plain,json.loads(text)):
+                    decoded[position]=value
+            except ValueError: #Something else than strings, numbers, None, lists and dictionaries => parse each cell below
+                plain=[]
+        else:
+            plain=[]
+        parsed={} #Distinct values of the remaining cells
+        remaining=set(range(len(values)))-set(plain)
+        for position in remaining:
+            value=values[position]
+            if not isinstance(value,str):
+                continue
+            if value not in parsed:
+                try:
+                    parsed[value]=ast.literal_eval(value)
+                except ValueError: #Same as readExistingDataset, a value that is not a literal is kept as it is
+                    parsed[value]=value
+            decoded[position]=parsed[value]
+        return decoded
+
+    def getFileKey(self,file_path):
+        """
+        A function to get the hash and modification time of a file
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file
+
+        Returns
+        -------
+        key : dict
+            SHA-256 hash of the content ("sha256"), modification time ("mtime") and size ("size") of the file
+        """
+        with open(file_path,'rb') as file:
+            sha256=hashlib.sha256(file.read()).hexdigest()
+        stat=os.stat(file_path)
+        key={'sha256':sha256,'mtime':stat.st_mtime_ns,'size':stat.st_size}
+        return key
+
+    def readCache(self,file_path,key):
+        """
+        A function to read the cached data set of a file. The cache is unpickled before its key is checked, so it must come from a trusted source.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the csv file
+
+        key : dict
+            Current hash and modification time of the file (see getFileKey)
+
+        Returns
+        -------
+        df : pd.DataFrame or None
+            The cached data set, None if there is no cache or it belongs to another version of the file
+        """
+        try:
+            with open(file_path+self.cache_suffix,'rb') as cache_file:
+                cached=pickle.load(cache_file)
+        except (OSError,pickle.UnpicklingError,EOFError,AttributeError,ImportError): #Missing, unreadable or written by an incompatible version
+            return None
+        if not isinstance(cached,dict) or cached.get('key')!=key:
+            return None
+        df=cached['dataset']
+        return df
+
+    def writeCache(self,file_path,key,dataset):
+        """
+        A function to save the decoded data set of a file to its cache. The cache is replaced in one atomic step, so a reader never sees a half written one.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the csv file
+
+        key : dict
+            Hash and modification time of the file the data set was read from (see getFileKey)
+
+        dataset : pd.DataFrame
+            The decoded data set
+
+        Returns
+        -------
+
+        """
+        cache_path=file_path+self.cache_suffix
+        try:
+            with open(cache_path+'.tmp','wb') as cache_file:
+                pickle.dump({'key':key,'dataset':dataset},cache_file,protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(cache_path+'.tmp',cache_path)
+        except OSError as error: #E.g. a read-only directory, the data set is simply decoded again next time
+            print(f'Could not write the cache {cache_path}: {error}')
@@ -0,0 +1,301 @@
+from collections import deque
+import pandas as pd
+import threading
+import json
+import re
+import os
+
+class DistrictResolver:
+    """
+    A class mapping addresses to Prague's municipal districts (Praha 1-10). The mapping dictionary is turned into an inverted index (area name to district) and an Aho-Corasick automaton, so an address is matched against all administrative districts and cadastral areas in a single pass. Resolved addresses are memoized.
+
+    ...
+
+    Attributes
+    ----------
+    dist_dict : dict
+        Mapping dictionary with municipal districts as keys and their administrative districts and cadastral areas as values
+
+    area_index : dict
+        Inverted index with the area names as keys and the position of the first municipal district containing them as values
+
+    districts : list
+        Municipal districts in the order of the mapping dictionary
+
+    cache : dict
+        Resolved districts keyed by the address
+
+    max_cache_size : int
+        Number of addresses kept in the cache
+
+    Methods
+    -------
+    buildIndex():
+        A function to create the inverted index from area names to municipal districts
+
+    buildAutomaton():
+        A function to create the Aho-Corasick automaton of all area names
+
+    matchArea(address):
+        A function to find the first municipal district with an area contained in the address
+
+    mappingDistrict(address):
+        A function to map an address to its municipal district based on the area names or the zip code
+
+    getDistrictFromPraha_XX(praha_xx):
+        A function to map an administrative or municipal district in the format Praha XX to its municipal district
+
+    resolve(address):
+        A function to get the municipal district of an address
+
+    resolveMany(addresses):
+        A function to get the municipal districts of many addresses
+    """
+    def __init__(self,dist_dict,max_cache_size=100000):
+        """
+        Constructs the index and the automaton
+
+        Parameters
+        ----------
+        dist_dict : dict
+            Mapping dictionary with municipal districts as keys and their administrative districts and cadastral areas as values (see MappingDictionaryGetter)
+
+        max_cache_size : int
+            Number of addresses kept in the cache. Defaults to 100000
+        """
+        self.dist_dict=dist_dict
+        self.districts=list(dist_dict)
+        self.area_index=self.buildIndex()
+        self.buildAutomaton()
+        self.cache={}
+        self.max_cache_size=max_cache_size
+        self.lock=threading.Lock()
+
+    def buildIndex(self):
+        """
+        A function to create the inverted index from area names to municipal districts. An area belonging to several municipal districts is mapped to the first one, which is the district the original loop over the dictionary picked.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        area_index : dict
+            Area name as key, position of the municipal district in self.districts as value
+        """
+        area_index={}
+        for position, district in enumerate(self.districts):
+            for area in self.dist_dict[district]:
+                area_index.setdefault(area,position) #Keep the first district
+        return area_index
+
+    def buildAutomaton(self):
+        """
+        A function to create the Aho-Corasick automaton of all area names. Every state stores the lowest district position of the areas ending in it or in any of its suffix states, so that matching only needs to take the minimum over the visited states.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+
+        """
+        self.transitions=[{}] #Goto function of each state
+        self.best=[None] #Lowest district position of the areas recognized in each state
+        for area, position in self.area_index.items():
+            state=0
+            for character in area:
+                if character not in self.transitions[state]:
+                    self.transitions.append({})
+                    self.best.append(None)
+                    self.transitions[state][character]=len(self.transitions)-1
+                state=self.transitions[state][character]
+            self.best[state]=position if self.best[state] is None else min(self.best[state],position)
+        self.failures=[0]*len(self.transitions)
+        queue=deque(self.transitions[0].values())
+        while queue: #Breadth first, so the failure state of a parent is known before its children
+            state=queue.popleft()
+            for character, child in self.transitions[state].items():
+                failure=self.failures[state]
+                while failure and character not in self.transitions[failure]:
+                    failure=self.failures[failure]
+                self.failures[child]=self.transitions[failure].get(character,0) #Longest proper suffix that is also a prefix of an area
+                inherited=self.best[self.failures[child]]
+                if inherited is not None and (self.best[child] is None or inherited<self.best[child]):
+                    self.best[child]=inherited
+                queue.append(child)
+
+    def matchArea(self,address):
+        """
+        A function to find the first municipal district (in the order of the mapping dictionary) with an area contained in the address
+
+        Parameters
+        ----------
+        address : str
+            A string containing the address
+
+        Returns
+        -------
+        district : str or None
+            The municipal district, None if no area is contained in the address
+        """
+        state=0
+        found=None
+        for character in address:
+            while state and character not in self.transitions[state]:
+                state=self.failures[state]
+            state=self.transitions[state].get(character,0)
+            if self.best[state] is not None and (found is None or self.best[state]<found):
+                found=self.best[state]
+                if found==0: #Nothing can come before the first district
+                    break
+        district=None if found is None else self.districts[found]
+        return district
+
+    def mappingDistrict(self,address):
+        """
+        A function to map administrative districts or cadastral areas to their municipal district based on a whole address. If the district cannot be mapped, it is derived from the zip code.
+
+        Parameters
+        ----------
+        address : str
+            A string containing the address
+
+        Returns
+        -------
+        district : str
+            District based on the given address, "Not found" if neither an area nor a zip code is in the address
+        """
+        district=self.matchArea(address)
+        if district is None: #Try to get it from the zip code
+            zip_code=re.search('[0-9]{3} [0-9]{2}',address) #Extract the zip code from the address
+            if zip_code is None:
+                district='Not found'
+            elif zip_code.group(0)[1]=='0': #Special case for Praha 10
+                district='Praha 10'
+            else:
+                district='Praha '+zip_code.group(0)[1]
+        return district
+
+    def getDistrictFromPraha_XX(self,praha_xx):
+        """
+        A function to map administrative district or municipal district to municipal district
+
+        Parameters
+        ----------
+        praha_xx : str
+            A string containing the municipal/administartive district in format Praha XX
+
+        Returns
+        -------
+        district : str
+            Municipal district derived from the input, "Not found" if it is not in the mapping dictionary
+        """
+        if praha_xx in self.dist_dict: #In case the municipal district (Praha 1-10) was already extracted, return it
+            district=praha_xx
+        elif praha_xx in self.area_index:
+            district=self.districts[self.area_index[praha_xx]]
+        else:
+            district='Not found'
+        return district
+
+    def resolve(self,address):
+        """
+        A function to get the municipal district of an address. A "Praha XX" in the address is mapped directly, otherwise the whole address is matched against the area names.
+
+        Parameters
+        ----------
+        address : str or None
+            Restaurant's address
+
+        Returns
+        -------
+        district : str or None
+            The municipal district, None if the address is None
+        """
+        if address is None:
+            return None
+        district=self.cache.get(address)
+        if district is not None:
+            return district
+        search_dist=re.search('Praha [0-9]{1,2}',address) #Firstly, try to find a Praha xx
+        if search_dist: #If found, map it to the municipal district
+            if search_dist.group(0)=='Praha 31': #Very special case of one restaurant with Praha 310 in the beginning of the address => resolved by brute force
+                district='Praha 1'
+            else:
+                district=self.getDistrictFromPraha_XX(search_dist.group(0)) #Find district based on Praha XX
+        else: #If not found, feed the whole address to the mapping function
+            district=self.mappingDistrict(address)
+        with self.lock:
+            if len(self.cache)>=self.max_cache_size:
+                self.cache.clear()
+            self.cache[address]=district
+        return district
+
+    def resolveMany(self,addresses):
+        """
+        A function to get the municipal districts of many addresses, e.g. a whole column of a data set. Every distinct address is resolved only once.
+
+        Parameters
+        ----------
+        addresses : iterable or pd.Series
+            Addresses (None or NaN for missing ones)
+
+        Returns
+        -------
+        districts : list or pd.Series
+            Municipal districts in the order of the addresses (a pd.Series with the same index if a pd.Series was given)
+        """
+        resolved={}
+        districts=[]
+        for address in addresses:
+            if not isinstance(address,str): #None or NaN
+                districts.append(None)
+                continue
+            if address not in resolved:
+                resolved[address]=self.resolve(address)
+            districts.append(resolved[address])
+        if isinstance(addresses,pd.Series):
+            districts=pd.Series(districts,index=addresses.index,name='district')
+        return districts
+
+default_resolver=None
+default_resolver_key=None
+default_resolver_lock=threading.Lock()
+
+def getDefaultResolver(file_path='data\\dist_dict.json'):
+    """
+    A function returning the resolver shared by all Restaurant objects of the process. It is built from the mapping dictionary on the first call and built again whenever the file changes (e.g. after MappingDictionaryGetter.saveToJSON), so a regenerated dictionary is picked up by the same process.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the mapping dictionary. Defaults to "data\\dist_dict.json"
+
+    Returns
+    -------
+    default_resolver : DistrictResolver
+        The shared resolver
+    """
+    global default_resolver, default_resolver_key
+    file_stat=os.stat(file_path)
+    key=(file_path,file_stat.st_mtime_ns,file_stat.st_size) #A rewritten file has a new modification time (and usually a new size)
+    with default_resolver_lock: #Restaurants are created from several threads
+        if default_resolver is None or default_resolver_key!=key:
+            with open(file_path) as json_file:
+                default_resolver=DistrictResolver(json.load(json_file))
+            default_resolver_key=key
+    return default_resolver
+
+def resetDefaultResolver():
+    """
+    A function dropping the shared resolver, so that the next call of getDefaultResolver reads the mapping dictionary again
+
+    Returns
+    -------
+
+    """
+    global default_resolver, default_resolver_key
+    with default_resolver_lock:
+        default_resolver=None
+        default_resolver_key=None
@@ -1,4 +1,5 @@
-import requests
+from tools.HttpClient import HttpClient
+from tools.ColumnarStorage import ColumnarStorage
 import json
 import pandas as pd
 import ast
@@ -19,6 +20,9 @@ class GooglePlacesCompiler:
     places_API_df : pd.DataFrame
         Dataframe containgn information on the restaurants
 
+    client : HttpClient
+        Client used to send the requests (by default without a response cache or a rate limiter)
+
     Methods
     -------
     find_first_candidate(name, phone, coordinates, API_KEY)
@@ -31,9 +35,9 @@ class GooglePlacesCompiler:
         A function that concerts list of results into Pandas DataFrame.
 
     dumpToCSV(file_name='restaurants_Places_API.csv'):
-        A function to export the compiled data set to a csv file named "file_name".
+        A function to export the compiled data set to a csv, Parquet or Arrow file named "file_name".
     """
-    def __init__(self, restaurants_dataframe, API_KEY):
+    def __init__(self, restaurants_dataframe, API_KEY, client=None):
         """
         Constructs all the attributes given the parameters.
 
@@ -44,7 +48,11 @@ class GooglePlacesCompiler:
 
         API_KEY : str
             Valid API_KEY generated on Google Cloud Platform (see https://console.cloud.google.com/apis/credentials), with Selected APIs containing Places API (see Key restrictions section).
+
+        client : HttpClient or None
+            Client used to send the requests. Defaults to a new HttpClient without a response cache (the API responses carry the key in their URL and must not be stored on disk) and without the rate limiter of the shared zlatestranky.cz client
         """
+        self.client = client or HttpClient()
         self.list_of_results = self.getListOfResults(restaurants_dataframe, API_KEY)
         self.places_API_df = self.getDataFrame(self.list_of_results)
 
@@ -88,14 +96,14 @@ class GooglePlacesCompiler:
             latitude = coordinates['latitude']
             longitude = coordinates['longitude']
 
-        place_request = requests.get(f"https://maps.googleapis.com/maps/api/place/findplacefromtext/json?input={main_phone}&inputtype=textquery&locationbias=circle:50@{latitude},{longitude}&fields=place_id&key={API_KEY}")
+        place_request = self.client.get(f"https://maps.googleapis.com/maps/api/place/findplacefromtext/json?input={main_phone}&inputtype=textquery&locationbias=circle:50@{latitude},{longitude}&fields=place_id&key={API_KEY}")
         place_dict = json.loads(place_request.text)
 
         if place_dict["candidates"] == []:
             result = {'ZS_name':name, 'name':None, 'formatted_address':None, 'location':None, 'rating':None, 'user_ratings_total':None, 'formatted_phone_number':None}
         else:
             iter_id = place_dict["candidates"][0]["place_id"]
-            detail_request = requests.get(f"https://maps.googleapis.com/maps/api/place/details/json?place_id={iter_id}&fields=name%2Cformatted_address%2Cgeometry%2Crating%2Cformatted_phone_number%2Cuser_ratings_total&key={API_KEY}")
+            detail_request = self.client.get(f"https://maps.googleapis.com/maps/api/place/details/json?place_id={iter_id}&fields=name%2Cformatted_address%2Cgeometry%2Crating%2Cformatted_phone_number%2Cuser_ratings_total&key={API_KEY}")
             detail_dict = json.loads(detail_request.text)
             
             #saving the details
@@ -140,7 +148,7 @@ class GooglePlacesCompiler:
         Parameters
         ----------
         restaurants_dataframe : pd.DataFrame
-            Dataframe of restaurants scraped from zlatestranky.cz, produced by DatasetCompiler.py.
+            Dataframe of restaurants scraped from zlatestranky.cz, produced by DatasetCompiler.py. The phones and coordinates can be dictionaries (see DatasetCompiler.readDataset) or their string form (plain pd.read_csv).
 
         API_KEY : str
             Valid API_KEY generated on Google Cloud Platform (see __init__ for more info)                   
@@ -158,8 +166,12 @@ class GooglePlacesCompiler:
                 list_of_results.append(celeste_exception)
             else:
                 iter_name = zs_restaurants["name"][ind]
-                iter_phones = ast.literal_eval(zs_restaurants["phones"][ind])
-                iter_coordinates = ast.literal_eval(zs_restaurants["coordinates"][ind])
+                iter_phones = zs_restaurants["phones"][ind] #Already dictionaries if decoded by the loader (see DatasetCompiler.readDataset)
+                iter_coordinates = zs_restaurants["coordinates"][ind]
+                if isinstance(iter_phones, str): #Data set read with a plain pd.read_csv
+                    iter_phones = ast.literal_eval(iter_phones)
+                if isinstance(iter_coordinates, str):
+                    iter_coordinates = ast.literal_eval(iter_coordinates)
 
                 iter_result = self.find_first_candidate(iter_name, iter_phones, iter_coordinates, API_KEY)
 
@@ -185,15 +197,18 @@ class GooglePlacesCompiler:
 
     def dumpToCSV(self,file_name='data/restaurants_Places_API.csv'):
         """
-        A function to export the compiled data set to a csv file named file_name
+        A function to export the compiled data set to a file named file_name. A ".parquet", ".arrow" or ".feather" file is written with typed columns (see ColumnarStorage), any other file as a csv file.
 
         Parameters
         ----------
         file_name : str
-            Desired name of the exported csv file. Defaults to "restaurants_Places_API.csv"
+            Desired name of the exported file. Defaults to "restaurants_Places_API.csv"
 
         Returns
         -------
 
         """
-        self.places_API_df.to_csv(file_name)
+        if ColumnarStorage.isColumnar(file_name):
+            ColumnarStorage().write(self.places_API_df,file_name,kind='places')
+        else:
+            self.places_API_df.to_csv(file_name)
@@ -0,0 +1,411 @@
+from tools.ResponseCache import ResponseCache
+from tools.RateLimiter import RateLimiter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+import threading
+import random
+import time
+
+class HttpClient:
+    """
+    A class sending HTTP requests through one shared session, so that connections to a host are kept alive and reused instead of opening a new TCP+TLS connection for every request
+
+    ...
+
+    Attributes
+    ----------
+    session : requests.Session
+        Session holding the connection pools
+
+    pool_maxsize : int
+        Default number of connections kept alive per host
+
+    host_pool_sizes : dict
+        Number of connections kept alive for specific hosts (host as key, size as value)
+
+    cache : ResponseCache or None
+        On-disk cache used to revalidate responses instead of downloading them again
+
+    rate_limiter : RateLimiter or None
+        Per-host limiter every request waits for
+
+    timeout : float or tuple
+        Timeout of a single request in seconds (passed to requests)
+
+    retries : int
+        Number of times a request is repeated after a timeout, a connection error, a 429 or a 5xx
+
+    backoff : float
+        Base of the exponential backoff between retries in seconds
+
+    max_backoff : float
+        Upper bound of the backoff between retries in seconds
+
+    hedge_percentile : float or None
+        Percentile of recent latencies after which a duplicate of a still pending request is sent
+
+    latencies : collections.deque
+        Durations of recent successful requests in seconds
+
+    Methods
+    -------
+    mountAdapters():
+        A function to create the connection pools for the session
+
+    getAcceptEncoding():
+        A function to get the compression methods the client is able to decode
+
+    get(url, **kwargs):
+        A function to send a GET request through the shared session, reading through the cache if there is one
+
+    fetch(url, **kwargs):
+        A function to send a request, retrying it with jittered exponential backoff
+
+    sendHedged(url, **kwargs):
+        A function to send a request and a duplicate of it if the first one is slower than usual
+
+    getHedgeDelay():
+        A function to get the time after which a pending request is duplicated
+
+    send(url, **kwargs):
+        A function to send a single request, respecting the rate limiter
+
+    close():
+        A function to close all pooled connections
+    """
+    def __init__(self,pool_connections=10,pool_maxsize=32,host_pool_sizes=None,headers=None,cache=None,rate_limiter=None,timeout=30,retries=3,backoff=0.5,max_backoff=30,hedge_percentile=None):
+        """
+        Constructs the session and its connection pools
+
+        Parameters
+        ----------
+        pool_connections : int
+            Number of hosts for which connection pools are cached. Defaults to 10
+
+        pool_maxsize : int
+            Number of connections kept alive per host. Should be at least the concurrency used by the crawlers. Defaults to 32
+
+        host_pool_sizes : dict or None
+            Number of connections kept alive for specific hosts (e.g. {'www.zlatestranky.cz': 64}). Defaults to None
+
+        headers : dict or None
+            Additional headers sent with every request. Defaults to None
+
+        cache : ResponseCache or None
+            On-disk cache used to revalidate responses instead of downloading them again. Defaults to None (no caching)
+
+        rate_limiter : RateLimiter or None
+            Per-host limiter every request waits for. Defaults to None (no limit)
+
+        timeout : float or tuple
+            Timeout of a single request in seconds, either one number or (connect, read). Defaults to 30
+
+        retries : int
+            Number of times a request is repeated after a timeout, a connection error, a 429 or a 5xx. Defaults to 3
+
+        backoff : float
+            Base of the exponential backoff between retries in seconds. The n-th retry waits a random time between 0 and backoff*2**n seconds. Defaults to 0.5
+
+        max_backoff : float
+            Upper bound of the backoff between retries in seconds. Defaults to 30
+
+        hedge_percentile : float or None
+            If set (e.g. 95), a request still pending after this percentile of recent latencies is duplicated and the first answer is used. Defaults to None (no hedging)
+        """
+        self.pool_connections=pool_connections
+        self.pool_maxsize=pool_maxsize
+        self.host_pool_sizes=host_pool_sizes or {}
+        self.session=requests.Session()
+        self.mountAdapters()
+        self.session.headers['Accept-Encoding']=self.getAcceptEncoding()
+        if headers:
+            self.session.headers.update(headers)
+        self.cache=cache
+        self.rate_limiter=rate_limiter
+        self.timeout=timeout
+        self.retries=retries
+        self.backoff=backoff
+        self.max_backoff=max_backoff
+        self.hedge_percentile=hedge_percentile
+        self.latencies=deque(maxlen=200)
+        self.latencies_lock=threading.Lock()
+        self.hedge_executor=ThreadPoolExecutor(max_workers=2*pool_maxsize) if hedge_percentile else None
+
+    def mountAdapters(self):
+        """
+        A function to create the connection pools for the session. Hosts listed in self.host_pool_sizes get their own adapter with the given pool size.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+
+        """
+        adapter=HTTPAdapter(pool_connections=self.pool_connections,pool_maxsize=self.pool_maxsize)
+        self.session.mount('http://',adapter)
+        self.session.mount('https://',adapter)
+        for host, size in self.host_pool_sizes.items():
+            host_adapter=HTTPAdapter(pool_connections=1,pool_maxsize=size)
+            self.session.mount(f'http://{host}',host_adapter) #requests picks the adapter with the longest matching prefix
+            self.session.mount(f'https://{host}',host_adapter)
+
+    def getAcceptEncoding(self):
+        """
+        A function to get the compression methods the client is able to decode. Brotli is only offered if a brotli package is installed since urllib3 cannot decode it otherwise.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        accept_encoding : str
+            Value of the Accept-Encoding header
+        """
+        accept_encoding='gzip, deflate'
+        try:
+            import brotli
+            accept_encoding+=', br'
+        except ImportError:
+            try:
+                import brotlicffi
+                accept_encoding+=', br'
+            except ImportError:
+                pass
+        return accept_encoding
+
+    def get(self,url,**kwargs):
+        """
+        A function to send a GET request through the shared session. If the URL is cached, the request is made conditional and a 304 answer is served from the cache. Responses served from the cache have from_cache set to True.
+
+        Parameters
+        ----------
+        url : str
+            URL to request
+
+        **kwargs
+            Keyword arguments passed to requests.Session.get
+
+        Returns
+        -------
+        request : requests.Response
+            The received response
+        """
+        entry=self.cache.get(url) if self.cache is not None else None
+        if entry is None:
+            request=self.fetch(url,**kwargs)
+        else:
+            headers=dict(kwargs.pop('headers',None) or {})
+            headers.update(self.cache.getConditionalHeaders(entry))
+            request=self.fetch(url,headers=headers,**kwargs)
+            if request.status_code==304: #Not modified => the cached body is still valid
+                self.cache.touch(url)
+                request=self.cache.toResponse(entry)
+                request.from_cache=True
+                return request
+        if self.cache is not None:
+            self.cache.put(url,request)
+        request.from_cache=False
+        return request
+
+    def fetch(self,url,**kwargs):
+        """
+        A function to send a request, retrying it after a timeout, a connection error, a 429 or a 5xx. The waits between the attempts grow exponentially and are randomized (full jitter) so that parallel workers do not retry in lockstep.
+
+        Parameters
+        ----------
+        url : str
+            URL to request
+
+        **kwargs
+            Keyword arguments passed to requests.Session.get
+
+        Returns
+        -------
+        request : requests.Response
+            The last received response (it can still be a 429 or 5xx if all attempts failed)
+        """
+        kwargs.setdefault('timeout',self.timeout)
+        for attempt in range(self.retries+1):
+            try:
+                request=self.sendHedged(url,**kwargs) if self.hedge_percentile else self.send(url,**kwargs)
+            except (requests.Timeout, requests.ConnectionError):
+                if attempt==self.retries:
+                    raise
+            else:
+                if attempt==self.retries or not (request.status_code==429 or request.status_code>=500):
+                    return request
+            time.sleep(random.uniform(0,min(self.max_backoff,self.backoff*2**attempt)))
+
+    def sendHedged(self,url,**kwargs):
+        """
+        A function to send a request and, if it is still pending after the hedge delay, a duplicate of it. The answer that arrives first is returned.
+
+        Parameters
+        ----------
+        url : str
+            URL to request
+
+        **kwargs
+            Keyword arguments passed to requests.Session.get
+
+        Returns
+        -------
+        request : requests.Response
+            The first received response
+        """
+        hedge_delay=self.getHedgeDelay()
+        pending={self.hedge_executor.submit(self.send,url,**kwargs)}
+        if hedge_delay is not None:
+            done, pending=wait(pending,timeout=hedge_delay)
+            if done:
+                return done.pop().result()
+            pending.add(self.hedge_executor.submit(self.send,url,**kwargs))
+        error=None
+        while pending:
+            done, pending=wait(pending,return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result() #The slower duplicate keeps running in the background, its answer is discarded
+                except requests.RequestException as exception:
+                    error=exception #Wait for the other request before giving up
+        raise error
+
+    def getHedgeDelay(self):
+        """
+        A function to get the time after which a pending request is duplicated
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        hedge_delay : float or None
+            The self.hedge_percentile-th percentile of recent latencies in seconds, None if fewer than 20 requests have finished so far
+        """
+        with self.latencies_lock:
+            if len(self.latencies)<20:
+                return None
+            latencies=sorted(self.latencies)
+        position=(len(latencies)-1)*self.hedge_percentile/100 #Linear interpolation between the closest ranks
+        lower=int(position)
+        upper=min(lower+1,len(latencies)-1)
+        hedge_delay=latencies[lower]+(latencies[upper]-latencies[lower])*(position-lower)
+        return hedge_delay
+
+    def send(self,url,**kwargs):
+        """
+        A function to send a single request through the session. It waits for the rate limiter first and reports the outcome to it afterwards.
+
+        Parameters
+        ----------
+        url : str
+            URL to request
+
+        **kwargs
+            Keyword arguments passed to requests.Session.get
+
+        Returns
+        -------
+        request : requests.Response
+            The received response
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(url)
+        start=time.perf_counter()
+        try:
+            request=self.session.get(url,**kwargs)
+        except requests.RequestException:
+            if self.rate_limiter is not None:
+                self.rate_limiter.update(url,None)
+            raise
+        if self.rate_limiter is not None:
+            self.rate_limiter.update(url,request.status_code,request.headers)
+        if request.status_code<500 and request.status_code!=429:
+            with self.latencies_lock:
+                self.latencies.append(time.perf_counter()-start)
+        return request
+
+    def close(self):
+        """
+        A function to close all pooled connections
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+
+        """
+        self.session.close()
+        if self.hedge_executor is not None:
+            self.hedge_executor.shutdown(wait=False)
+
+default_client=None
+
+def getDefaultClient():
+    """
+    A function returning the client shared by LinkGetter, Restaurant, DatasetCompiler and MappingDictionaryGetter when no client is given to them. It is created on the first call. GooglePlacesCompiler uses its own client, so that the keyed API responses are not cached.
+
+    Returns
+    -------
+    default_client : HttpClient
+        The shared client
+    """
+    global default_client
+    if default_client is None:
+        default_client=HttpClient(host_pool_sizes={urlsplit('https://www.zlatestranky.cz').netloc:64},cache=ResponseCache(),rate_limiter=RateLimiter())
+    return default_client
+
+def benchmarkConnectionReuse(url,number_of_requests=200):
+    """
+    A function comparing the time needed to send the same requests with module-level requests.get (new connection for every request) and with a pooled HttpClient
+
+    Parameters
+    ----------
+    url : str
+        URL to request
+
+    number_of_requests : int
+        Number of requests sent by each method. Defaults to 200
+
+    Returns
+    -------
+    timings : dict
+        Total time in seconds for each method
+    """
+    timings={}
+    start=time.perf_counter()
+    for i in range(number_of_requests):
+        requests.get(url)
+    timings['requests.get']=time.perf_counter()-start
+    client=HttpClient()
+    start=time.perf_counter()
+    for i in range(number_of_requests):
+        client.get(url)
+    timings['HttpClient']=time.perf_counter()-start
+    client.close()
+    return timings
+
+if __name__ == "__main__": #Run only in case the file is run directly: benchmark against a local keep-alive server
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version='HTTP/1.1' #Needed for keep-alive
+        disable_nagle_algorithm=True #Headers and body are written separately, Nagle would delay every reused connection
+        def do_GET(self):
+            body=b'<html><body>benchmark</body></html>'
+            self.send_response(200)
+            self.send_header('Content-Length',str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        def log_message(self,*args):
+            pass
+
+    server=ThreadingHTTPServer(('127.0.0.1',0),Handler)
+    threading.Thread(target=server.serve_forever,daemon=True).start()
+    print(benchmarkConnectionReuse(f'http://127.0.0.1:{server.server_address[1]}/'))
+    server.shutdown()
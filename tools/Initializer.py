@@ -1,55 +1,72 @@
 import pandas as pd
+from tools.ColumnarStorage import ColumnarStorage #Reads and writes data sets stored as Parquet or Arrow files
 
-from tools.DatasetCompiler import DatasetCompiler #Either loads an existing data set or generates a new one
+from tools.DatasetCompiler import DatasetCompiler, readDataset #Either loads an existing data set or generates a new one
 from tools.DataInterpreter import DataInterpreter #Contains methods for interpreting the data set
+from tools.RestaurantStore import RestaurantStore #Keeps the data set in an indexed SQLite database
 
 from tools.GooglePlacesCompiler import GooglePlacesCompiler #Loads existing data set from zlatestranky and creates new data set from Places API
 from tools.DataComparer import DataComparer #Contains methods for comparing data from zlatestranky.cz and from Google API
 
-def initialize(existing=True):
+def initialize(existing=True,concurrency=1,incremental=False,checkpoint=None,archive=None,file_format='csv',store=None):
+    if file_format not in ['csv','parquet','arrow']:
+        raise ValueError('Invalid input. Please specify file_format as "csv", "parquet" or "arrow"')
+    file_name=f'restaurants_zlatestranky.{file_format}'
+    restaurant_store=RestaurantStore(f'data/{store}') if store else None #SQLite store answering the filters of scanThroughDataset, filled whenever it does not hold the loaded data set
     if existing==True: #Loads the existing data set
-        dataset_compiler=DatasetCompiler(existing=existing)
-        data_interpreter=DataInterpreter(dataset_compiler.dataset) 
+        dataset_compiler=DatasetCompiler(existing=existing,file_name=file_name)
+        data_interpreter=DataInterpreter(dataset_compiler.dataset,store=restaurant_store) 
         print('Data set successfully loaded')
-    elif existing==False: #Generates a new data set which replaces the old one
+    elif existing==False: #Generates a new data set which replaces the old one (or updates the old one if incremental=True)
         from tools.MappingDictionaryGetter import MappingDictionaryGetter #Compiles the mapping dictionary for Prague districts
         from tools.LinkGetter import LinkGetter #Acquires individual links for restaurants
+        from tools.PageArchive import PageArchive #Stores the downloaded pages for later replay
         
-        link_getter=LinkGetter()
+        page_archive=PageArchive(f'data/{archive}') if archive else None #Listing and restaurant pages share one archive
+        link_getter=LinkGetter(concurrency=concurrency,archive=page_archive)
         print(f'Successfully acquired links for {len(link_getter.links)} restaurants')
         
         dist_dict=MappingDictionaryGetter() #Generate the dictionary
         dist_dict.saveToJSON() #Export it to a json file
         print('Mapping dictionary successfully compiled and exported to a json file')
         
-        dataset_compiler=DatasetCompiler(link_getter.links) #Compiles the data set from the links
-        print('Data set successfully compiled')
-        dataset_compiler.dumpToCSV() #Saves the new data set in .csv
-        print('Data set successfully exported to csv')
+        dataset_compiler=DatasetCompiler(link_getter.links,existing=False,file_name=file_name,concurrency=concurrency,incremental=incremental,checkpoint=checkpoint,archive=page_archive) #Compiles the data set from the links
+        print('Data set successfully updated' if incremental else 'Data set successfully compiled')
+        dataset_compiler.dumpToCSV(file_name) #Saves the new data set in the chosen format
+        print(f'Data set successfully exported to {file_format}')
+        if page_archive is not None:
+            page_archive.close()
         
-        data_interpreter=DataInterpreter(dataset_compiler.dataset)
+        data_interpreter=DataInterpreter(dataset_compiler.dataset,store=restaurant_store) #The store no longer matches the fingerprint of the new data set => refilled
         print('Data set successfully loaded')
     else:
         raise ValueError('Invalid input. Please specify existing as True or False')
     return data_interpreter
 
-def initializePlacesAPI(existing=True, API_KEY=None):
+def readFile(file_path):
+    if ColumnarStorage.isColumnar(file_path): #Typed columns, dictionaries and lists are already Python objects
+        return ColumnarStorage().read(file_path)
+    return pd.read_csv(file_path)
+
+def initializePlacesAPI(existing=True, API_KEY=None, file_format='csv'):
+    if file_format not in ['csv','parquet','arrow']:
+        raise ValueError('Invalid input. Please specify file_format as "csv", "parquet" or "arrow"')
     if existing == True: #Loads the existing data set
-        df_ZS=pd.read_csv('data/restaurants_zlatestranky.csv')
-        df_API=pd.read_csv('data/restaurants_Places_API.csv')
+        df_ZS=readDataset(f'data/restaurants_zlatestranky.{file_format}') #Phones and coordinates decoded once
+        df_API=readFile(f'data/restaurants_Places_API.{file_format}')
         data_comparer = DataComparer(df_ZS, df_API)
         print('Data set successfully loaded')
 
     elif existing == False: #Generates a new data set which replaces the old one
-        df_ZS=pd.read_csv('data/restaurants_zlatestranky.csv')
+        df_ZS=readDataset(f'data/restaurants_zlatestranky.{file_format}')
         print("Data from zlatestranky.cz successfully loaded")
         
         if type(API_KEY) == str:
             GP_compiler = GooglePlacesCompiler(df_ZS, API_KEY) #Compiles the data set (sends the API requests) based on the telephone numbers from zlatestranky.cz
             print('Data set successfully compiled')
 
-            GP_compiler.dumpToCSV() #Saves the new data set in .csv
-            print('Data set successfully exported to csv')
+            GP_compiler.dumpToCSV(f'data/restaurants_Places_API.{file_format}') #Saves the new data set in the chosen format
+            print(f'Data set successfully exported to {file_format}')
 
             df_API = GP_compiler.places_API_df
 
@@ -0,0 +1,209 @@
+import numpy as np
+import unicodedata
+import bisect
+import re
+
+class KeywordIndex:
+    """
+    A class answering keyword searches over the categorical data (payment methods, products, services and marks) without scanning the data set. Every element and every word of an element is normalized (lowercase, diacritics removed, e.g. 'Česká kuchyně' -> 'ceska kuchyne') and mapped to a packed bitmap of the restaurants listing it. A query is then a few bitmap intersections and unions.
+
+    ...
+
+    Attributes
+    ----------
+    columns : list
+        Columns of the data set that are indexed
+
+    number_of_restaurants : int
+        Number of restaurants (bits in each bitmap)
+
+    bitmaps : dict
+        Normalized token as key, packed bitmap of the restaurants (in the order of the data set) as value
+
+    tokens : list
+        Sorted tokens, used for the prefix queries
+
+    Methods
+    -------
+    normalize(text):
+        A function to lowercase a text and remove its diacritics
+
+    getTokens(value):
+        A function to get the tokens under which an element is indexed
+
+    parseQuery(query):
+        A function to split a query into groups of terms
+
+    getTermBitmap(term, prefix=False):
+        A function to get the packed bitmap of the restaurants matching a single term
+
+    getMask(query):
+        A function to get a boolean array marking the restaurants matching a query
+
+    getRows(query):
+        A function to get the positions of the restaurants matching a query
+    """
+    def __init__(self,dataset,columns=['payment_methods','products','services','marks']):
+        """
+        Constructs the bitmaps of all tokens
+
+        Parameters
+        ----------
+        dataset : pd.DataFrame
+            A proccessed data set (see DataInterpreter)
+
+        columns : list
+            Columns to index. Defaults to ['payment_methods', 'products', 'services', 'marks']
+        """
+        self.columns=columns
+        self.number_of_restaurants=len(dataset)
+        rows_by_token={}
+        for column in self.columns:
+            for row, value in enumerate(dataset[column]):
+                if type(value)!=list:
+                    value=[value] if isinstance(value,str) else [] #A single string or NaN
+                for element in value:
+                    for token in self.getTokens(element):
+                        rows_by_token.setdefault(token,[]).append(row)
+        self.bitmaps={}
+        for token, rows in rows_by_token.items():
+            mask=np.zeros(self.number_of_restaurants,dtype=bool)
+            mask[rows]=True
+            self.bitmaps[token]=np.packbits(mask)
+        self.tokens=sorted(self.bitmaps)
+
+    @classmethod
+    def normalize(cls,text):
+        """
+        A function to lowercase a text, remove its diacritics and collapse the white space
+
+        Parameters
+        ----------
+        text : str
+            Text to normalize
+
+        Returns
+        -------
+        normalized : str
+            The normalized text, e.g. 'ceska kuchyne' for 'Česká  kuchyně'
+        """
+        decomposed=unicodedata.normalize('NFKD',text)
+        normalized=' '.join(''.join(character for character in decomposed if not unicodedata.combining(character)).casefold().split())
+        return normalized
+
+    @classmethod
+    def getTokens(cls,value):
+        """
+        A function to get the tokens under which an element is indexed: the whole normalized element and each of its words
+
+        Parameters
+        ----------
+        value : str
+            An element of the categorical data, e.g. 'Česká kuchyně'
+
+        Returns
+        -------
+        tokens : set
+            The normalized tokens, e.g. {'ceska kuchyne', 'ceska', 'kuchyne'}
+        """
+        normalized=cls.normalize(value)
+        tokens={word for word in re.split(r'\W+',normalized) if word}
+        if normalized:
+            tokens.add(normalized)
+        return tokens
+
+    @classmethod
+    def parseQuery(cls,query):
+        """
+        A function to split a query into groups of terms. The groups are separated by "OR", the terms of a group by "AND" (AND binds more tightly), a term ending with "*" is a prefix. A list of keywords means that all of them have to match.
+
+        Parameters
+        ----------
+        query : str or list
+            E.g. 'VISA', 'visa AND česká kuchyně', 'pizza OR burger*' or ['VISA', 'Wi-Fi']
+
+        Returns
+        -------
+        groups : list
+            List of groups, each one a list of (normalized term, prefix) tuples. A restaurant matches if it matches all terms of at least one group
+        """
+        if type(query)==list:
+            query=' AND '.join(query)
+        groups=[]
+        for group in re.split(r'\s+OR\s+',query.strip()):
+            terms=[]
+            for term in re.split(r'\s+AND\s+',group.strip()):
+                prefix=term.strip().endswith('*')
+                term=cls.normalize(term.strip().rstrip('*'))
+                if not term:
+                    raise ValueError(f'Invalid keyword query: {query}')
+                terms.append((term,prefix))
+            groups.append(terms)
+        return groups
+
+    def getTermBitmap(self,term,prefix=False):
+        """
+        A function to get the packed bitmap of the restaurants matching a single normalized term
+
+        Parameters
+        ----------
+        term : str
+            Normalized element or word
+
+        prefix : bool
+            If True, every token starting with the term matches. Defaults to False
+
+        Returns
+        -------
+        bitmap : numpy.ndarray
+            Packed bitmap of the matching restaurants
+        """
+        if not prefix:
+            return self.bitmaps.get(term,np.zeros((self.number_of_restaurants+7)//8,dtype=np.uint8))
+        first=bisect.bisect_left(self.tokens,term)
+        last=bisect.bisect_left(self.tokens,term+'\U0010ffff',first) #Tokens starting with the term are sorted right after it
+        bitmap=np.zeros((self.number_of_restaurants+7)//8,dtype=np.uint8)
+        for token in self.tokens[first:last]:
+            np.bitwise_or(bitmap,self.bitmaps[token],out=bitmap)
+        return bitmap
+
+    def getMask(self,query):
+        """
+        A function to get a boolean array marking the restaurants matching a query
+
+        Parameters
+        ----------
+        query : str or list
+            Keyword query (see parseQuery)
+
+        Returns
+        -------
+        mask : numpy.ndarray
+            True for the matching restaurants, in the order of the data set
+        """
+        bitmap=np.zeros((self.number_of_restaurants+7)//8,dtype=np.uint8)
+        for group in self.parseQuery(query):
+            group_bitmap=None
+            for term, prefix in group:
+                term_bitmap=self.getTermBitmap(term,prefix)
+                group_bitmap=term_bitmap.copy() if group_bitmap is None else np.bitwise_and(group_bitmap,term_bitmap,out=group_bitmap)
+            np.bitwise_or(bitmap,group_bitmap,out=bitmap)
+        mask=np.unpackbits(bitmap,count=self.number_of_restaurants).astype(bool)
+        return mask
+
+    def getRows(self,query):
+        """
+        A function to get the positions of the restaurants matching a query
+
+        Parameters
+        ----------
+        query : str or list
+            Keyword query (see parseQuery)
+
+        Returns
+        -------
+        rows : numpy.ndarray
+            Positions of the matching restaurants in the data set
+        """
+        rows=np.flatnonzero(self.getMask(query))
+        return rows
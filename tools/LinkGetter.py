@@ -1,6 +1,8 @@
-import requests
+from tools.HttpClient import getDefaultClient
+from tools.PageArchive import PageArchive
 from bs4 import BeautifulSoup
-import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
 
 class LinkGetter:
     """
@@ -13,6 +15,18 @@ class LinkGetter:
     links : list
         list of retrieved links
 
+    concurrency : int
+        Maximum number of listing pages requested at the same time
+
+    client : HttpClient
+        Client used to send the requests
+
+    archive : PageArchive or None
+        Archive to which every listing page is written
+
+    parser : str
+        Beautiful Soup tree builder used to parse the listing pages
+
     Methods
     -------
     getLinks():
@@ -20,21 +34,58 @@ class LinkGetter:
     
     getRequestsFromAllPages():
         A function to get the requests from all available pages
+
+    getPagesFromArchive(pages):
+        A function to read the listing pages from an archive instead of requesting them
+
+    getPage(page_number):
+        A function to request a single listing page
+
+    getLastPage(pages):
+        A function to find the number of the last available listing page
+
+    isPageAvailable(page_number,pages):
+        A function to check whether a listing page is available
     """
-    def __init__(self):
+    def __init__(self,concurrency=1,client=None,archive=None,pages=None,parser='html.parser'):
         """
         Creates an object with an attribute self.links containing the retrieved links
+
+        Parameters
+        ----------
+        concurrency : int
+            Maximum number of listing pages requested at the same time. Defaults to 1 (pages are walked one after another until a page is missing)
+
+        client : HttpClient or None
+            Client used to send the requests. Defaults to the shared client from tools.HttpClient
+
+        archive : PageArchive or None
+            Archive to which every requested listing page is written. Defaults to None
+
+        pages : str or None
+            Path to a PageArchive file. If given, the links are retrieved from the archived listing pages without sending any request. Defaults to None
+
+        parser : str
+            Beautiful Soup tree builder used to parse the listing pages, e.g. "html.parser" or "lxml". Defaults to "html.parser"
         """
+        self.concurrency=concurrency
+        self.client=client or getDefaultClient()
+        self.archive=archive
+        self.pages=pages
+        self.parser=parser
         self.links=self.getLinks()
     
     def getLinks(self):
         """
         A function to retrieve the links 
         """
-        request_list=self.getRequestsFromAllPages()
+        if self.pages:
+            request_list=self.getPagesFromArchive(self.pages)
+        else:
+            request_list=self.getRequestsFromAllPages()
         soup_list=[]
         for request in request_list:
-            soup_list.append(BeautifulSoup(request,"html.parser"))
+            soup_list.append(BeautifulSoup(request,self.parser))
         titles_soup=[]
         for soup in soup_list:
             titles_soup.extend(soup.find_all("h3"))
@@ -43,20 +94,125 @@ class LinkGetter:
             links.append(f'https://www.zlatestranky.cz{title.find("a")["href"]}')
         return links
     
-    def getRequestsFromAllPages(*self):
+    def getRequestsFromAllPages(self):
         """
-        A function to get the requests from all available pages 
+        A function to get the requests from all available pages. If self.concurrency is greater than 1, the last page is found first and all pages are then requested at the same time.
         """
+        if self.concurrency>1:
+            pages={} #Pages requested while searching for the last one, keyed by their number
+            last_page=self.getLastPage(pages)
+            missing=[i for i in range(1,last_page+1) if i not in pages]
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                for i, request in zip(missing,executor.map(self.getPage,missing)):
+                    if request.status_code!=200: #A page below the last one must exist => never parse an error page as an empty one
+                        raise requests.HTTPError(f'Unsuccessful request ({request.status_code}) for listing page {i}',response=request)
+                    pages[i]=request
+            request_list=[pages[i].content for i in range(1,last_page+1)]
+            print(f'Successfuly requested {last_page} pages')
+            return request_list
         request_list=[]
         i=1 #initializing the first iteration
         indicator=200 #initializing the while loop
         while indicator == 200:
-            request=requests.get(f'https://www.zlatestranky.cz/firmy/rubrika/Restaurace/kraj/Hlavn%C3%AD%20m%C4%9Bsto%20Praha/{i}')
+            request=self.getPage(i) #The client's rate limiter spaces out the requests
             indicator=request.status_code
-            time.sleep(0.2)
             if indicator == 200:
                 request_list.append(request.content)
                 i += 1
             else:
                 print(f'Successfuly requested {i-1} pages')
-        return request_list
\ No newline at end of file
+        return request_list
+
+    def getPage(self,page_number):
+        """
+        A function to request a single listing page. The client already retries a 429 or a 5xx, if the page still cannot be requested an error is raised, so that a listing page is never mistaken for a missing one.
+
+        Parameters
+        ----------
+        page_number : int
+            Number of the listing page
+
+        Returns
+        -------
+        request : requests.Response
+            Response of the listing page (status code 200, or e.g. 404 after the last page)
+        """
+        request=self.client.get(f'https://www.zlatestranky.cz/firmy/rubrika/Restaurace/kraj/Hlavn%C3%AD%20m%C4%9Bsto%20Praha/{page_number}')
+        if request.status_code==429 or request.status_code>=500: #Throttled or server error after all retries => the restaurants of the page would silently vanish
+            raise requests.HTTPError(f'Unsuccessful request ({request.status_code}) for listing page {page_number}',response=request)
+        if self.archive is not None and request.status_code==200:
+            self.archive.append(request.url,request.content,request.headers,request.status_code,kind='listing')
+        return request
+
+    def getLastPage(self,pages):
+        """
+        A function to find the number of the last available listing page. The page number is doubled until a page is missing and the last page is then found by a binary search between the last available and the first missing page.
+
+        Parameters
+        ----------
+        pages : dict
+            Dictionary to which the available pages requested along the way are saved (page number as key, response as value) so that they do not have to be requested again
+
+        Returns
+        -------
+        last_page : int
+            Number of the last available page (0 if not even the first page is available)
+        """
+        if not self.isPageAvailable(1,pages):
+            return 0
+        available=1 #Highest page known to be available
+        missing=2
+        while self.isPageAvailable(missing,pages): #Exponential probe for a missing page
+            available=missing
+            missing*=2
+        while missing-available>1: #Binary search between the last available and the first missing page
+            middle=(available+missing)//2
+            if self.isPageAvailable(middle,pages):
+                available=middle
+            else:
+                missing=middle
+        last_page=available
+        return last_page
+
+    def isPageAvailable(self,page_number,pages):
+        """
+        A function to check whether a listing page is available. Available pages are saved to "pages".
+
+        Parameters
+        ----------
+        page_number : int
+            Number of the listing page
+
+        pages : dict
+            Dictionary of already requested available pages (page number as key, response as value)
+
+        Returns
+        -------
+        available : bool
+            True if the page was returned with status code 200
+        """
+        request=self.getPage(page_number)
+        available=request.status_code==200
+        if available:
+            pages[page_number]=request
+        return available
+
+    def getPagesFromArchive(self,pages):
+        """
+        A function to read the latest version of every listing page from an archive instead of requesting them
+
+        Parameters
+        ----------
+        pages : str
+            Path to a PageArchive file
+
+        Returns
+        -------
+        request_list : list
+            Contents of the listing pages ordered by the page number
+        """
+        records=list(PageArchive(pages).replay(kind='listing'))
+        records.sort(key=lambda record: int(record['url'].rstrip('/').rsplit('/',1)[1]))
+        request_list=[record['content'] for record in records]
+        print(f'Successfuly read {len(request_list)} pages from the archive')
+        return request_list
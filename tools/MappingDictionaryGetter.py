@@ -1,7 +1,8 @@
 #Running this file generates the dist_dict.json file which is the mapping dictionary for Prague districts 
 #This file is needed in Restaurant.py for generating a district based on an address
 #No need to run it, the file has already been generated (but it is runnable if necessary)
-import requests
+from tools.HttpClient import getDefaultClient
+from tools.DistrictResolver import resetDefaultResolver
 from bs4 import BeautifulSoup
 import json
 import re
@@ -17,6 +18,9 @@ class MappingDictionaryGetter:
     dist_dict : dict
         Mapping dictionary for Prague districts. Contains municipal districts as keys and administrative districts + cadastral areas as values
 
+    client : HttpClient
+        Client used to send the request
+
     Methods
     -------
     getMappingDict():
@@ -29,13 +33,16 @@ class MappingDictionaryGetter:
         A function to save the dictionary into a json file "dist_dict.json"
 
     """
-    def __init__(self):
+    def __init__(self,client=None):
         """
         Constructs the dist_dict attribute by calling the getMappingDict function.
 
         Parameters
         ----------
+        client : HttpClient or None
+            Client used to send the request. Defaults to the shared client from tools.HttpClient
         """
+        self.client=client or getDefaultClient()
         self.dist_dict=self.getMappingDict()
     
     def getMappingDict(self):
@@ -50,7 +57,7 @@ class MappingDictionaryGetter:
         dist_dict_final : dict
             Mapping dictionary for Prague districts
         """
-        request=requests.get('https://cs.wikipedia.org/wiki/Administrativn%C3%AD_d%C4%9Blen%C3%AD_Prahy#Obvody_(1%E2%80%9310)') #Sending a request to the wikipedia page with Prague districts
+        request=self.client.get('https://cs.wikipedia.org/wiki/Administrativn%C3%AD_d%C4%9Blen%C3%AD_Prahy#Obvody_(1%E2%80%9310)') #Sending a request to the wikipedia page with Prague districts
         soup=BeautifulSoup(request.content,"html.parser") #Making a soup
         table=soup.find('table',{'class':'wikitable'}) #Extracting the table with municipal districts and their respective administrative districts and cadastral areas
         lines=table.find_all('tr') #Extracting the lines of the table (each line represents one municipal district)
@@ -110,6 +117,7 @@ class MappingDictionaryGetter:
         """
         with open('data\\dist_dict.json', 'w') as outfile:
             json.dump(self.dist_dict, outfile)
+        resetDefaultResolver() #Districts resolved later in this process use the new dictionary
 
 if __name__ == "__main__": #Run only in case the file is run directly
     dist_dict=MappingDictionaryGetter() #Generate the dictionary
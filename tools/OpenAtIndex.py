@@ -0,0 +1,147 @@
+from tools.OpeningHours import OpeningHours
+from datetime import datetime
+import numpy as np
+import re
+
+class OpenAtIndex:
+    """
+    A class answering "which restaurants are open at a given time of the week" without looking at the opening hours of each restaurant. The week is cut into segments at every minute at which some restaurant opens or closes, and for every segment a packed bitset (one bit per restaurant) of the restaurants open during it is stored. A query is a binary search for the segment followed by unpacking its bitset.
+
+    ...
+
+    Attributes
+    ----------
+    number_of_restaurants : int
+        Number of restaurants (bits in each bitset)
+
+    boundaries : numpy.ndarray
+        Sorted minutes of the week at which the segments start (the first one is 0)
+
+    bitsets : numpy.ndarray
+        Packed bitsets of shape (number of segments, ceil(number_of_restaurants/8)), one row per segment
+
+    day_names : dict
+        Lowercase Czech and English names and abbreviations of the week days with their position (0 for Monday) as values (class attribute)
+
+    Methods
+    -------
+    parseMoment(moment):
+        A function to convert a time of the week to minutes of the week
+
+    getOpenMask(moment):
+        A function to get a boolean array marking the restaurants open at a given time
+
+    getOpenRows(moment):
+        A function to get the positions of the restaurants open at a given time
+    """
+    day_names={name:position for position, names in enumerate([['po','pondělí','mon','monday'],['út','úterý','tue','tuesday'],['st','středa','wed','wednesday'],['čt','čtvrtek','thu','thursday'],['pá','pátek','fri','friday'],['so','sobota','sat','saturday'],['ne','neděle','sun','sunday']]) for name in names}
+
+    def __init__(self,opening_hours_table,number_of_restaurants):
+        """
+        Constructs the segments and their bitsets
+
+        Parameters
+        ----------
+        opening_hours_table : pd.DataFrame
+            Opening intervals with the columns "row", "start" and "end" (see DataInterpreter.getOpeningHoursTable)
+
+        number_of_restaurants : int
+            Number of restaurants in the data set
+        """
+        self.number_of_restaurants=number_of_restaurants
+        rows=opening_hours_table.row.to_numpy()
+        starts=opening_hours_table.start.to_numpy()
+        ends=opening_hours_table.end.to_numpy()
+        wrapped=ends>OpeningHours.minutes_per_week #Sunday past midnight => add the part falling on Monday as a separate interval
+        rows=np.concatenate([rows,rows[wrapped]])
+        starts=np.concatenate([starts,np.zeros(wrapped.sum(),dtype=starts.dtype)])
+        ends=np.concatenate([np.minimum(ends,OpeningHours.minutes_per_week),ends[wrapped]-OpeningHours.minutes_per_week])
+        self.boundaries=np.unique(np.concatenate([[0],starts,ends,[OpeningHours.minutes_per_week]]))[:-1]
+        first=np.searchsorted(self.boundaries,starts) #Segment in which each interval starts
+        last=np.searchsorted(self.boundaries,ends) #Segment after the last one of each interval
+        event_segments=np.concatenate([first,last]) #Sweep over the opening (+1) and closing (-1) events in the order of the week
+        order=np.argsort(event_segments,kind='stable')
+        event_segments=event_segments[order]
+        event_rows=np.concatenate([rows,rows])[order]
+        event_deltas=np.concatenate([np.ones(len(rows),dtype=np.int32),-np.ones(len(rows),dtype=np.int32)])[order]
+        event_starts=np.searchsorted(event_segments,np.arange(len(self.boundaries)+1)) #Events of segment i are event_starts[i]:event_starts[i+1]
+        open_counts=np.zeros(number_of_restaurants,dtype=np.int32) #Number of open intervals of each restaurant (intervals of a restaurant may overlap)
+        bitset=np.zeros((number_of_restaurants+7)//8,dtype=np.uint8) #Running bitset, only the bits of restaurants with an event are updated
+        self.bitsets=np.empty((len(self.boundaries),len(bitset)),dtype=np.uint8)
+        for segment in range(len(self.boundaries)):
+            first_event, last_event = event_starts[segment], event_starts[segment+1]
+            if last_event>first_event:
+                np.add.at(open_counts,event_rows[first_event:last_event],event_deltas[first_event:last_event])
+                changed=np.unique(event_rows[first_event:last_event])
+                positions=changed>>3
+                bits=(128>>(changed&7)).astype(np.uint8) #Same bit order as np.packbits
+                np.bitwise_and.at(bitset,positions,~bits)
+                is_open=open_counts[changed]>0
+                np.bitwise_or.at(bitset,positions[is_open],bits[is_open])
+            self.bitsets[segment]=bitset
+
+    def parseMoment(self,moment):
+        """
+        A function to convert a time of the week to minutes of the week
+
+        Parameters
+        ----------
+        moment : str, tuple or datetime.datetime
+            A week day followed by a time, e.g. 'Pá 23:30', 'pátek 23', 'Friday 23:30' or ('Fri', '23:30'), or a datetime
+
+        Returns
+        -------
+        minute : int
+            Minutes since Monday 0:00
+        """
+        if isinstance(moment,datetime):
+            return moment.weekday()*OpeningHours.minutes_per_day+moment.hour*60+moment.minute
+        if isinstance(moment,(tuple,list)) and len(moment)==2:
+            moment=f'{moment[0]} {moment[1]}'
+        match=re.fullmatch(r'\s*(\w+)\.?,?\s+([0-9]{1,2}(?::[0-9]{2})?)\s*',str(moment))
+        if match is None or match.group(1).lower() not in self.day_names:
+            raise ValueError(f'Invalid time of the week: {moment}. Please specify a week day and a time, e.g. "Pá 23:30" or "Friday 23:30"')
+        try:
+            minutes=OpeningHours.parseTime(match.group(2))
+        except ValueError:
+            minutes=OpeningHours.minutes_per_day
+        if minutes>=OpeningHours.minutes_per_day:
+            raise ValueError(f'Invalid time of the week: {moment}')
+        minute=self.day_names[match.group(1).lower()]*OpeningHours.minutes_per_day+minutes
+        return minute
+
+    def getOpenMask(self,moment):
+        """
+        A function to get a boolean array marking the restaurants open at a given time
+
+        Parameters
+        ----------
+        moment : str, tuple, datetime.datetime or int
+            Time of the week (see parseMoment) or minutes since Monday 0:00
+
+        Returns
+        -------
+        mask : numpy.ndarray
+            True for the restaurants open at that time, in the order of the data set
+        """
+        minute=moment if isinstance(moment,(int,np.integer)) else self.parseMoment(moment)
+        segment=np.searchsorted(self.boundaries,minute,side='right')-1
+        mask=np.unpackbits(self.bitsets[segment],count=self.number_of_restaurants).astype(bool)
+        return mask
+
+    def getOpenRows(self,moment):
+        """
+        A function to get the positions of the restaurants open at a given time
+
+        Parameters
+        ----------
+        moment : str, tuple, datetime.datetime or int
+            Time of the week (see parseMoment) or minutes since Monday 0:00
+
+        Returns
+        -------
+        rows : numpy.ndarray
+            Positions of the open restaurants in the data set
+        """
+        rows=np.flatnonzero(self.getOpenMask(moment))
+        return rows
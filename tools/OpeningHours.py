@@ -0,0 +1,182 @@
+import re
+
+class OpeningHours:
+    """
+    A class holding the opening hours of a restaurant as intervals in minutes of the week (0 is Monday 0:00, 10080 is the end of Sunday). A range ending before it starts, like '11 - 01', continues past midnight into the next day, and a range past Sunday midnight continues into Monday.
+
+    ...
+
+    Attributes
+    ----------
+    intervals : list
+        List of (day, start, end) tuples. day is the position of the week day the range is listed under (0 for Monday), start and end are minutes of the week with start < end. end can exceed minutes_per_week for a range past Sunday midnight
+
+    week_days : list
+        Czech abbreviations of the week days as used on www.zlatestranky.cz (class attribute)
+
+    minutes_per_day : int
+        Number of minutes in a day (class attribute)
+
+    minutes_per_week : int
+        Number of minutes in a week (class attribute)
+
+    Methods
+    -------
+    fromDict(opening_hours):
+        A function to create the opening hours from the dictionary extracted by Restaurant.getOpeningHours
+
+    parseTime(time):
+        A function to convert a time like '10:30' to minutes since midnight
+
+    parseRange(day, time_range):
+        A function to convert a time range listed under a week day to an interval in minutes of the week
+
+    getWeekIntervals():
+        A function to get the intervals with the ranges past Sunday midnight split at the end of the week
+
+    getDaySpans():
+        A function to get the number of opening hours for each week day
+
+    getWeeklyDuration():
+        A function to get the total number of opening hours per week
+    """
+    week_days=['Po', 'Út', 'St', 'Čt', 'Pá', 'So', 'Ne']
+    minutes_per_day=24*60
+    minutes_per_week=7*24*60
+
+    def __init__(self,intervals):
+        """
+        Constructs the opening hours
+
+        Parameters
+        ----------
+        intervals : list
+            List of (day, start, end) tuples (see parseRange)
+        """
+        self.intervals=sorted(intervals)
+
+    @classmethod
+    def fromDict(cls,opening_hours):
+        """
+        A function to create the opening hours from the dictionary extracted by Restaurant.getOpeningHours. Each value is None (closed), a time range or a list of time ranges.
+
+        Parameters
+        ----------
+        opening_hours : dict
+            Opening hours for each week day (e.g. {'Po': '11 - 23', 'Út': ['11 - 14', '17 - 01'], 'St': None, ...})
+
+        Returns
+        -------
+        hours : OpeningHours
+            Opening hours of the restaurant
+        """
+        intervals=[]
+        for position, day in enumerate(cls.week_days):
+            value=opening_hours.get(day)
+            for time_range in (value if type(value)==list else [value]):
+                if time_range is not None:
+                    intervals.append(cls.parseRange(position,time_range))
+        hours=cls(intervals)
+        return hours
+
+    @classmethod
+    def parseTime(cls,time):
+        """
+        A function to convert a time like '10:30' or '23' to minutes since midnight
+
+        Parameters
+        ----------
+        time : str
+            Hours, optionally followed by a colon and minutes
+
+        Returns
+        -------
+        minutes : int
+            Minutes since midnight (1440 for '24')
+        """
+        match=re.fullmatch('([0-9]{1,2})(?::([0-9]{2}))?',time.strip())
+        if match is None or int(match.group(1))>24 or int(match.group(2) or 0)>59:
+            raise ValueError(f'Invalid time in the opening hours: {time}')
+        minutes=int(match.group(1))*60+int(match.group(2) or 0)
+        return minutes
+
+    @classmethod
+    def parseRange(cls,day,time_range):
+        """
+        A function to convert a time range listed under a week day to an interval in minutes of the week. If the range ends before it starts, it ends on the next day.
+
+        Parameters
+        ----------
+        day : int
+            Position of the week day (0 for Monday)
+
+        time_range : str
+            A time range like '10:30 - 23' or '11 - 01'
+
+        Returns
+        -------
+        interval : tuple
+            (day, start, end) with start and end in minutes of the week
+        """
+        times=time_range.split('-')
+        if len(times)!=2:
+            raise ValueError(f'Invalid time range in the opening hours: {time_range}')
+        start, end = cls.parseTime(times[0]), cls.parseTime(times[1])
+        if end<start: #Past midnight
+            end+=cls.minutes_per_day
+        interval=(day,day*cls.minutes_per_day+start,day*cls.minutes_per_day+end)
+        return interval
+
+    def getWeekIntervals(self):
+        """
+        A function to get the intervals with the ranges past Sunday midnight split at the end of the week, so that every interval lies within 0 and minutes_per_week
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        week_intervals : list
+            List of (start, end) tuples in minutes of the week
+        """
+        week_intervals=[]
+        for day, start, end in self.intervals:
+            if end>self.minutes_per_week: #Sunday past midnight continues on Monday
+                week_intervals.append((start,self.minutes_per_week))
+                week_intervals.append((0,end-self.minutes_per_week))
+            elif end>start:
+                week_intervals.append((start,end))
+        return sorted(week_intervals)
+
+    def getDaySpans(self):
+        """
+        A function to get the number of opening hours for each week day. A range past midnight counts to the day it is listed under.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        span_dict : dict
+            Number of hours (rounded to two decimals) for each week day, None if the restaurant is closed that day
+        """
+        span_dict={day:None for day in self.week_days}
+        for day, start, end in self.intervals:
+            span_dict[self.week_days[day]]=(span_dict[self.week_days[day]] or 0)+(end-start)
+        span_dict={day:(None if minutes is None else round(minutes/60,2)) for day, minutes in span_dict.items()}
+        return span_dict
+
+    def getWeeklyDuration(self):
+        """
+        A function to get the total number of opening hours per week
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        duration : float
+            Number of opening hours per week
+        """
+        duration=sum(end-start for day, start, end in self.intervals)/60
+        return duration
@@ -0,0 +1,428 @@
+from datetime import datetime, timezone
+import threading
+import gzip
+import json
+import os
+
+class PageArchive:
+    """
+    A class storing downloaded pages in a compact append-only archive file. Every record consists of a JSON header line (URL, kind of page, fetch time, status code, headers, compression and body length) followed by the compressed body. A sidecar index file with the offset of every record is loaded into memory once, so a single page is read with one seek.
+
+    ...
+
+    Attributes
+    ----------
+    file_path : str
+        Path to the archive file
+
+    index_path : str
+        Path to the index file (file_path + ".idx")
+
+    compression : str
+        Compression of newly written bodies, "gzip" or "zstd" (requires the zstandard package)
+
+    index : list or None
+        Index entries (url, kind, timestamp, offset, length) in the order of the archive, loaded on first use
+
+    versions : dict or None
+        URL as key, list of (offset, length, fetched_at) tuples of its stored versions in the order of the archive as value
+
+    Methods
+    -------
+    append(url, content, headers=None, status=200, kind='detail', timestamp=None):
+        A function to add a page to the archive
+
+    compress(content):
+        A function to compress a body
+
+    decompress(data, compression):
+        A function to decompress a body
+
+    parseTimestamp(timestamp):
+        A function to convert an ISO timestamp to a comparable datetime
+
+    loadIndex():
+        A function to load the index into memory once, recovering the records missing from it
+
+    addEntry(entry):
+        A function to add an index entry to the in-memory index
+
+    readIndex():
+        A function to read the offsets of all records from the index
+
+    rebuildIndex(start=0):
+        A function to recreate the index (or its tail) by scanning the archive
+
+    readRecord(archive_file, offset):
+        A function to read a single record at a given offset
+
+    read(url, as_of=None):
+        A function to read the latest stored version of a page
+
+    replay(kind=None, as_of=None, latest=True):
+        A function to iterate over the stored pages
+
+    close():
+        A function to close the archive file
+    """
+    def __init__(self,file_path,compression='gzip'):
+        """
+        Constructs the archive. The file is created on the first append.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the archive file
+
+        compression : str
+            Compression of newly written bodies, "gzip" or "zstd" (requires the zstandard package). Defaults to "gzip"
+        """
+        if compression not in ['gzip','zstd']:
+            raise ValueError('Please specify the compression as "gzip" or "zstd"')
+        self.file_path=file_path
+        self.index_path=file_path+'.idx'
+        self.compression=compression
+        self.lock=threading.RLock()
+        self.archive_file=None
+        self.index=None
+        self.versions=None
+
+    def append(self,url,content,headers=None,status=200,kind='detail',timestamp=None):
+        """
+        A function to add a page to the archive. Older versions of the same URL are kept as historical snapshots.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page
+
+        content : bytes
+            Body of the page
+
+        headers : dict or None
+            Response headers. Defaults to None
+
+        status : int
+            Status code of the response. Defaults to 200
+
+        kind : str
+            Kind of the page, "listing" for LinkGetter pages and "detail" for restaurant pages. Defaults to "detail"
+
+        timestamp : str or None
+            Fetch time in ISO format. Defaults to the current UTC time
+
+        Returns
+        -------
+
+        """
+        timestamp=timestamp or datetime.now(timezone.utc).isoformat(timespec='seconds')
+        body=self.compress(content)
+        header={'url':url,'kind':kind,'timestamp':timestamp,'status':status,'headers':dict(headers or {}),'compression':self.compression,'length':len(body)}
+        record=json.dumps(header,ensure_ascii=False).encode('utf-8')+b'\n'+body+b'\n'
+        with self.lock:
+            self.loadIndex() #Recovers the records of a crashed run before new ones are appended after them
+            if self.archive_file is None:
+                self.archive_file=open(self.file_path,'ab')
+            offset=self.archive_file.seek(0,os.SEEK_END)
+            self.archive_file.write(record)
+            self.archive_file.flush()
+            entry={'url':url,'kind':kind,'timestamp':timestamp,'offset':offset,'length':len(record)}
+            with open(self.index_path,'a',encoding='utf-8') as index_file: #The index is written after the record so that it never points to a missing record
+                index_file.write(json.dumps(entry,ensure_ascii=False)+'\n')
+            self.addEntry(entry)
+
+    def compress(self,content):
+        """
+        A function to compress a body with self.compression
+
+        Parameters
+        ----------
+        content : bytes
+            Uncompressed body
+
+        Returns
+        -------
+        data : bytes
+            Compressed body
+        """
+        if self.compression=='zstd':
+            import zstandard #Optional dependency, only needed for zstd archives
+            data=zstandard.ZstdCompressor(level=10).compress(content)
+        else:
+            data=gzip.compress(content,compresslevel=6)
+        return data
+
+    def decompress(self,data,compression):
+        """
+        A function to decompress a body
+
+        Parameters
+        ----------
+        data : bytes
+            Compressed body
+
+        compression : str
+            Compression stored in the record header
+
+        Returns
+        -------
+        content : bytes
+            Uncompressed body
+        """
+        if compression=='zstd':
+            import zstandard
+            content=zstandard.ZstdDecompressor().decompress(data)
+        else:
+            content=gzip.decompress(data)
+        return content
+
+    @classmethod
+    def parseTimestamp(cls,timestamp):
+        """
+        A function to convert an ISO timestamp to a datetime, so that fetch times with different precisions or time zones are compared correctly
+
+        Parameters
+        ----------
+        timestamp : str or datetime
+            ISO timestamp (e.g. "2024-05-01T12:00:00+00:00") or datetime. A time without a time zone is taken as UTC
+
+        Returns
+        -------
+        fetched_at : datetime
+            Time zone aware datetime
+        """
+        fetched_at=timestamp if isinstance(timestamp,datetime) else datetime.fromisoformat(timestamp) #A non-ISO timestamp raises a ValueError
+        if fetched_at.tzinfo is None:
+            fetched_at=fetched_at.replace(tzinfo=timezone.utc)
+        return fetched_at
+
+    def loadIndex(self):
+        """
+        A function to load the index into memory once. If the index is missing, it is rebuilt from the archive. If the archive continues after the last indexed record (the process stopped between writing a record and its index entry), the missing entries are recovered by scanning only that tail.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        index : list
+            Index entries (url, kind, timestamp, offset, length) in the order of the archive
+        """
+        with self.lock:
+            if self.index is not None:
+                return self.index
+            self.index, self.versions = [], {}
+            if not os.path.exists(self.file_path):
+                return self.index
+            entries=[]
+            if not os.path.exists(self.index_path):
+                entries=self.rebuildIndex()
+            else:
+                with open(self.index_path,encoding='utf-8') as index_file:
+                    for line in index_file:
+                        try:
+                            entries.append(json.loads(line))
+                        except ValueError: #Line cut off by a crash, the record is recovered from the archive below
+                            pass
+            indexed_end=0
+            if entries:
+                last=entries[-1]
+                if 'length' not in last: #Index written before the lengths were stored => read the header of the last record
+                    with open(self.file_path,'rb') as archive_file:
+                        archive_file.seek(last['offset'])
+                        header_line=archive_file.readline()
+                        last['length']=len(header_line)+json.loads(header_line)['length']+1
+                indexed_end=last['offset']+last['length']
+            archive_size=os.path.getsize(self.file_path)
+            if indexed_end>archive_size: #The index points past the archive => it cannot be trusted
+                entries=self.rebuildIndex()
+            elif indexed_end<archive_size:
+                entries+=self.rebuildIndex(indexed_end)
+            for entry in entries:
+                self.addEntry(entry)
+        return self.index
+
+    def addEntry(self,entry):
+        """
+        A function to add an index entry to the in-memory index
+
+        Parameters
+        ----------
+        entry : dict
+            Index entry (url, kind, timestamp, offset and length)
+
+        Returns
+        -------
+
+        """
+        self.index.append(entry)
+        self.versions.setdefault(entry['url'],[]).append((entry['offset'],entry.get('length'),self.parseTimestamp(entry['timestamp'])))
+
+    def readIndex(self):
+        """
+        A function to read the offsets of all records from the index (see loadIndex)
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        index : list
+            List of dictionaries (url, kind, timestamp, offset, length) in the order of the archive
+        """
+        index=list(self.loadIndex())
+        return index
+
+    def rebuildIndex(self,start=0):
+        """
+        A function to recreate the index by scanning the archive from a given offset. With start=0 the index file is rewritten, otherwise the recovered entries are appended to it. A record cut off at the end of the file is truncated away, so that the next records are appended right after the last complete one.
+
+        Parameters
+        ----------
+        start : int
+            Offset of the first record to scan. Defaults to 0 (the whole archive)
+
+        Returns
+        -------
+        entries : list
+            Index entries of the scanned records
+        """
+        entries=[]
+        archive_size=os.path.getsize(self.file_path)
+        with open(self.file_path,'rb') as archive_file:
+            archive_file.seek(start)
+            end=start
+            while True:
+                offset=archive_file.tell()
+                line=archive_file.readline()
+                if not line:
+                    break
+                try:
+                    header=json.loads(line)
+                except ValueError:
+                    break
+                archive_file.seek(header['length']+1,os.SEEK_CUR)
+                if archive_file.tell()>archive_size:
+                    break
+                end=archive_file.tell()
+                entries.append({'url':header['url'],'kind':header['kind'],'timestamp':header['timestamp'],'offset':offset,'length':end-offset})
+        if end<archive_size: #Cut off record => drop it, nothing after it could be read
+            if self.archive_file is not None:
+                self.archive_file.close()
+                self.archive_file=None
+            os.truncate(self.file_path,end)
+        cut_off=False
+        if start and os.path.exists(self.index_path) and os.path.getsize(self.index_path)>0:
+            with open(self.index_path,'rb') as index_file:
+                index_file.seek(-1,os.SEEK_END)
+                cut_off=index_file.read(1)!=b'\n'
+        with open(self.index_path,'w' if start==0 else 'a',encoding='utf-8') as index_file:
+            if cut_off:
+                index_file.write('\n') #Terminate a line cut off by a crash, the damaged line is skipped when the index is read
+            for entry in entries:
+                index_file.write(json.dumps(entry,ensure_ascii=False)+'\n')
+        return entries
+
+    def readRecord(self,archive_file,offset):
+        """
+        A function to read a single record at a given offset
+
+        Parameters
+        ----------
+        archive_file : file object
+            Archive file opened in binary mode
+
+        offset : int
+            Offset of the record's header
+
+        Returns
+        -------
+        record : dict
+            Header of the record with the uncompressed body under "content"
+        """
+        archive_file.seek(offset)
+        record=json.loads(archive_file.readline())
+        record['content']=self.decompress(archive_file.read(record['length']),record['compression'])
+        return record
+
+    def read(self,url,as_of=None):
+        """
+        A function to read the latest stored version of a page
+
+        Parameters
+        ----------
+        url : str
+            URL of the page
+
+        as_of : str or None
+            If given (ISO timestamp or datetime), the latest version fetched at or before this time is returned. Defaults to None
+
+        Returns
+        -------
+        record : dict or None
+            Header of the record with the uncompressed body under "content", None if the page is not stored
+        """
+        with self.lock:
+            self.loadIndex()
+            as_of=None if as_of is None else self.parseTimestamp(as_of)
+            offsets=[offset for offset, length, fetched_at in self.versions.get(url,[]) if as_of is None or fetched_at<=as_of]
+        if not offsets:
+            return None
+        with self.lock:
+            if self.archive_file is not None:
+                self.archive_file.flush()
+        with open(self.file_path,'rb') as archive_file:
+            record=self.readRecord(archive_file,offsets[-1])
+        return record
+
+    def replay(self,kind=None,as_of=None,latest=True):
+        """
+        A function to iterate over the stored pages so that they can be parsed again without sending any request
+
+        Parameters
+        ----------
+        kind : str or None
+            Only pages of this kind ("listing" or "detail") are returned. Defaults to None (all pages)
+
+        as_of : str or None
+            If given (ISO timestamp or datetime), only pages fetched at or before this time are returned. Defaults to None
+
+        latest : bool
+            If True, only the latest version of each URL is returned, otherwise every stored version. Defaults to True
+
+        Returns
+        -------
+        records : generator
+            Generator of records (header with the uncompressed body under "content") in the order they were archived
+        """
+        as_of=None if as_of is None else self.parseTimestamp(as_of)
+        entries=[entry for entry in self.readIndex() if (kind is None or entry['kind']==kind) and (as_of is None or self.parseTimestamp(entry['timestamp'])<=as_of)]
+        if latest:
+            latest_offsets={entry['url']:entry['offset'] for entry in entries} #Later records overwrite earlier ones
+            offsets=sorted(latest_offsets.values())
+        else:
+            offsets=[entry['offset'] for entry in entries]
+        with self.lock:
+            if self.archive_file is not None:
+                self.archive_file.flush()
+        if not offsets:
+            return
+        with open(self.file_path,'rb') as archive_file:
+            for offset in offsets:
+                yield self.readRecord(archive_file,offset)
+
+    def close(self):
+        """
+        A function to close the archive file
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+
+        """
+        with self.lock:
+            if self.archive_file is not None:
+                self.archive_file.close()
+                self.archive_file=None
@@ -0,0 +1,134 @@
+from bs4 import SoupStrainer
+
+class PageStrainer(SoupStrainer):
+    """
+    A class telling Beautiful Soup which parts of a page to build while parsing (passed as parse_only). Only the subtrees whose root matches one of the queries are kept, everything else (navigation, ads, scripts) is skipped, which makes parsing faster and the tree much smaller.
+
+    ...
+
+    Attributes
+    ----------
+    queries : list
+        List of (tag name, attributes) tuples describing the roots of the kept subtrees. An attribute value of None only requires the attribute to be present
+
+    Methods
+    -------
+    isKept(name, attrs):
+        A function to check whether a tag is the root of a kept subtree
+
+    allow_tag_creation(nsprefix, name, attrs):
+        Hook used by Beautiful Soup 4.13+ to decide whether to build a top-level tag
+
+    allow_string_creation(string):
+        Hook used by Beautiful Soup 4.13+ to decide whether to build a top-level string
+
+    search_tag(markup_name=None, markup_attrs={}):
+        Hook used by Beautiful Soup up to 4.12 to decide whether to build a top-level tag
+    """
+    def __init__(self,queries):
+        """
+        Constructs the strainer
+
+        Parameters
+        ----------
+        queries : list
+            List of (tag name, attributes) tuples describing the roots of the kept subtrees, e.g. [('table',{}),('div',{'class':'map'})]
+        """
+        super().__init__()
+        self.queries=queries
+
+    def isKept(self,name,attrs):
+        """
+        A function to check whether a tag is the root of a kept subtree. A class matches either the whole class attribute or one of its classes, like in soup.find.
+
+        Parameters
+        ----------
+        name : str
+            Name of the tag
+
+        attrs : dict or None
+            Attributes of the tag as given by the tree builder
+
+        Returns
+        -------
+        kept : bool
+            True if the tag matches one of the queries
+        """
+        attrs=attrs or {}
+        for query_name, query_attrs in self.queries:
+            if name != query_name:
+                continue
+            for attribute, value in query_attrs.items():
+                found=attrs.get(attribute)
+                if found is None:
+                    break
+                if value is None:
+                    continue
+                if attribute == 'class':
+                    classes=found.split() if isinstance(found,str) else list(found) #The class is not split into a list yet at this point with some builders
+                    if value != ' '.join(classes) and value not in classes:
+                        break
+                elif found != value:
+                    break
+            else: #All attributes of the query matched
+                return True
+        return False
+
+    def allow_tag_creation(self,nsprefix,name,attrs):
+        """
+        Hook used by Beautiful Soup 4.13+ to decide whether to build a tag that is not inside a kept subtree
+
+        Parameters
+        ----------
+        nsprefix : str or None
+            Namespace prefix of the tag
+
+        name : str
+            Name of the tag
+
+        attrs : dict or None
+            Attributes of the tag
+
+        Returns
+        -------
+        kept : bool
+            True if the tag is the root of a kept subtree
+        """
+        return self.isKept(name,attrs)
+
+    def allow_string_creation(self,string):
+        """
+        Hook used by Beautiful Soup 4.13+ to decide whether to build a string that is not inside a kept subtree
+
+        Parameters
+        ----------
+        string : str
+            The string
+
+        Returns
+        -------
+        kept : bool
+            Always False
+        """
+        return False #Text outside of the kept subtrees is never needed
+
+    def search_tag(self,markup_name=None,markup_attrs={}):
+        """
+        Hook used by Beautiful Soup up to 4.12 to decide whether to build a tag that is not inside a kept subtree
+
+        Parameters
+        ----------
+        markup_name : str
+            Name of the tag
+
+        markup_attrs : dict or list
+            Attributes of the tag
+
+        Returns
+        -------
+        found : str or None
+            Name of the tag if it is the root of a kept subtree, None otherwise
+        """
+        if self.isKept(markup_name,dict(markup_attrs)):
+            return markup_name
+        return None
@@ -0,0 +1,219 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+import threading
+import time
+
+class RateLimiter:
+    """
+    A class limiting the number of requests sent to each host with a token bucket. The rate of a host is lowered when it answers with 429 or 5xx, requests are paused for as long as its Retry-After header asks and the rate is slowly raised again after successful responses.
+
+    ...
+
+    Attributes
+    ----------
+    rate : float
+        Initial number of requests per second for every host
+
+    min_rate : float
+        Lowest rate the limiter backs off to
+
+    max_rate : float
+        Highest rate the limiter ramps up to
+
+    burst : float
+        Maximum number of tokens a bucket can hold
+
+    increase : float
+        Requests per second added to the rate after each successful response
+
+    decrease : float
+        Factor the rate is multiplied by after a 429 or 5xx response
+
+    buckets : dict
+        State of the bucket of each host (rate, tokens, time of the last refill and time until which the host is paused)
+
+    clock : callable
+        Function returning the current time in seconds
+
+    sleep : callable
+        Function waiting for the given number of seconds
+
+    Methods
+    -------
+    getBucket(host):
+        A function to get the bucket of a host, creating it if needed
+
+    acquire(url):
+        A function to wait until a request to the URL's host is allowed
+
+    update(url, status_code, headers):
+        A function to adjust the host's rate based on the received response
+
+    parseRetryAfter(value):
+        A function to convert a Retry-After header to a number of seconds
+
+    getRate(url):
+        A function to get the current rate of the URL's host
+    """
+    def __init__(self,rate=5.0,min_rate=0.5,max_rate=50.0,burst=1.0,increase=0.5,decrease=0.5,clock=time.monotonic,sleep=time.sleep):
+        """
+        Constructs the limiter
+
+        Parameters
+        ----------
+        rate : float
+            Initial number of requests per second for every host. Defaults to 5 (one request every 0.2 seconds)
+
+        min_rate : float
+            Lowest rate the limiter backs off to. Defaults to 0.5
+
+        max_rate : float
+            Highest rate the limiter ramps up to. Defaults to 50
+
+        burst : float
+            Maximum number of tokens a bucket can hold, i.e. how many requests can be sent at once after a quiet period. Defaults to 1
+
+        increase : float
+            Requests per second added to the rate after each successful response. Defaults to 0.5
+
+        decrease : float
+            Factor the rate is multiplied by after a 429 or 5xx response. Defaults to 0.5
+
+        clock : callable
+            Function returning the current time in seconds. Defaults to time.monotonic
+
+        sleep : callable
+            Function waiting for the given number of seconds. Defaults to time.sleep
+        """
+        self.rate=rate
+        self.min_rate=min_rate
+        self.max_rate=max_rate
+        self.burst=burst
+        self.increase=increase
+        self.decrease=decrease
+        self.buckets={}
+        self.clock=clock
+        self.sleep=sleep
+        self.lock=threading.Lock()
+
+    def getBucket(self,host):
+        """
+        A function to get the bucket of a host, creating it if needed. Must be called with self.lock held.
+
+        Parameters
+        ----------
+        host : str
+            Host name (with port if present)
+
+        Returns
+        -------
+        bucket : dict
+            State of the host's bucket
+        """
+        if host not in self.buckets:
+            self.buckets[host]={'rate':self.rate,'tokens':self.burst,'updated':self.clock(),'paused_until':0.0}
+        return self.buckets[host]
+
+    def acquire(self,url):
+        """
+        A function to wait until a request to the URL's host is allowed and take a token from its bucket
+
+        Parameters
+        ----------
+        url : str
+            URL about to be requested
+
+        Returns
+        -------
+
+        """
+        host=urlsplit(url).netloc
+        while True:
+            with self.lock:
+                bucket=self.getBucket(host)
+                now=self.clock()
+                bucket['tokens']=min(self.burst,bucket['tokens']+(now-bucket['updated'])*bucket['rate']) #Refill the bucket for the time that has passed
+                bucket['updated']=now
+                if now<bucket['paused_until']: #The host asked us to wait (Retry-After)
+                    wait=bucket['paused_until']-now
+                elif bucket['tokens']>=1:
+                    bucket['tokens']-=1
+                    return
+                else:
+                    wait=(1-bucket['tokens'])/bucket['rate']
+            self.sleep(wait) #Sleep outside of the lock so that other hosts are not blocked
+
+    def update(self,url,status_code,headers=None):
+        """
+        A function to adjust the host's rate based on the received response. 429 and 5xx responses multiply the rate by self.decrease and empty the bucket, a Retry-After header pauses the host, other responses add self.increase to the rate.
+
+        Parameters
+        ----------
+        url : str
+            Requested URL
+
+        status_code : int or None
+            Status code of the response (None if the request failed without a response)
+
+        headers : dict or None
+            Headers of the response. Defaults to None
+
+        Returns
+        -------
+
+        """
+        host=urlsplit(url).netloc
+        retry_after=self.parseRetryAfter((headers or {}).get('Retry-After'))
+        with self.lock:
+            bucket=self.getBucket(host)
+            if status_code is None or status_code==429 or status_code>=500:
+                bucket['rate']=max(self.min_rate,bucket['rate']*self.decrease)
+                bucket['tokens']=min(bucket['tokens'],0.0)
+                if retry_after:
+                    bucket['paused_until']=max(bucket['paused_until'],self.clock()+retry_after)
+            else:
+                bucket['rate']=min(self.max_rate,bucket['rate']+self.increase)
+
+    def parseRetryAfter(self,value):
+        """
+        A function to convert a Retry-After header to a number of seconds. The header is either a number of seconds or an HTTP date.
+
+        Parameters
+        ----------
+        value : str or None
+            Value of the Retry-After header
+
+        Returns
+        -------
+        seconds : float or None
+            Number of seconds to wait, None if the header is missing or invalid
+        """
+        if not value:
+            return None
+        try:
+            seconds=max(0.0,float(value))
+        except ValueError:
+            try:
+                seconds=max(0.0,(parsedate_to_datetime(value)-datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                seconds=None
+        return seconds
+
+    def getRate(self,url):
+        """
+        A function to get the current rate of the URL's host
+
+        Parameters
+        ----------
+        url : str
+            Any URL of the host
+
+        Returns
+        -------
+        rate : float
+            Current number of requests per second allowed for the host
+        """
+        with self.lock:
+            rate=self.getBucket(urlsplit(url).netloc)['rate']
+        return rate
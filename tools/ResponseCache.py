@@ -0,0 +1,298 @@
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import requests
+import tempfile
+import hashlib
+import threading
+import json
+import os
+
+class ResponseCache:
+    """
+    A class storing HTTP responses on disk so that they can be revalidated with If-None-Match/If-Modified-Since instead of being downloaded again. Entries are keyed by a hash of the URL and the least recently used ones are evicted once the cache exceeds its size cap.
+
+    ...
+
+    Attributes
+    ----------
+    directory : str
+        Directory containing the cached responses
+
+    max_size : int
+        Maximum total size of the cached bodies in bytes
+
+    entries : collections.OrderedDict
+        Size of each cached body keyed by the entry key, ordered from the least to the most recently used
+
+    size : int
+        Current total size of the cached bodies in bytes
+
+    secret_parameters : set
+        Query parameters whose values are never written to the disk (class attribute)
+
+    Methods
+    -------
+    loadEntries():
+        A function to collect the entries already present in the cache directory
+
+    getKey(url):
+        A function to derive the entry key from a URL
+
+    redactUrl(url):
+        A function to hide the values of secret query parameters
+
+    get(url):
+        A function to read a cached response
+
+    put(url, request):
+        A function to store a response in the cache
+
+    touch(url):
+        A function to mark an entry as recently used
+
+    getConditionalHeaders(entry):
+        A function to build the revalidation headers for a cached entry
+
+    toResponse(entry):
+        A function to convert a cached entry into a requests.Response
+
+    evict():
+        A function to remove the least recently used entries until the cache fits its size cap
+    """
+    secret_parameters={'key','api_key','apikey','access_token','token','client_secret','secret','signature','sig','password'}
+
+    def __init__(self,directory='data/http_cache',max_size=500*1024**2):
+        """
+        Constructs the cache and loads the entries already stored in the directory
+
+        Parameters
+        ----------
+        directory : str
+            Directory containing the cached responses. Defaults to "data/http_cache"
+
+        max_size : int
+            Maximum total size of the cached bodies in bytes. Defaults to 500 MB
+        """
+        self.directory=directory
+        self.max_size=max_size
+        self.lock=threading.Lock()
+        os.makedirs(self.directory,exist_ok=True)
+        self.entries=self.loadEntries()
+        self.size=sum(self.entries.values())
+
+    def loadEntries(self):
+        """
+        A function to collect the entries already present in the cache directory. The modification time of the metadata file is the time of last use. Temporary files left behind by a put() that was interrupted (e.g. by a crash) are removed.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        entries : collections.OrderedDict
+            Size of each cached body keyed by the entry key, ordered from the least to the most recently used
+        """
+        found=[]
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith('.tmp'):
+                try:
+                    os.remove(os.path.join(self.directory,file_name))
+                except OSError:
+                    pass
+            elif file_name.endswith('.json'):
+                key=file_name[:-5]
+                body_path=os.path.join(self.directory,f'{key}.body')
+                if os.path.exists(body_path):
+                    found.append((os.path.getmtime(os.path.join(self.directory,file_name)),key,os.path.getsize(body_path)))
+        found.sort()
+        entries=OrderedDict((key,size) for _, key, size in found)
+        return entries
+
+    def getKey(self,url):
+        """
+        A function to derive the entry key from a URL
+
+        Parameters
+        ----------
+        url : str
+            The requested URL
+
+        Returns
+        -------
+        key : str
+            SHA-256 hash of the URL
+        """
+        key=hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return key
+
+    def redactUrl(self,url):
+        """
+        A function to hide the values of secret query parameters (e.g. the key of the Places API), so that they are not stored in plain text in the metadata files
+
+        Parameters
+        ----------
+        url : str
+            The requested URL
+
+        Returns
+        -------
+        redacted_url : str
+            The URL with the values of the parameters in self.secret_parameters replaced by "REDACTED"
+        """
+        parts=urlsplit(url)
+        query=[(name,'REDACTED' if name.lower() in self.secret_parameters else value) for name, value in parse_qsl(parts.query,keep_blank_values=True)]
+        redacted_url=urlunsplit(parts._replace(query=urlencode(query,safe=':@,'))) if query else url
+        return redacted_url
+
+    def get(self,url):
+        """
+        A function to read a cached response
+
+        Parameters
+        ----------
+        url : str
+            The requested URL
+
+        Returns
+        -------
+        entry : dict or None
+            Metadata of the cached response with its body under "content", or None if the URL is not cached
+        """
+        key=self.getKey(url)
+        with self.lock:
+            if key not in self.entries:
+                return None
+        try:
+            with open(os.path.join(self.directory,f'{key}.json'),encoding='utf-8') as json_file:
+                entry=json.load(json_file)
+            with open(os.path.join(self.directory,f'{key}.body'),'rb') as body_file:
+                entry['content']=body_file.read()
+        except (OSError, ValueError): #The entry was evicted by another thread or is damaged => treat it as missing
+            return None
+        return entry
+
+    def put(self,url,request):
+        """
+        A function to store a response in the cache. Only successful responses with an ETag or a Last-Modified header are stored since the others cannot be revalidated.
+
+        Parameters
+        ----------
+        url : str
+            The requested URL
+
+        request : requests.Response
+            The received response
+
+        Returns
+        -------
+        stored : bool
+            True if the response was stored
+        """
+        etag=request.headers.get('ETag')
+        last_modified=request.headers.get('Last-Modified')
+        if request.status_code!=200 or not (etag or last_modified):
+            return False
+        key=self.getKey(url)
+        entry={'url':self.redactUrl(url),'etag':etag,'last_modified':last_modified,'encoding':request.encoding,'headers':{'Content-Type':request.headers.get('Content-Type','')}} #The key is a hash of the full URL, the secrets are only needed to request it
+        body_path=os.path.join(self.directory,f'{key}.body')
+        meta_path=os.path.join(self.directory,f'{key}.json')
+        with tempfile.NamedTemporaryFile('wb',dir=self.directory,suffix='.tmp',delete=False) as body_file: #Unique temporary files => concurrent writes of the same URL never mix, and a crash never leaves a half-written entry
+            body_file.write(request.content)
+        with tempfile.NamedTemporaryFile('w',encoding='utf-8',dir=self.directory,suffix='.tmp',delete=False) as json_file:
+            json.dump(entry,json_file)
+        with self.lock:
+            os.replace(body_file.name,body_path) #Both files are published together under the lock, the last writer wins
+            os.replace(json_file.name,meta_path)
+            self.size+=len(request.content)-self.entries.pop(key,0)
+            self.entries[key]=len(request.content)
+            self.evict()
+        return True
+
+    def touch(self,url):
+        """
+        A function to mark an entry as recently used
+
+        Parameters
+        ----------
+        url : str
+            The requested URL
+
+        Returns
+        -------
+
+        """
+        key=self.getKey(url)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                try:
+                    os.utime(os.path.join(self.directory,f'{key}.json')) #Persist the order for the next session
+                except OSError:
+                    pass
+
+    def getConditionalHeaders(self,entry):
+        """
+        A function to build the revalidation headers for a cached entry
+
+        Parameters
+        ----------
+        entry : dict
+            Cached entry returned by get()
+
+        Returns
+        -------
+        headers : dict
+            If-None-Match and/or If-Modified-Since headers
+        """
+        headers={}
+        if entry['etag']:
+            headers['If-None-Match']=entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since']=entry['last_modified']
+        return headers
+
+    def toResponse(self,entry):
+        """
+        A function to convert a cached entry into a requests.Response so that the callers can use it like a freshly downloaded one
+
+        Parameters
+        ----------
+        entry : dict
+            Cached entry returned by get()
+
+        Returns
+        -------
+        request : requests.Response
+            Response with status code 200 and the cached body
+        """
+        request=requests.Response()
+        request.status_code=200
+        request.url=entry['url']
+        request._content=entry['content']
+        request.encoding=entry['encoding']
+        request.headers.update(entry['headers'])
+        if entry['etag']:
+            request.headers['ETag']=entry['etag']
+        if entry['last_modified']:
+            request.headers['Last-Modified']=entry['last_modified']
+        return request
+
+    def evict(self):
+        """
+        A function to remove the least recently used entries until the cache fits its size cap. Must be called with self.lock held.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+
+        """
+        while self.size>self.max_size and self.entries:
+            key, size=self.entries.popitem(last=False)
+            self.size-=size
+            for extension in ['body','json']:
+                try:
+                    os.remove(os.path.join(self.directory,f'{key}.{extension}'))
+                except OSError:
+                    pass
@@ -1,5 +1,10 @@
 from audioop import add
 from tkinter.messagebox import NO
+from tools.HttpClient import getDefaultClient
+from tools.PageStrainer import PageStrainer
+from tools.RestaurantRecord import RestaurantRecord
+from tools.DistrictResolver import getDefaultResolver
+from tools.OpeningHours import OpeningHours
 import requests
 from bs4 import BeautifulSoup
 import re
@@ -22,9 +27,6 @@ class Restaurant:
     address : str or None
         The address of the restaurant
     
-    dist_dict : dict
-        Mapping dictionary for districts
-
     district : str or None
         Restaurant's district
 
@@ -64,10 +66,31 @@ class Restaurant:
     coordinates : dict or None
             Dictionary of coordinates (latitude and longitude)
 
+    link : str
+        Link to the restaurant's page on www.zlatestranky.cz
+
+    client : HttpClient
+        Client used to request the restaurant's page
+
+    parser : str
+        Beautiful Soup tree builder used to parse the page
+
+    partial : bool
+        Whether only the parts of the page read by the extractors were parsed
+
+    nodes : dict
+        Nodes of each field found by collectNodes (field as key, list of nodes as value)
+
     Methods
     -------
-    getSoup():
+    fromHTML(content, link, parser='html.parser', partial=False):
+        A function to create a Restaurant object from an already downloaded page without sending any request
+
+    getSoup(link):
         A function to send a request and convert it into a Beautiful Soup object
+
+    makeSoup(content):
+        A function to convert the page's HTML into a Beautiful Soup object using self.parser (and self.partial_queries if self.partial is True)
     
     getName(soup):
         A function to retrieve the name of the restaurant
@@ -76,7 +99,7 @@ class Restaurant:
         A function to retrieve the address of the restaurant
 
     getMappingDictionary():
-        A function to load the prepared dictionary with municipal districts as keys and their respective administrative districts and cadastral areas as values
+        A function to get the prepared dictionary with municipal districts as keys and their respective administrative districts and cadastral areas as values. The file is read once per process by the shared DistrictResolver (and again after it is regenerated).
 
     mappingDistrict(address):
         A function to map administrative districts or cadastral areas to their municipal district based on a whole address. If the district cannot be mapped, it is derived from the zip code.
@@ -114,16 +137,67 @@ class Restaurant:
     getPaymentMethods(soup)
         A function to retrive payment methods available in a restaurant
 
+    getSectionList(heading)
+        A function to find the list of the section introduced by a heading
+
     getServicesMarksProducts(soup)
         This function extracts all children of the "Produkty+Služby+Značky" panel and puts them to one list
 
+    splitServicesMarksProducts(soup)
+        A function to split the list created by getServicesMarksProducts() into the three categories 'Produkty', 'Služby' and 'Značky' in a single pass
+
     getServicesSeparator(category)
         A function that accepts one of the three categories: 'Produkty', 'Služby', 'Značky', and picks the items from the list created by getServicesMarksProducts() between the specified category and the next one.
 
     getCoordinates(soup)
         A function to retrive coordinates of a restaurant    
+
+    toRecord()
+        A function to return the extracted attributes as a dictionary
+
+    releaseSoup()
+        A function to free the parsed page once the attributes are extracted
+
+    collectNodes(soup)
+        A function to find the nodes of all fields in a single walk through the page
+
+    matchesQuery(tag, query)
+        A function to check whether a tag is the node described by a query
+
+    findNode(soup, field)
+        A function to get the first node of a field
+
+    findAllNodes(soup, field)
+        A function to get all nodes of a field
     """
-    def __init__(self,link):
+    node_queries={ #Nodes read by the extractors: field as key, (tag name, attributes, text) as value
+        'name':('h1',{'itemprop':'name'},None),
+        'address':('span',{'itemprop':'description'},None),
+        'ratings':('span',{'itemprop':'ratingValue'},None),
+        'review_count':('span',{'itemprop':'reviewCount'},None),
+        'opening_hours':('table',{'class':'table table-condensed'},None),
+        'email_address':('a',{'data-ta':'EmailClick'},None),
+        'phones':('td',{'itemprop':'telephone'},None),
+        'web_page':('a',{'data-ta':'LinkClick'},None),
+        'payment_methods':('h2',{},'Platební metody'),
+        'services_marks_products':('div',{'class':'col-sm-12 tagcloud'},None),
+        'coordinates':('div',{'class':'map'},None)
+    }
+    partial_queries=[ #Roots of the subtrees kept when parsing partially: whole tables (opening hours, phones and their labels), the headings followed by the list of payment methods and the nodes of node_queries
+        ('h1',{'itemprop':'name'}),
+        ('span',{'itemprop':'description'}),
+        ('span',{'itemprop':'ratingValue'}),
+        ('span',{'itemprop':'reviewCount'}),
+        ('table',{}),
+        ('a',{'data-ta':'EmailClick'}),
+        ('a',{'data-ta':'LinkClick'}),
+        ('h2',{}),
+        ('ul',{'class':'list-inline'}),
+        ('div',{'class':'col-sm-12 tagcloud'}),
+        ('div',{'class':'map'})
+    ]
+
+    def __init__(self,link,client=None,content=None,parser='html.parser',partial=False):
         """
         Constructs all the necessary attributes for the restaurant.
 
@@ -131,11 +205,29 @@ class Restaurant:
         ----------
         link : str
             link to the restaurants page
+
+        client : HttpClient or None
+            Client used to request the page. Defaults to the shared client from tools.HttpClient
+
+        content : bytes, str or None
+            HTML of the restaurant's page. If given, the page is parsed without sending any request. Defaults to None
+
+        parser : str
+            Beautiful Soup tree builder used to parse the page: "html.parser" (built in), "lxml" (much faster, requires the lxml package) or "html5lib". Defaults to "html.parser"
+
+        partial : bool
+            If True, only the parts of the page read by the extractors (self.partial_queries) are parsed, which is faster and needs less memory. Defaults to False
         """
-        self.soup=self.getSoup(link)
+        self.client=client
+        self.parser=parser
+        self.partial=partial
+        if content is None:
+            self.soup=self.getSoup(link)
+        else:
+            self.soup=self.makeSoup(content)
+        self.nodes=self.collectNodes(self.soup) #One walk through the page instead of a full search per field
         self.name=self.getName(self.soup)
         self.address=self.getAddress(self.soup)
-        self.dist_dict=self.getMappingDictionary()
         self.district=self.getDistrict(self.address)
         self.ratings=self.getRatings(self.soup)
         self.review_count=self.getReviewCount(self.soup)
@@ -145,11 +237,40 @@ class Restaurant:
         self.phones=self.getPhone(self.soup)
         self.web_page=self.getWebPage(self.soup)
         self.payment_methods=self.getPaymentMethods(self.soup)
-        self.products=self.getServicesSeparator('Produkty')
-        self.services=self.getServicesSeparator('Služby')
-        self.marks=self.getServicesSeparator('Značky')
+        categories=self.splitServicesMarksProducts(self.soup) #One scan of the panel for all three categories
+        self.products=categories['Produkty']
+        self.services=categories['Služby']
+        self.marks=categories['Značky']
         self.coordinates=self.getCoordinates(self.soup)
+        self.link=link
     
+    @classmethod
+    def fromHTML(cls,content,link,parser='html.parser',partial=False):
+        """
+        A function to create a Restaurant object from an already downloaded page without sending any request
+
+        Parameters
+        ----------
+        content : bytes or str
+            HTML of the restaurant's page
+
+        link : str
+            link to the restaurants page (saved as the link attribute)
+
+        parser : str
+            Beautiful Soup tree builder used to parse the page. Defaults to "html.parser"
+
+        partial : bool
+            If True, only the parts of the page read by the extractors are parsed. Defaults to False
+
+        Returns
+        -------
+        restaurant : Restaurant
+            Restaurant object created from the page
+        """
+        restaurant=cls(link,content=content,parser=parser,partial=partial)
+        return restaurant
+
     def getSoup(self,link):
         """
         A function to send a request and convert it into a Beautiful Soup object
@@ -164,11 +285,32 @@ class Restaurant:
         soup : A Beautiful Soup object
             A Beatiful Soup object created from the request sent to the restaurants page
         """
-        request=requests.get(link)
+        client=self.client or getDefaultClient()
+        request=client.get(link)
         if request.status_code==200:
-            soup=BeautifulSoup(request.content,'html.parser')
+            soup=self.makeSoup(request.content)
+        else:
+            raise requests.HTTPError(f'Unsuccessful request ({request.status_code}) for {link}',response=request)
+        return soup
+
+    def makeSoup(self,content):
+        """
+        A function to convert the page's HTML into a Beautiful Soup object using self.parser
+
+        Parameters
+        ----------
+        content : bytes or str
+            HTML of the restaurant's page
+
+        Returns
+        -------
+        soup : A Beautiful Soup object
+            A Beatiful Soup object created from the page
+        """
+        if self.partial:
+            soup=BeautifulSoup(content,self.parser,parse_only=PageStrainer(self.partial_queries))
         else:
-            print('Unsuccessful request')
+            soup=BeautifulSoup(content,self.parser)
         return soup
 
     def getName(self,soup):
@@ -185,10 +327,11 @@ class Restaurant:
         restaurant_name : str or None
             The name of the restaurant
         """
-        if soup.find('h1',{'itemprop':'name'}) == None:
+        node=self.findNode(soup,'name')
+        if node == None:
             restaurant_name = None   
         else:
-            restaurant_name=soup.find('h1',{'itemprop':'name'}).text
+            restaurant_name=node.text
         return restaurant_name
 
     def getAddress(self,soup):
@@ -205,10 +348,11 @@ class Restaurant:
         address : str or None
             The addres of the restaurant
         """
-        if soup.find('span',{'itemprop':'description'}) == None:
+        node=self.findNode(soup,'address')
+        if node == None:
             address = None
         else:
-            address_full=soup.find('span',{'itemprop':'description'}).text
+            address_full=node.text
             address = re.search('.+?(?=okres)',address_full).group(0)
         return address
 
@@ -224,8 +368,7 @@ class Restaurant:
         dist_dict : dict
             Mapping dictionary for districts
         """
-        with open('data\\dist_dict.json') as json_file:
-            dist_dict = json.load(json_file)
+        dist_dict = getDefaultResolver().dist_dict
         return dist_dict
 
     def mappingDistrict(self, address):
@@ -242,28 +385,8 @@ class Restaurant:
         district : str
             District based on the given address
         """
-        indic=False
-        for key in self.dist_dict: #For each munipal district
-            for value in self.dist_dict[key]: #Take each administartive district/cadastral area a look for them in the address string
-                if value in address: #If found, save it and break the loop
-                    district=key
-                    indic=True #Tool to break the outside loop as well
-                    break
-            if indic: #break the outside loop if the district has been found
-                break
-        try:
-            return district
-        except UnboundLocalError: #In case the district is still not found (district variable has not been generated), try to get it from the zip code
-            try:
-                zip_code=re.search('[0-9]{3} [0-9]{2}',address).group(0) #Extract the zip code from the address
-                if zip_code[1]=='0': #Special case for Praha 10
-                    value='10'
-                else:
-                    value=zip_code[1]
-                district='Praha '+value
-                return district
-            except AttributeError: #If the zip code is not in the address, return "Not found"
-                return 'Not found'
+        district=getDefaultResolver().mappingDistrict(address)
+        return district
 
     def getDistrictFromPraha_XX(self, praha_xx):
         """
@@ -279,13 +402,7 @@ class Restaurant:
         district : str
             Municipal district derived from the input
         """
-        if praha_xx in self.dist_dict.keys(): #In case the municipal district (Praha 1-10) was already extracted, return it
-            district=praha_xx
-        else: #If not, search through the mapping dictionary
-            for key in self.dist_dict:
-                if praha_xx in self.dist_dict[key]:
-                    district=key
-                    break
+        district=getDefaultResolver().getDistrictFromPraha_XX(praha_xx)
         return district
 
     def getDistrict(self,address):
@@ -302,17 +419,7 @@ class Restaurant:
         district : str or None
             The restaurant's municipal district
         """
-        if address == None:
-            district = None
-        else:
-            search_dist=re.search('Praha [0-9]{1,2}',address) #Firstly, try to find a Praha xx
-            if search_dist: #If found, map it to the municipal district
-                if search_dist.group(0)=='Praha 31': #Very special case of one restaurant with Praha 310 in the beginning of the address => resolved by brute force
-                    district='Praha 1'
-                else:
-                    district=self.getDistrictFromPraha_XX(search_dist.group(0)) #Find district based on Praha XX
-            else: #If not found, feed the whole address to the mapping function
-                district=self.mappingDistrict(address)
+        district=getDefaultResolver().resolve(address) #Shared by all restaurants of the process, see DistrictResolver
         return district
             #value=re.search('Praha[ ]{0,1}[0-9]{0,2}',address).group(0).strip()
             #if value=='Praha':
@@ -338,10 +445,11 @@ class Restaurant:
         ratings : float or None
             The restaurant's average ratings
         """
-        if soup.find('span',{'itemprop':'ratingValue'}) == None:
+        node=self.findNode(soup,'ratings')
+        if node == None:
             ratings = None
         else:
-            ratings=float(soup.find('span',{'itemprop':'ratingValue'}).text)
+            ratings=float(node.text)
         return ratings
 
     def getReviewCount(self,soup):
@@ -358,10 +466,11 @@ class Restaurant:
         review_count : int or None
             The number of reviews
         """
-        if soup.find('span',{'itemprop':'reviewCount'}) == None:
+        node=self.findNode(soup,'review_count')
+        if node == None:
             review_count = None
         else:
-            review_count=int(soup.find('span',{'itemprop':'reviewCount'}).text)
+            review_count=int(node.text)
         return review_count
 
     def getOpeningHours(self,soup):
@@ -378,13 +487,14 @@ class Restaurant:
         dict : dict or None
             A dictionary containing the opening hours for each day of the week
         """
-        if soup.find('table',{'class':'table table-condensed'}) == None:
+        node=self.findNode(soup,'opening_hours')
+        if node == None:
             dict = None
         #elif self.name == 'Restaurace HOOTERS Vodičkova': #this elif is only temporary solution..to be removed
         #    dict = {'Po': '11 - 23', 'Út': '11 - 23', 'St': '11 - 23', 'Čt': '11 - 01', 'Pá': '11 - 01', 'So': '11 - 01', 'Ne': '11 - 23'}
         #    return dict
         else:
-            table=soup.find('table',{'class':'table table-condensed'}).find_all('td')
+            table=node.find_all('td')
             table_text=[]
             for i in table:
                 if re.match('Dnes|\n',i.text):
@@ -400,24 +510,20 @@ class Restaurant:
             #    dict[table_text[i]]=table_text[i+1]
             #return dict
 
-            week_days = ['Po', 'Út', 'St', 'Čt', 'Pá', 'So', 'Ne']
+            week_days = OpeningHours.week_days
             dict = {'Po':None, 'Út':None, 'St':None, 'Čt':None, 'Pá':None, 'So':None, 'Ne':None}
-            for i in table_text:
+            day = None #Week day whose cells are being read
+            for i in table_text: #Single pass: the cells after a week day (up to the next one) are its time ranges
                 if i in week_days:
-                    if table_text.index(i)+3 < len(table_text):
-                        if table_text[table_text.index(i)+2] in week_days:
-                            dict[i]=table_text[table_text.index(i)+1]
-                        elif table_text[table_text.index(i)+3] in week_days:
-                            dict[i]=[table_text[table_text.index(i)+1], table_text[table_text.index(i)+2]]
-                        else:
-                            raise IndexError('Unexpected number of cells in the Opening hours table :(')
+                    day = i
+                    dict[day] = None
+                elif day != None and i != None:
+                    if dict[day] == None:
+                        dict[day] = i
+                    elif type(dict[day]) == list:
+                        dict[day].append(i)
                     else:
-                        if len(table_text)-table_text.index(i) == 2:
-                            dict[i]=table_text[table_text.index(i)+1]
-                        elif len(table_text)-table_text.index(i) == 3:
-                            dict[i]=[table_text[table_text.index(i)+1], table_text[table_text.index(i)+2]]
-                else:
-                    pass
+                        dict[day] = [dict[day], i]
 
         return dict
 
@@ -438,15 +544,8 @@ class Restaurant:
         if time_range == None:
             span=None
         else:
-            hours=[time_range.split()[i] for i in [0,2]] #splitting by space and disregarding "-"
-            start_end=[] #empty list for converted starting and ending values
-            for i in hours:
-                if re.search(':',i): #if the string is not a whole hour, convert it
-                    splits=i.split(':')
-                    start_end.append(float(splits[0])+float(splits[1])/60)
-                else:
-                    start_end.append(float(i))
-            span=round(start_end[1] - start_end[0],2)
+            day, start, end = OpeningHours.parseRange(0,time_range) #a range ending before it starts continues past midnight
+            span=round((end-start)/60,2)
         return span
 
     def openingHoursToSpan(self,opening_hours):
@@ -466,28 +565,9 @@ class Restaurant:
         if opening_hours == None:
             span_dict = None
         else:
-            span_dict = {'Po':None, 'Út':None, 'St':None, 'Čt':None, 'Pá':None, 'So':None, 'Ne':None}
-            week_days = ['Po', 'Út', 'St', 'Čt', 'Pá', 'So', 'Ne']
-            for i in week_days:
-                if opening_hours[i] == None:
-                    span_dict[i] = None
-                elif type(opening_hours[i]) == list:
-                    multiple_spans = []
-                    for n in opening_hours[i]:
-                        multiple_spans.append(self.rangeToNumber(n))
-                    
-                    span_dict[i] = sum(multiple_spans) 
-                else:    
-                    span_dict[i]=self.rangeToNumber(opening_hours[i])
-
-        return span_dict        
-
-        #if opening_hours == None:
-        #    span_dict = None
-        #    return span_dict
-        #else:
-        #    span_dict={key:self.rangeToNumber(value) for (key,value) in opening_hours.items()}
-        #    return span_dict
+            span_dict = OpeningHours.fromDict(opening_hours).getDaySpans() #Ranges past midnight count to the day they are listed under
+
+        return span_dict
 
     def getEmail(self,soup):
         """
@@ -503,10 +583,11 @@ class Restaurant:
         email_address : str or None
             The restaurant's email address
         """
-        if soup.find('a', {'data-ta':'EmailClick'}) == None:
+        node=self.findNode(soup,'email_address')
+        if node == None:
             email_address=None
         else:
-            email_address=soup.find('a', {'data-ta':'EmailClick'}).text
+            email_address=node.text
         return email_address
 
 
@@ -524,20 +605,17 @@ class Restaurant:
         phones : dict or None
             Phone nubers and their labels in a dictionary
         """
-        if soup.find('td', {'itemprop':'telephone'}) == None:
+        all_telephones = self.findAllNodes(soup,'phones')
+        if not all_telephones:
             phones = None
         else:
             telephone_numbers = []
             telephone_names = []
 
-            #extracting telephone numbers:
-            all_telephones = soup.find_all('td', {'itemprop':'telephone'})
+            #extracting telephone numbers and their names (the name is in the next cell of the same row):
             for i in all_telephones:
                 telephone_numbers.append(i.text)
-
-            #extracting telephone names:
-            for i in telephone_numbers:
-                telephone_names.append(soup.find('td', text=i).find_next_sibling('td').text)
+                telephone_names.append(i.find_next_sibling('td').text)
 
             phones = {telephone_names[i]: telephone_numbers[i] for i in range(len(telephone_numbers))}
         return phones
@@ -556,10 +634,11 @@ class Restaurant:
         web_page : str or None
             Link for restaurant's own web page
         '''
-        if soup.find('a', {'data-ta':'LinkClick'}) == None:
+        node=self.findNode(soup,'web_page')
+        if node == None:
             web_page = None
         else:
-            web_page = soup.find('a', {'data-ta':'LinkClick'})['href']
+            web_page = node['href']
         return web_page
 
     def getPaymentMethods(self,soup):
@@ -576,16 +655,41 @@ class Restaurant:
         payment_methods : list or None
             List of available payment methods
         '''
-        if soup.find('h2', text='Platební metody') == None:
+        node=self.findNode(soup,'payment_methods')
+        payment_list=self.getSectionList(node) if node != None else None
+        if payment_list == None: #No heading, or a heading without a list
             payment_methods = None
         else:
-            payment_methods_raw = soup.find('h2', text='Platební metody').find_next_sibling('ul', {'class':'list-inline'}).find_all('li') #finding list of payment methods (wraped in <li><\li>)
+            payment_methods_raw = payment_list.find_all('li') #finding list of payment methods (wraped in <li><\li>)
             payment_methods = [] #empty list to be used in the next for loop
 
             for i in payment_methods_raw: #unwraping the <li>
                 payment_methods.append(i.text)
         return payment_methods #list containing strings, representing individual payment methods
 
+    def getSectionList(self,heading):
+        '''
+        A function to find the list (<ul class="list-inline">) of the section introduced by a heading. Only the siblings up to the next heading belong to the section. In a partially parsed page the kept subtrees of all sections are siblings, so there the list has to follow the heading directly.
+
+        Parameters
+        ----------
+        heading : A Beautiful Soup Tag
+            Heading of the section, e.g. the "Platební metody" heading
+
+        Returns
+        -------
+        section_list : A Beautiful Soup Tag or None
+            The list of the section, None if the section has no list
+        '''
+        section_list = None
+        for sibling in heading.find_next_siblings(True):
+            if sibling.name == 'ul' and 'list-inline' in (sibling.get('class') or []):
+                section_list = sibling
+                break
+            if self.partial or re.fullmatch('h[1-6]',sibling.name): #Another kept subtree or the next section
+                break
+        return section_list
+
     def getServicesMarksProducts(self,soup):
         '''
         This function extracts all children of the "Produkty+Služby+Značky" panel and puts them to one list. This list is then used in the getServicesSeparator(). The function is not ment to be used on its own.
@@ -600,10 +704,11 @@ class Restaurant:
         ServicesMarksProducts : list or None
             List containing all children of the "Produkty+Služby+Značky" panel
         '''
-        if soup.find('div', {'class':'col-sm-12 tagcloud'}) == None:
+        node=self.findNode(soup,'services_marks_products')
+        if node == None:
             ServicesMarksProducts = None
         else:
-            ServicesMarksProducts_raw = soup.find('div', {'class':'col-sm-12 tagcloud'}).find_all() #finding all children of the panel "Produkty+Služby+Značky"
+            ServicesMarksProducts_raw = node.find_all() #finding all children of the panel "Produkty+Služby+Značky"
             ServicesMarksProducts = []
 
             for i in ServicesMarksProducts_raw:
@@ -611,9 +716,34 @@ class Restaurant:
         return ServicesMarksProducts
 
 
+    def splitServicesMarksProducts(self,soup):
+        '''
+        A function to split the list created by getServicesMarksProducts() into the categories 'Produkty', 'Služby' and 'Značky' in a single pass. The items of a category are the ones between its first occurrence and the first occurrence of the next category.
+
+        Parameters
+        ----------
+        soup : A Beautiful Soup object
+            A Beatiful Soup object created from the request sent to the restaurants page
+
+        Returns
+        -------
+        categories : dict
+            Category as key, list of its items (or None if the restaurant does not have the category) as value
+        '''
+        categories={category:None for category in ['Produkty', 'Služby', 'Značky']} #<-- in case of more categories, add here!
+        ServicesMarksProducts = self.getServicesMarksProducts(soup)
+        if ServicesMarksProducts != None:
+            items = None #Items before the first category are not part of any category
+            for text in ServicesMarksProducts:
+                if text in categories and categories[text] is None: #First occurrence of a category starts its list
+                    items = categories[text] = []
+                elif items is not None:
+                    items.append(text)
+        return categories
+
     def getServicesSeparator(self, category):
         '''
-        A function that accepts one of the three categories: 'Produkty', 'Služby', 'Značky', and picks the items from the list created by getServicesMarksProducts() between the specified category and the next one.
+        A function that accepts one of the three categories: 'Produkty', 'Služby', 'Značky', and picks the items from the list created by getServicesMarksProducts() between the specified category and the next one. Use splitServicesMarksProducts() to get all categories at once.
         
         Parameters
         ----------
@@ -625,29 +755,7 @@ class Restaurant:
         items : list or None
             List containing items in the specified category
         '''
-        ServicesMarksProducts = self.getServicesMarksProducts(self.soup)
-        if ServicesMarksProducts == None:
-             items = None
-        else:
-            try:
-                ##defining the helper list of positions of categories
-                services_index_list = []
-
-                for i in ['Produkty', 'Služby', 'Značky']: #<-- in case of more categories, add here! (and also in the __init__)
-                    if i in ServicesMarksProducts:
-                        services_index_list.append(ServicesMarksProducts.index(i))   
-
-                services_index_list.sort()
-
-                ##selecting particular items
-                if ServicesMarksProducts.index(category) == max(services_index_list):
-                    items = ServicesMarksProducts[ServicesMarksProducts.index(category)+1:] #case when the given category is last in the ServicesMarksProducts list
-                else:
-                    items = ServicesMarksProducts[ServicesMarksProducts.index(category)+1:services_index_list[services_index_list.index(ServicesMarksProducts.index(category))+1]]
-                    #when the given category is not last, subset the part of ServicesMarksProducts list between the given category and the next category
-            
-            except ValueError: #In case that retaurant does not have given category specified, None will return
-                items = None
+        items = self.splitServicesMarksProducts(self.soup)[category]
         return items
 
     def getCoordinates(self,soup):
@@ -664,11 +772,141 @@ class Restaurant:
         coordinates : dict or None
             Dictionary of coordinates (latitude and longitude)
         '''
-        div_coordinates=soup.find('div',{'class':'map'})
+        div_coordinates=self.findNode(soup,'coordinates')
         if div_coordinates == None:
             coordinates = None
         else: 
             coordinates={}
             coordinates['latitude']=json.loads(div_coordinates['data-centerpoi'])['lat']
             coordinates['longitude']=json.loads(div_coordinates['data-centerpoi'])['lng']
-        return coordinates
\ No newline at end of file
+        return coordinates
+
+    def toRecord(self):
+        '''
+        A function to return the extracted attributes (RestaurantRecord.fields) as a dictionary
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        record : dict
+            Dictionary with the attribute names as keys
+        '''
+        record={field:getattr(self,field) for field in RestaurantRecord.fields}
+        return record
+
+    def releaseSoup(self):
+        '''
+        A function to free the parsed page once the attributes are extracted. The tree is decomposed because its nodes reference each other, so it would otherwise stay in memory until the garbage collector runs.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+
+        '''
+        if getattr(self,'soup',None) is not None:
+            self.soup.decompose()
+        self.soup=None
+        self.nodes=None
+
+    def collectNodes(self,soup):
+        '''
+        A function to find the nodes of all fields in self.node_queries in a single walk through the page, so that the extractors do not search the whole page again and again
+
+        Parameters
+        ----------
+        soup : A Beautiful Soup object
+            A Beatiful Soup object created from the request sent to the restaurants page
+
+        Returns
+        -------
+        nodes : dict
+            Field as key, list of matching nodes in the order of the page as value
+        '''
+        queries_by_tag={} #Tag name as key, list of fields as value => each tag is checked only against the queries for its name
+        for field, query in self.node_queries.items():
+            queries_by_tag.setdefault(query[0],[]).append(field)
+        nodes={field:[] for field in self.node_queries}
+        for tag in soup.find_all(True): #All tags of the page in document order
+            for field in queries_by_tag.get(tag.name,[]):
+                if self.matchesQuery(tag,self.node_queries[field]):
+                    nodes[field].append(tag)
+        return nodes
+
+    def matchesQuery(self,tag,query):
+        '''
+        A function to check whether a tag is the node described by a query. Attributes are compared the way soup.find does it, i.e. a class matches either the whole class attribute or one of its classes.
+
+        Parameters
+        ----------
+        tag : A Beautiful Soup Tag
+            Tag to check
+
+        query : tuple
+            Tag name, dictionary of attributes and the text of the tag (or None)
+
+        Returns
+        -------
+        matches : bool
+            True if the tag matches the query
+        '''
+        name, attributes, text = query
+        for attribute, value in attributes.items():
+            if attribute == 'class':
+                classes=tag.get('class') or []
+                if value != ' '.join(classes) and value not in classes:
+                    return False
+            elif tag.get(attribute) != value:
+                return False
+        matches = text is None or tag.string == text
+        return matches
+
+    def findNode(self,soup,field):
+        '''
+        A function to get the first node of a field. The nodes collected by collectNodes are used for the restaurant's own soup, any other soup is searched directly.
+
+        Parameters
+        ----------
+        soup : A Beautiful Soup object
+            A Beatiful Soup object created from the request sent to the restaurants page
+
+        field : str
+            One of the keys of self.node_queries
+
+        Returns
+        -------
+        node : A Beautiful Soup Tag or None
+            The first matching node, None if there is none
+        '''
+        nodes=self.findAllNodes(soup,field)
+        node=nodes[0] if nodes else None
+        return node
+
+    def findAllNodes(self,soup,field):
+        '''
+        A function to get all nodes of a field. The nodes collected by collectNodes are used for the restaurant's own soup, any other soup is searched directly.
+
+        Parameters
+        ----------
+        soup : A Beautiful Soup object
+            A Beatiful Soup object created from the request sent to the restaurants page
+
+        field : str
+            One of the keys of self.node_queries
+
+        Returns
+        -------
+        nodes : list
+            All matching nodes in the order of the page
+        '''
+        if soup is getattr(self,'soup',None) and getattr(self,'nodes',None) is not None:
+            return self.nodes[field]
+        name, attributes, text = self.node_queries[field]
+        if text is None:
+            nodes=soup.find_all(name,attributes)
+        else:
+            nodes=soup.find_all(name,attributes,string=text)
+        return nodes
@@ -0,0 +1,481 @@
+from tools.ColumnRangeIndex import ColumnRangeIndex
+import numpy as np
+
+class RestaurantQuery:
+    """
+    A class building a query over the processed data set of a DataInterpreter step by step, e.g. di.query().district('Praha 2').minRating(80).has('Wi-Fi').openAt('Fri 23:00').top(20,by='review_count'). Nothing is filtered while the query is built: every call returns a new query with one more step in its plan. When the query is run, the predicates are ordered by the number of rows they match (taken from the indexes of the DataInterpreter), the most selective one provides the candidate rows, the other ones only check these candidates, and the data set is sliced once at the end.
+
+    ...
+
+    Attributes
+    ----------
+    interpreter : DataInterpreter
+        The DataInterpreter whose data set and indexes are queried
+
+    predicates : list
+        Filters of the query as (kind, argument, description) tuples
+
+    order : tuple or None
+        (column, ascending) to sort the results by, None to keep the order of the data set
+
+    start : int
+        Number of matching rows skipped (offset)
+
+    stop : int or None
+        Maximum number of rows returned (limit), None for all of them
+
+    columns : list or None
+        Columns returned, None for all of them
+
+    Methods
+    -------
+    copy(**changes):
+        A function to get a copy of the query with some attributes changed
+
+    district(district):
+        A function to keep only the restaurants in a municipal district
+
+    range(column, low=None, high=None):
+        A function to keep only the restaurants with a value of a numeric column within inclusive bounds
+
+    minRating(rating), maxRating(rating), minReviews(review_count), minWeeklyOpeningDuration(hours):
+        Shortcuts of range for the most common bounds
+
+    has(keyword):
+        A function to keep only the restaurants matching a keyword query
+
+    openAt(moment):
+        A function to keep only the restaurants open at a given time of the week
+
+    orderBy(column, ascending=True):
+        A function to sort the results by a column
+
+    top(n, by='ratings'):
+        A function to get the n restaurants with the highest values of a column
+
+    offset(n), limit(n):
+        Functions to page through the results
+
+    select(columns):
+        A function to choose the columns returned
+
+    getPlan():
+        A function to order the predicates by the number of rows they match
+
+    explain():
+        A function to get the predicates in the order they are evaluated with their number of matching rows
+
+    getRows():
+        A function to run the query and get the positions of the resulting rows
+
+    count():
+        A function to get the number of matching restaurants without building a data frame
+
+    run():
+        A function to run the query and get the resulting rows of the data set
+    """
+    def __init__(self,interpreter):
+        """
+        Constructs an empty query (matching the whole data set)
+
+        Parameters
+        ----------
+        interpreter : DataInterpreter
+            The DataInterpreter whose data set and indexes are queried
+        """
+        self.interpreter=interpreter
+        self.predicates=[]
+        self.order=None
+        self.start=0
+        self.stop=None
+        self.columns=None
+
+    def copy(self,**changes):
+        """
+        A function to get a copy of the query with some attributes changed, so that a query can be reused as the base of several other ones
+
+        Parameters
+        ----------
+        **changes :
+            Attributes of the copy
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The new query
+        """
+        query=RestaurantQuery(self.interpreter)
+        query.predicates=list(self.predicates)
+        query.order, query.start, query.stop, query.columns = self.order, self.start, self.stop, self.columns
+        for attribute, value in changes.items():
+            setattr(query,attribute,value)
+        return query
+
+    def district(self,district):
+        """
+        A function to keep only the restaurants in a municipal district
+
+        Parameters
+        ----------
+        district : str
+            Prague municipal district (Praha 1-10)
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The query with the filter added
+        """
+        return self.copy(predicates=self.predicates+[('district',district,f'district == {district!r}')])
+
+    def range(self,column,low=None,high=None):
+        """
+        A function to keep only the restaurants with a value of a numeric column within inclusive bounds
+
+        Parameters
+        ----------
+        column : str
+            One of "ratings", "review_count" and "weekly_opening_duration"
+
+        low : int, float or None
+            Lower bound, None for no lower bound. Defaults to None
+
+        high : int, float or None
+            Upper bound, None for no upper bound. Defaults to None
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The query with the filter added
+        """
+        if column not in self.interpreter.range_index.columns:
+            raise ValueError(f'{column} is not indexed. Please specify one of the following columns: {self.interpreter.range_index.columns}')
+        low, high = ColumnRangeIndex.parseBounds((low,high))
+        return self.copy(predicates=self.predicates+[('range',(column,low,high),f'{low if low is not None else "-inf"} <= {column} <= {high if high is not None else "inf"}')])
+
+    def minRating(self,rating):
+        """
+        A shortcut of range('ratings',low=rating)
+
+        Parameters
+        ----------
+        rating : int or float
+            Lower bound for the ratings
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The query with the filter added
+        """
+        return self.range('ratings',low=rating)
+
+    def maxRating(self,rating):
+        """
+        A shortcut of range('ratings',high=rating)
+
+        Parameters
+        ----------
+        rating : int or float
+            Upper bound for the ratings
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The query with the filter added
+        """
+        return self.range('ratings',high=rating)
+
+    def minReviews(self,review_count):
+        """
+        A shortcut of range('review_count',low=review_count)
+
+        Parameters
+        ----------
+        review_count : int or float
+            Lower bound for the number of reviews
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The query with the filter added
+        """
+        return self.range('review_count',low=review_count)
+
+    def minWeeklyOpeningDuration(self,hours):
+        """
+        A shortcut of range('weekly_opening_duration',low=hours)
+
+        Parameters
+        ----------
+        hours : int or float
+            Lower bound for the weekly opening hours duration
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The query with the filter added
+        """
+        return self.range('weekly_opening_duration',low=hours)
+
+    def has(self,keyword):
+        """
+        A function to keep only the restaurants whose payment methods, products, services or marks match a keyword query. Several calls must all match.
+
+        Parameters
+        ----------
+        keyword : str or list
+            Keyword query, e.g. 'Wi-Fi', 'visa OR mastercard' or 'pizz*' (see KeywordIndex.parseQuery)
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The query with the filter added
+        """
+        self.interpreter.keyword_index.parseQuery(keyword) #Raises a ValueError for an invalid query right away
+        return self.copy(predicates=self.predicates+[('keyword',keyword,f'has {keyword!r}')])
+
+    def openAt(self,moment):
+        """
+        A function to keep only the restaurants open at a given time of the week
+
+        Parameters
+        ----------
+        moment : str, tuple or datetime.datetime
+            A week day followed by a time, e.g. 'Pá 23:30' or 'Fri 23:00', or a datetime (see OpenAtIndex.parseMoment)
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The query with the filter added
+        """
+        minute=self.interpreter.open_at_index.parseMoment(moment)
+        return self.copy(predicates=self.predicates+[('open_at',minute,f'open at {moment}')])
+
+    def orderBy(self,column,ascending=True):
+        """
+        A function to sort the results by a column. Missing values come last, rows with the same value keep the order of the data set.
+
+        Parameters
+        ----------
+        column : str
+            Column of the data set
+
+        ascending : bool
+            Sort from the lowest to the highest value. Defaults to True
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The sorted query
+        """
+        if column not in self.interpreter.dataset.columns:
+            raise ValueError(f'{column} is not a column of the data set')
+        return self.copy(order=(column,ascending))
+
+    def top(self,n,by='ratings'):
+        """
+        A function to get the n restaurants with the highest values of a column
+
+        Parameters
+        ----------
+        n : int
+            Number of restaurants
+
+        by : str
+            Column to rank the restaurants by. Defaults to "ratings"
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The query sorted in descending order and limited to n rows
+        """
+        return self.orderBy(by,ascending=False).limit(n)
+
+    def offset(self,n):
+        """
+        A function to skip the first n matching rows
+
+        Parameters
+        ----------
+        n : int
+            Number of rows to skip
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The query with the offset
+        """
+        try:
+            n=int(n)
+        except (ValueError,TypeError):
+            raise ValueError('Please specify the offset as an integer')
+        if n<0:
+            raise ValueError('Please specify a non-negative offset')
+        return self.copy(start=n)
+
+    def limit(self,n):
+        """
+        A function to return at most n rows
+
+        Parameters
+        ----------
+        n : int or None
+            Maximum number of rows, None for all of them
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The query with the limit
+        """
+        if n is not None:
+            try:
+                n=int(n)
+            except (ValueError,TypeError):
+                raise ValueError('Please specify the limit as an integer')
+            if n<0:
+                raise ValueError('Please specify a non-negative limit')
+        return self.copy(stop=n)
+
+    def select(self,columns):
+        """
+        A function to choose the columns returned
+
+        Parameters
+        ----------
+        columns : list or str
+            A single column or a list of columns, 'all' for all of them
+
+        Returns
+        -------
+        query : RestaurantQuery
+            The query returning only these columns
+        """
+        return self.copy(columns=None if columns=='all' else columns)
+
+    def getPlan(self):
+        """
+        A function to estimate the number of rows matched by each predicate and order the predicates by it. The estimates of the district and range predicates come from binary searches, the keyword and open-at predicates are evaluated on their bitmaps (their masks are kept for the execution).
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        plan : list
+            List of (number of matching rows, kind, argument, description, mask) tuples, the most selective predicate first. mask is None for the district and range predicates
+        """
+        interpreter=self.interpreter
+        plan=[]
+        for kind, argument, description in self.predicates:
+            mask=None
+            if kind=='district':
+                estimate=len(interpreter.district_index.get(argument,()))
+            elif kind=='range':
+                column, low, high = argument
+                first, last = interpreter.range_index.getRange(column,low,high)
+                estimate=int(last-first)
+            else:
+                mask=interpreter.keyword_index.getMask(argument) if kind=='keyword' else interpreter.open_at_index.getOpenMask(argument)
+                estimate=int(mask.sum())
+            plan.append((estimate,kind,argument,description,mask))
+        plan.sort(key=lambda step: step[0]) #Stable => equally selective predicates keep the order they were added in
+        return plan
+
+    def explain(self):
+        """
+        A function to get the predicates in the order they are evaluated with the number of rows each of them matches on its own
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        steps : list
+            List of (description, number of matching rows) tuples
+        """
+        steps=[(description,estimate) for estimate, kind, argument, description, mask in self.getPlan()]
+        return steps
+
+    def getRows(self):
+        """
+        A function to run the query and get the positions of the resulting rows in the data set (after sorting, offset and limit)
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        rows : numpy.ndarray
+            Positions of the resulting rows in DataInterpreter.dataset
+        """
+        interpreter=self.interpreter
+        rows=None #Candidate positions, None means all rows
+        for estimate, kind, argument, description, mask in self.getPlan():
+            if kind=='district':
+                if rows is None: #The most selective predicate provides the candidates
+                    rows=interpreter.district_index.get(argument,np.array([],dtype=np.intp))
+                else:
+                    rows=rows[interpreter.dataset.district.to_numpy()[rows]==argument]
+            elif kind=='range':
+                column, low, high = argument
+                if rows is None:
+                    rows=interpreter.range_index.getRows({column:(low,high)})
+                else:
+                    values=interpreter.range_index.values[column][rows]
+                    keep=~np.isnan(values)
+                    if low is not None:
+                        keep&=values>=low
+                    if high is not None:
+                        keep&=values<=high
+                    rows=rows[keep]
+            else:
+                rows=np.flatnonzero(mask) if rows is None else rows[mask[rows]]
+            if len(rows)==0:
+                break
+        if rows is None:
+            rows=np.arange(len(interpreter.dataset))
+        if self.order is not None:
+            column, ascending = self.order
+            values=interpreter.dataset[column].to_numpy()[rows]
+            missing=np.array([value is None or (isinstance(value,float) and np.isnan(value)) for value in values])
+            if values.dtype.kind in 'biuf': #Numbers are sorted with numpy, a descending order is the ascending order of the negated values
+                values=values.astype(float)
+                keys=values if ascending else -values
+                rows=rows[np.lexsort((np.where(missing,0,keys),missing))]
+            else:
+                present, present_values = rows[~missing], values[~missing]
+                ranked=sorted(range(len(present)),key=lambda position: present_values[position],reverse=not ascending) #Stable in both directions
+                rows=np.concatenate([present[ranked],rows[missing]]).astype(np.intp)
+        stop=None if self.stop is None else self.start+self.stop
+        rows=rows[self.start:stop]
+        return rows
+
+    def count(self):
+        """
+        A function to get the number of matching restaurants (after offset and limit) without building a data frame
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        count : int
+            Number of resulting rows
+        """
+        return len(self.getRows())
+
+    def run(self):
+        """
+        A function to run the query and get the resulting rows of the data set. This is the only step that copies data.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        dataset : pandas.DataFrame
+            The resulting rows (and columns) of DataInterpreter.dataset
+        """
+        dataset=self.interpreter.dataset.iloc[self.getRows()]
+        if self.columns is not None:
+            dataset=dataset[self.columns]
+        return dataset
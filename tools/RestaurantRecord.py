@@ -0,0 +1,75 @@
+class RestaurantRecord:
+    """
+    A class holding only the extracted attributes of a restaurant. It uses __slots__, so a record has no __dict__ and takes a fraction of the memory of a Restaurant object, which also keeps its parsed page.
+
+    ...
+
+    Attributes
+    ----------
+    fields : tuple
+        Names of the attributes in the order of the data set's columns (class attribute)
+
+    name, address, district, ratings, review_count, opening_hours, opening_hours_span, email_address, phones, web_page, payment_methods, products, services, marks, coordinates, link
+        The attributes extracted by Restaurant (see its documentation)
+
+    Methods
+    -------
+    fromRestaurant(restaurant):
+        A function to create a record from a Restaurant object
+
+    toRecord():
+        A function to return the attributes as a dictionary
+    """
+    fields=('name','address','district','ratings','review_count','opening_hours','opening_hours_span','email_address','phones','web_page','payment_methods','products','services','marks','coordinates','link')
+    __slots__=fields
+
+    def __init__(self,**attributes):
+        """
+        Constructs the record. Attributes that are not given are set to None.
+
+        Parameters
+        ----------
+        **attributes
+            Values of the attributes listed in fields
+        """
+        unknown=set(attributes)-set(self.fields)
+        if unknown:
+            raise ValueError(f'Unknown restaurant attributes: {", ".join(sorted(unknown))}')
+        for field in self.fields:
+            setattr(self,field,attributes.get(field))
+
+    @classmethod
+    def fromRestaurant(cls,restaurant):
+        """
+        A function to create a record from a Restaurant object, copying only the extracted attributes
+
+        Parameters
+        ----------
+        restaurant : Restaurant
+            Restaurant object created from the restaurant's page
+
+        Returns
+        -------
+        record : RestaurantRecord
+            Record of the restaurant
+        """
+        record=cls(**{field:getattr(restaurant,field) for field in cls.fields})
+        return record
+
+    def toRecord(self):
+        """
+        A function to return the attributes as a dictionary (same as Restaurant.toRecord)
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        record : dict
+            Dictionary with the attribute names as keys
+        """
+        record={field:getattr(self,field) for field in self.fields}
+        return record
+
+    def __repr__(self):
+        return f'RestaurantRecord(name={self.name!r}, link={self.link!r})'
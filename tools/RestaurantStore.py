@@ -0,0 +1,337 @@
+from tools.OpeningHours import OpeningHours
+from tools.KeywordIndex import KeywordIndex
+from tools.ColumnRangeIndex import ColumnRangeIndex
+import pandas as pd
+import threading
+import hashlib
+import sqlite3
+import json
+
+class RestaurantStore:
+    """
+    A class keeping a data set compiled by DatasetCompiler in an SQLite database with a normalized schema: one table for the restaurants, one for their phones, one for their category tags (payment methods, products, services and marks) with their normalized tokens (see KeywordIndex) and one for their opening intervals. The columns filtered by DataInterpreter.scanThroughDataset are indexed, so a filter is answered by the database without reading the whole data set, and a file database can be shared by several processes.
+
+    ...
+
+    Attributes
+    ----------
+    path : str
+        Path to the database file, ":memory:" for a database kept in memory
+
+    connection : sqlite3.Connection
+        Connection to the database
+
+    tag_columns : list
+        Columns of the data set stored in the tags table (class attribute)
+
+    schema : str
+        SQL creating the tables and indexes (class attribute)
+
+    schema_version : int
+        Version of the schema. A database with another version is rebuilt from scratch (class attribute)
+
+    tables : list
+        Tables of the schema in the order they are emptied (class attribute)
+
+    Methods
+    -------
+    getRestaurantCount():
+        A function to get the number of restaurants in the store
+
+    getFingerprint(dataset):
+        A function to get a fingerprint identifying a data set and the schema it is stored with
+
+    readFingerprint():
+        A function to get the fingerprint of the data set held by the store
+
+    clear():
+        A function to delete all restaurants from the store
+
+    writeDataset(dataset):
+        A function to replace the content of the store with a data set and stamp it with its fingerprint
+
+    selectIds(district=None, ratings=None, review_count=None, keyword=None, weekly_opening_duration=None, open_at=None, limit=None):
+        A function to get the ids of the restaurants matching the filters
+
+    readDataset(ids=None):
+        A function to rebuild a data set from the store
+    """
+    tag_columns=['payment_methods','products','services','marks']
+    schema='''
+        CREATE TABLE IF NOT EXISTS restaurants (
+            id INTEGER PRIMARY KEY, --Index of the restaurant in the data set
+            name TEXT, address TEXT, district TEXT, ratings REAL, review_count INTEGER, weekly_opening_duration REAL,
+            email_address TEXT, web_page TEXT, latitude REAL, longitude REAL, link TEXT,
+            opening_hours TEXT, opening_hours_span TEXT --JSON, only needed to rebuild the data set
+        );
+        CREATE TABLE IF NOT EXISTS phones (restaurant_id INTEGER REFERENCES restaurants(id), position INTEGER, label TEXT, number TEXT);
+        CREATE TABLE IF NOT EXISTS tags (restaurant_id INTEGER REFERENCES restaurants(id), category TEXT, position INTEGER, value TEXT, normalized TEXT);
+        CREATE TABLE IF NOT EXISTS tag_tokens (restaurant_id INTEGER REFERENCES restaurants(id), token TEXT, PRIMARY KEY (token, restaurant_id)) WITHOUT ROWID; --Normalized elements and their words
+        CREATE TABLE IF NOT EXISTS opening_intervals (restaurant_id INTEGER REFERENCES restaurants(id), day INTEGER, start INTEGER, end INTEGER); --Minutes of the week, split at the end of the week
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT); --Fingerprint of the stored data set
+        CREATE INDEX IF NOT EXISTS restaurants_district ON restaurants(district);
+        CREATE INDEX IF NOT EXISTS restaurants_ratings ON restaurants(ratings);
+        CREATE INDEX IF NOT EXISTS restaurants_review_count ON restaurants(review_count);
+        CREATE INDEX IF NOT EXISTS restaurants_weekly_opening_duration ON restaurants(weekly_opening_duration);
+        CREATE INDEX IF NOT EXISTS phones_restaurant ON phones(restaurant_id);
+        CREATE INDEX IF NOT EXISTS tags_normalized ON tags(normalized, restaurant_id);
+        CREATE INDEX IF NOT EXISTS tags_restaurant ON tags(restaurant_id);
+        CREATE INDEX IF NOT EXISTS opening_intervals_start ON opening_intervals(start, end, restaurant_id);
+        CREATE INDEX IF NOT EXISTS opening_intervals_restaurant ON opening_intervals(restaurant_id);
+    '''
+    schema_version=3
+    tables=['meta','opening_intervals','tag_tokens','tags','phones','restaurants']
+
+    def __init__(self,path=':memory:'):
+        """
+        Opens the database and creates the tables and indexes if they do not exist yet
+
+        Parameters
+        ----------
+        path : str
+            Path to the database file. Defaults to ":memory:" (a database kept in memory)
+        """
+        self.path=path
+        self.connection=sqlite3.connect(path,check_same_thread=False)
+        self.lock=threading.Lock()
+        if path!=':memory:':
+            self.connection.execute('PRAGMA journal_mode=WAL') #Readers in other processes are not blocked while the store is rebuilt
+        if self.connection.execute('PRAGMA user_version').fetchone()[0]!=self.schema_version: #The store only holds derived data => an older layout is dropped and filled again by DataInterpreter
+            for table in self.tables:
+                self.connection.execute(f'DROP TABLE IF EXISTS {table}')
+            self.connection.execute(f'PRAGMA user_version={self.schema_version}')
+        self.connection.executescript(self.schema)
+
+    def getRestaurantCount(self):
+        """
+        A function to get the number of restaurants in the store
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        count : int
+            Number of restaurants
+        """
+        with self.lock:
+            count=self.connection.execute('SELECT COUNT(*) FROM restaurants').fetchone()[0]
+        return count
+
+    @classmethod
+    def getFingerprint(cls,dataset):
+        """
+        A function to get a fingerprint identifying a data set and the schema it is stored with: a SHA-256 hash of the schema version, the number of rows, the ids and the values of every column
+
+        Parameters
+        ----------
+        dataset : pd.DataFrame
+            Data set generated by DatasetCompiler (processed by DataInterpreter)
+
+        Returns
+        -------
+        fingerprint : str
+            Hexadecimal digest
+        """
+        digest=hashlib.sha256(f'{cls.schema_version}|{len(dataset)}'.encode('utf-8'))
+        digest.update(json.dumps([[str(column) for column in dataset.columns],[int(idx) for idx in dataset.index]]).encode('utf-8'))
+        for column in dataset.columns:
+            digest.update(json.dumps(dataset[column].tolist(),ensure_ascii=False,sort_keys=True,default=str).encode('utf-8')) #NaN is written as NaN, numpy numbers as strings
+        fingerprint=digest.hexdigest()
+        return fingerprint
+
+    def readFingerprint(self):
+        """
+        A function to get the fingerprint of the data set held by the store (see getFingerprint)
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        fingerprint : str or None
+            Fingerprint written by writeDataset, None if the store is empty
+        """
+        with self.lock:
+            row=self.connection.execute("SELECT value FROM meta WHERE key='fingerprint'").fetchone()
+        fingerprint=None if row is None else row[0]
+        return fingerprint
+
+    def clear(self):
+        """
+        A function to delete all restaurants from the store
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+
+        """
+        with self.lock, self.connection:
+            for table in self.tables:
+                self.connection.execute(f'DELETE FROM {table}')
+
+    def writeDataset(self,dataset):
+        """
+        A function to replace the content of the store with a data set in a single transaction. The weekly opening duration is computed from the opening hours in the same way as in DataInterpreter.
+
+        Parameters
+        ----------
+        dataset : pd.DataFrame
+            Data set generated by DatasetCompiler (with dictionaries and lists as Python objects)
+
+        Returns
+        -------
+
+        """
+        restaurants, phones, tags, tag_tokens, intervals = [], [], [], set(), []
+        for idx, row in zip(dataset.index,dataset.to_dict('records')):
+            idx=int(idx)
+            value=lambda column: None if column not in row or (type(row[column]) not in [dict,list] and pd.isna(row[column])) else row[column] #Missing column or NaN => NULL
+            weekly_opening_duration=None
+            if type(value('opening_hours'))==dict:
+                hours=OpeningHours.fromDict(row['opening_hours'])
+                for start, end in hours.getWeekIntervals():
+                    intervals.append((idx,start//OpeningHours.minutes_per_day,start,end))
+                weekly_opening_duration=round(sum(end-start for day, start, end in hours.intervals)/60,2) or None #Zero means closed => NULL, like NaN in DataInterpreter
+            coordinates=value('coordinates') or {}
+            restaurants.append((idx,value('name'),value('address'),value('district'),value('ratings'),None if value('review_count') is None else int(row['review_count']),weekly_opening_duration,
+                value('email_address'),value('web_page'),coordinates.get('latitude'),coordinates.get('longitude'),value('link'),
+                None if value('opening_hours') is None else json.dumps(row['opening_hours'],ensure_ascii=False),None if value('opening_hours_span') is None else json.dumps(row['opening_hours_span'],ensure_ascii=False)))
+            for position, (label, number) in enumerate((value('phones') or {}).items()):
+                phones.append((idx,position,label,number))
+            for column in self.tag_columns:
+                values=value(column)
+                for position, tag in enumerate(values if type(values)==list else [] if values is None else [values]):
+                    tags.append((idx,column,position,tag,KeywordIndex.normalize(tag)))
+                    tag_tokens.update((idx,token) for token in KeywordIndex.getTokens(tag))
+        with self.lock, self.connection: #One transaction, rolled back on an error
+            for table in self.tables:
+                self.connection.execute(f'DELETE FROM {table}') #Same as clear, but within the transaction
+            self.connection.executemany('INSERT INTO restaurants VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)',restaurants)
+            self.connection.executemany('INSERT INTO phones VALUES (?,?,?,?)',phones)
+            self.connection.executemany('INSERT INTO tags VALUES (?,?,?,?,?)',tags)
+            self.connection.executemany('INSERT INTO tag_tokens VALUES (?,?)',sorted(tag_tokens))
+            self.connection.executemany('INSERT INTO opening_intervals VALUES (?,?,?,?)',intervals)
+            self.connection.execute('INSERT INTO meta VALUES (?,?)',('fingerprint',self.getFingerprint(dataset))) #Stamped in the same transaction => never points to a half-written data set
+        with self.lock:
+            self.connection.execute('ANALYZE') #Statistics for the query planner to pick the most selective index
+
+    def selectIds(self,district=None,ratings=None,review_count=None,keyword=None,weekly_opening_duration=None,open_at=None,limit=None):
+        """
+        A function to get the ids of the restaurants matching all of the given filters, in ascending order. The filters are the ones of DataInterpreter.scanThroughDataset and are all answered by the indexes.
+
+        Parameters
+        ----------
+        district : str or None
+            Prague municipal district (Praha 1-10)
+
+        ratings : float, tuple or None
+            Lower bound for the ratings, or a (lower, upper) tuple of inclusive bounds (see ColumnRangeIndex.parseBounds)
+
+        review_count : float, tuple or None
+            Lower bound for the number of reviews, or a (lower, upper) tuple
+
+        keyword : str, list or None
+            Keyword query over the payment methods, products, services and marks, matched against the normalized tokens (see KeywordIndex.parseQuery)
+
+        weekly_opening_duration : float, tuple or None
+            Lower bound for the weekly opening hours duration, or a (lower, upper) tuple
+
+        open_at : int or None
+            Minute of the week (0 is Monday 0:00) at which the restaurant has to be open
+
+        limit : int or None
+            Maximum number of ids. Defaults to None (all of them)
+
+        Returns
+        -------
+        ids : list
+            Ids (indexes in the data set) of the matching restaurants
+        """
+        conditions, parameters = [], []
+        if district is not None:
+            conditions.append('district = ?')
+            parameters.append(district)
+        for column, bounds in [('ratings',ratings),('review_count',review_count),('weekly_opening_duration',weekly_opening_duration)]:
+            if bounds is not None:
+                low, high = ColumnRangeIndex.parseBounds(bounds)
+                if low is not None:
+                    conditions.append(f'{column} >= ?')
+                    parameters.append(low)
+                if high is not None:
+                    conditions.append(f'{column} <= ?')
+                    parameters.append(high)
+        if keyword is not None:
+            groups=[]
+            for group in KeywordIndex.parseQuery(keyword):
+                terms=[]
+                for term, prefix in group:
+                    if prefix: #Range scan of the tokens starting with the term
+                        terms.append('id IN (SELECT restaurant_id FROM tag_tokens WHERE token >= ? AND token < ?)')
+                        parameters.extend([term,term+'\U0010ffff'])
+                    else:
+                        terms.append('id IN (SELECT restaurant_id FROM tag_tokens WHERE token = ?)')
+                        parameters.append(term)
+                groups.append('('+' AND '.join(terms)+')')
+            conditions.append('('+' OR '.join(groups)+')')
+        if open_at is not None:
+            conditions.append('id IN (SELECT restaurant_id FROM opening_intervals WHERE start <= ? AND end > ?)')
+            parameters.extend([open_at,open_at])
+        query='SELECT id FROM restaurants'+(' WHERE '+' AND '.join(conditions) if conditions else '')+' ORDER BY id'
+        if limit is not None:
+            query+=' LIMIT ?'
+            parameters.append(int(limit))
+        with self.lock:
+            ids=[row[0] for row in self.connection.execute(query,parameters)]
+        return ids
+
+    def readDataset(self,ids=None):
+        """
+        A function to rebuild a data set (in the layout of DatasetCompiler) from the store, e.g. in a process that does not hold the data set in memory
+
+        Parameters
+        ----------
+        ids : list or None
+            Ids of the restaurants to read (see selectIds). Defaults to None (all restaurants)
+
+        Returns
+        -------
+        dataset : pd.DataFrame
+            The restaurants indexed by their ids, in ascending order
+        """
+        if ids is None:
+            condition, parameters = '', []
+        else:
+            ids=[(int(idx),) for idx in ids]
+            condition, parameters = ' WHERE {column} IN (SELECT id FROM selected_ids)', []
+        with self.lock:
+            if ids is not None:
+                with self.connection: #The ids go to a temporary table, one parameter per id would fail beyond SQLITE_MAX_VARIABLE_NUMBER
+                    self.connection.execute('CREATE TEMP TABLE IF NOT EXISTS selected_ids (id INTEGER PRIMARY KEY)')
+                    self.connection.execute('DELETE FROM selected_ids')
+                    self.connection.executemany('INSERT OR IGNORE INTO selected_ids VALUES (?)',ids)
+            restaurants=pd.read_sql_query('SELECT * FROM restaurants'+condition.format(column='id')+' ORDER BY id',self.connection,params=parameters,index_col='id')
+            phones=self.connection.execute('SELECT restaurant_id, label, number FROM phones'+condition.format(column='restaurant_id')+' ORDER BY restaurant_id, position',parameters).fetchall()
+            tags=self.connection.execute('SELECT restaurant_id, category, value FROM tags'+condition.format(column='restaurant_id')+' ORDER BY restaurant_id, category, position',parameters).fetchall()
+        phones_by_id, tags_by_id = {}, {column:{} for column in self.tag_columns}
+        for idx, label, number in phones:
+            phones_by_id.setdefault(idx,{})[label]=number
+        for idx, category, value in tags:
+            tags_by_id[category].setdefault(idx,[]).append(value)
+        restaurants.index.name=None
+        dataset=pd.DataFrame(index=restaurants.index)
+        for column in ['name','address','district','ratings','review_count']:
+            dataset[column]=restaurants[column]
+        dataset['opening_hours']=[json.loads(value) if isinstance(value,str) else float('nan') for value in restaurants.opening_hours]
+        dataset['opening_hours_span']=[json.loads(value) if isinstance(value,str) else float('nan') for value in restaurants.opening_hours_span]
+        dataset['email_address']=restaurants.email_address
+        dataset['phones']=[phones_by_id.get(idx,float('nan')) for idx in restaurants.index]
+        dataset['web_page']=restaurants.web_page
+        for column in self.tag_columns:
+            dataset[column]=[tags_by_id[column].get(idx,float('nan')) for idx in restaurants.index]
+        dataset['coordinates']=[float('nan') if pd.isna(latitude) else {'latitude':latitude,'longitude':longitude} for latitude, longitude in zip(restaurants.latitude,restaurants.longitude)]
+        dataset['link']=restaurants.link
+        dataset['weekly_opening_duration']=restaurants.weekly_opening_duration
+        return dataset
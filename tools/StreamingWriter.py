@@ -0,0 +1,199 @@
+from tools.RestaurantRecord import RestaurantRecord
+import threading
+import time
+import json
+import csv
+import os
+
+class StreamingWriter:
+    """
+    A class writing restaurant records to a csv or JSON lines file as soon as they are compiled. The rows go to a ".partial" file that is flushed every few rows or seconds, so it can be followed while the crawl runs and a crash loses at most the last batch. Rows are written in the order they are completed. Once the crawl is complete, they can be sorted into the order of the data set and the file is renamed to its final name in one atomic step.
+
+    ...
+
+    Attributes
+    ----------
+    file_path : str
+        Final path of the file
+
+    partial_path : str
+        Path of the file while it is being written (file_path + ".partial")
+
+    file_format : str
+        "csv" (same layout as DatasetCompiler.dumpToCSV) or "jsonl" (one JSON object per line)
+
+    fields : list
+        Columns written for each record
+
+    flush_every : int
+        Number of rows after which the file is flushed
+
+    flush_interval : float
+        Number of seconds after which the file is flushed even if fewer rows were written
+
+    rows_written : int
+        Number of rows written so far
+
+    Methods
+    -------
+    write(record):
+        A function to append a single record
+
+    flush():
+        A function to push the written rows to the disk
+
+    reorder(order):
+        A function to sort the written rows by the position of their link
+
+    close(complete=True, order=None):
+        A function to close the file and give it its final name
+    """
+    def __init__(self,file_path,fields=RestaurantRecord.fields,file_format=None,flush_every=50,flush_interval=5.0):
+        """
+        Constructs the writer and opens the ".partial" file. A ".partial" file left by a previous run is overwritten.
+
+        Parameters
+        ----------
+        file_path : str
+            Final path of the file
+
+        fields : list or tuple
+            Columns written for each record. Defaults to RestaurantRecord.fields
+
+        file_format : str or None
+            "csv" or "jsonl". Defaults to None (derived from the extension of file_path)
+
+        flush_every : int
+            Number of rows after which the file is flushed. Defaults to 50
+
+        flush_interval : float
+            Number of seconds after which the file is flushed even if fewer rows were written. Defaults to 5
+        """
+        file_format=file_format or os.path.splitext(file_path)[1].lstrip('.').lower()
+        if file_format not in ['csv','jsonl']:
+            raise ValueError('Please specify the file format as "csv" or "jsonl"')
+        self.file_path=file_path
+        self.partial_path=file_path+'.partial'
+        self.file_format=file_format
+        self.fields=list(fields)
+        self.flush_every=flush_every
+        self.flush_interval=flush_interval
+        self.rows_written=0
+        self.unflushed=0
+        self.last_flush=time.monotonic()
+        self.lock=threading.Lock()
+        if os.path.dirname(self.file_path):
+            os.makedirs(os.path.dirname(self.file_path),exist_ok=True)
+        self.file=open(self.partial_path,'w',encoding='utf-8',newline='')
+        if self.file_format=='csv':
+            self.csv_writer=csv.writer(self.file)
+            self.csv_writer.writerow(['']+self.fields) #Empty first column for the index, like DataFrame.to_csv
+        self.flush()
+
+    def write(self,record):
+        """
+        A function to append a single record. Dictionaries and lists are written the way pandas writes them to a csv file (their Python representation), so readExistingDataset can convert them back.
+
+        Parameters
+        ----------
+        record : dict, RestaurantRecord or Restaurant
+            Record of a single restaurant
+
+        Returns
+        -------
+
+        """
+        if not isinstance(record,dict):
+            record=record.toRecord()
+        values=[record.get(field) for field in self.fields]
+        values=[None if isinstance(value,float) and value!=value else value for value in values] #NaN (rows of an existing data set) is written as a missing value
+        with self.lock:
+            if self.file_format=='csv':
+                self.csv_writer.writerow([self.rows_written]+['' if value is None else value for value in values])
+            else:
+                self.file.write(json.dumps(dict(zip(self.fields,values)),ensure_ascii=False,default=lambda value: value.item() if hasattr(value,'item') else str(value))+'\n') #numpy numbers are converted to Python ones
+            self.rows_written+=1
+            self.unflushed+=1
+            if self.unflushed>=self.flush_every or time.monotonic()-self.last_flush>=self.flush_interval:
+                self.flush()
+
+    def flush(self):
+        """
+        A function to push the written rows to the disk
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+
+        """
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unflushed=0
+        self.last_flush=time.monotonic()
+
+    def reorder(self,order):
+        """
+        A function to sort the rows of the closed ".partial" file by the position of their link in "order" and to number them again from 0, so that the file is identical to the one DatasetCompiler.dumpToCSV writes. Rows whose link is not in "order" are kept at the end in the order they were written.
+
+        Parameters
+        ----------
+        order : list
+            Links in the order of the data set
+
+        Returns
+        -------
+
+        """
+        positions={link:position for position, link in enumerate(order)}
+        sorted_path=self.partial_path+'.tmp'
+        if self.file_format=='csv':
+            link_column=1+self.fields.index('link') #The first column is the index
+            with open(self.partial_path,encoding='utf-8',newline='') as partial_file:
+                reader=csv.reader(partial_file)
+                header=next(reader)
+                rows=sorted(reader,key=lambda row: positions.get(row[link_column],len(positions)))
+            with open(sorted_path,'w',encoding='utf-8',newline='') as sorted_file:
+                csv_writer=csv.writer(sorted_file)
+                csv_writer.writerow(header)
+                for idx, row in enumerate(rows):
+                    csv_writer.writerow([idx]+row[1:])
+        else:
+            with open(self.partial_path,encoding='utf-8') as partial_file:
+                lines=sorted(partial_file,key=lambda line: positions.get(json.loads(line).get('link'),len(positions)))
+            with open(sorted_path,'w',encoding='utf-8') as sorted_file:
+                sorted_file.writelines(lines)
+        os.replace(sorted_path,self.partial_path)
+
+    def close(self,complete=True,order=None):
+        """
+        A function to close the file. If the crawl is complete, the rows are sorted by "order" (if given) and the ".partial" file replaces file_path in one atomic step, otherwise it is kept under its ".partial" name with the rows in the order they were written.
+
+        Parameters
+        ----------
+        complete : bool
+            Whether all records were written. Defaults to True
+
+        order : list or None
+            Links in the order of the data set (see reorder). Defaults to None (rows are kept in the order they were written)
+
+        Returns
+        -------
+
+        """
+        with self.lock:
+            if self.file.closed:
+                return
+            self.flush()
+            self.file.close()
+            if complete:
+                if order is not None and 'link' in self.fields:
+                    self.reorder(order)
+                os.replace(self.partial_path,self.file_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,exception_type,exception,traceback):
+        self.close(complete=exception_type is None)